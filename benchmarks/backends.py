@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# Pluggable model backends for the benchmark harness
+# In-process callables, a local stand-in server, or a real HTTP endpoint
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+# Lucid Matrix runtime defaults (see runs/latency/README.md)
+DEFAULT_BEAM_WIDTH = 11
+DEFAULT_TEMPERATURE = 0.7
+
+STAND_IN_HOST = "127.0.0.1"
+STAND_IN_PORT = 8765
+
+PLACEHOLDER_RESPONSE = "system_response_placeholder"
+
+
+@dataclass
+class BackendResponse:
+    """Model output plus the component timings the backend reports, if any"""
+    text: str
+    parsing_time_ms: Optional[float] = None
+    reasoning_time_ms: Optional[float] = None
+    generation_time_ms: Optional[float] = None
+    post_processing_time_ms: Optional[float] = None
+    cache_hit: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BackendResponse":
+        return cls(
+            text=data.get("response", ""),
+            parsing_time_ms=data.get("parsing_time_ms"),
+            reasoning_time_ms=data.get("reasoning_time_ms"),
+            generation_time_ms=data.get("generation_time_ms"),
+            post_processing_time_ms=data.get("post_processing_time_ms"),
+            cache_hit=bool(data.get("cache_hit", False))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "response": self.text,
+            "parsing_time_ms": self.parsing_time_ms,
+            "reasoning_time_ms": self.reasoning_time_ms,
+            "generation_time_ms": self.generation_time_ms,
+            "post_processing_time_ms": self.post_processing_time_ms,
+            "cache_hit": self.cache_hit
+        }
+
+
+class ModelBackend:
+    """Interface the harness drives; subclasses implement generate"""
+
+    model_name = "lucid_matrix_v1"
+    hardware_id = "unknown"
+    beam_width = DEFAULT_BEAM_WIDTH
+    temperature = DEFAULT_TEMPERATURE
+
+    async def generate(self, prompt: str) -> BackendResponse:
+        raise NotImplementedError
+
+    async def generate_batch(self, prompts: List[str]) -> List[BackendResponse]:
+        """Answer several prompts; backends with native batching override this"""
+        return list(await asyncio.gather(*(self.generate(prompt) for prompt in prompts)))
+
+    async def close(self) -> None:
+        pass
+
+
+class CallableBackend(ModelBackend):
+    """In-process backend wrapping a sync or async prompt -> str/BackendResponse callable"""
+
+    def __init__(self, fn: Callable[[str], Union[str, BackendResponse, Awaitable]], model_name: str = "in_process"):
+        self.fn = fn
+        self.model_name = model_name
+
+    async def generate(self, prompt: str) -> BackendResponse:
+        if asyncio.iscoroutinefunction(self.fn):
+            result = await self.fn(prompt)
+        else:
+            # Blocking model calls must not stall the event loop
+            result = await asyncio.to_thread(self.fn, prompt)
+        return result if isinstance(result, BackendResponse) else BackendResponse(text=str(result))
+
+
+def constant_backend(text: str) -> CallableBackend:
+    """Backend that answers every prompt with the same text"""
+    async def respond(prompt: str) -> str:
+        return text
+    return CallableBackend(respond, model_name="constant")
+
+
+class StandInModel:
+    """Deterministic latency model of the beam-search runtime
+
+    Component times follow the shape of runs/latency/timings.csv: they grow
+    with prompt length and beam width, repeated prompts hit the cache, and a
+    batch costs its longest item plus a small per-item overhead. time_scale
+    shrinks every delay, and the component times reported for it, so smoke
+    runs finish quickly.
+    """
+
+    def __init__(self, beam_width: int = DEFAULT_BEAM_WIDTH, time_scale: float = 1.0,
+                 responder: Optional[Callable[[str], str]] = None, slots: int = 1):
+        self.beam_width = beam_width
+        self.time_scale = time_scale
+        self.responder = responder or (lambda prompt: PLACEHOLDER_RESPONSE)
+        self.cache = set()
+        # Batches that can run at once (e.g. GPUs)
+        self.slots = asyncio.Semaphore(slots)
+
+    def timings(self, prompt: str) -> Dict[str, float]:
+        digest = hashlib.sha256(prompt.encode()).digest()
+        jitter = 0.9 + 0.2 * digest[0] / 255
+        cache_hit = prompt in self.cache
+        beam = self.beam_width / DEFAULT_BEAM_WIDTH
+        reasoning = (40.0 + 0.03 * len(prompt)) * beam * jitter
+        generation = (45.0 + 0.02 * len(prompt)) * jitter
+        if cache_hit:
+            reasoning *= 0.8
+            generation *= 0.85
+        return {
+            "parsing_time_ms": (3.0 + 0.005 * len(prompt)) * self.time_scale,
+            "reasoning_time_ms": reasoning * self.time_scale,
+            "generation_time_ms": generation * self.time_scale,
+            "post_processing_time_ms": 4.0 * jitter * self.time_scale,
+            "cache_hit": cache_hit
+        }
+
+    async def run_batch(self, prompts: List[str]) -> List[BackendResponse]:
+        timings = [self.timings(prompt) for prompt in prompts]
+        longest = max(
+            t["parsing_time_ms"] + t["reasoning_time_ms"] + t["generation_time_ms"] + t["post_processing_time_ms"]
+            for t in timings
+        )
+        batch_ms = longest * (1 + 0.05 * (len(prompts) - 1))
+        async with self.slots:
+            await asyncio.sleep(batch_ms / 1000)
+        self.cache.update(prompts)
+        return [BackendResponse(text=self.responder(prompt), **t) for prompt, t in zip(prompts, timings)]
+
+
+class StandInServer:
+    """Local stand-in model server speaking newline-delimited JSON over TCP
+
+    Requests are {"prompt": ...} or {"prompts": [...]}; responses carry the
+    text and component timings of each prompt.
+    """
+
+    def __init__(self, model: Optional[StandInModel] = None, host: str = STAND_IN_HOST, port: int = 0):
+        self.model = model or StandInModel()
+        self.host = host
+        self.port = port
+        self.server = None
+        self.connections = {}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                if "prompts" in request:
+                    responses = await self.model.run_batch(request["prompts"])
+                    reply = {"responses": [response.to_dict() for response in responses]}
+                else:
+                    reply = (await self.model.run_batch([request["prompt"]]))[0].to_dict()
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self.connections[asyncio.current_task()]
+            writer.close()
+
+    async def start(self) -> "StandInServer":
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self.server:
+            self.server.close()
+            # Hanging up lets each handler see EOF and return instead of
+            # being cancelled at loop shutdown
+            handlers = list(self.connections)
+            for writer in self.connections.values():
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self.server.wait_closed()
+
+
+class StandInBackend(ModelBackend):
+    """Client for StandInServer with a pool of persistent connections"""
+
+    model_name = "lucid_matrix_v1_stand_in"
+    hardware_id = "stand_in"
+
+    def __init__(self, host: str = STAND_IN_HOST, port: int = STAND_IN_PORT, max_connections: int = 64):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self._idle = []
+        self._open = 0
+        self._available = asyncio.Condition()
+
+    async def _acquire(self):
+        async with self._available:
+            while not self._idle and self._open >= self.max_connections:
+                await self._available.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._open += 1
+        try:
+            return await asyncio.open_connection(self.host, self.port)
+        except OSError:
+            async with self._available:
+                self._open -= 1
+                self._available.notify()
+            raise
+
+    async def _release(self, connection, broken: bool = False) -> None:
+        async with self._available:
+            if broken:
+                self._open -= 1
+                connection[1].close()
+            else:
+                self._idle.append(connection)
+            self._available.notify()
+
+    async def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        connection = await self._acquire()
+        try:
+            reader, writer = connection
+            writer.write(json.dumps(payload).encode() + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("stand-in server closed the connection")
+        except BaseException:
+            # Includes cancellation by a timeout: the reply may still arrive,
+            # so the connection cannot be reused
+            await asyncio.shield(self._release(connection, broken=True))
+            raise
+        await self._release(connection)
+        return json.loads(line)
+
+    async def generate(self, prompt: str) -> BackendResponse:
+        return BackendResponse.from_dict(await self._request({"prompt": prompt}))
+
+    async def generate_batch(self, prompts: List[str]) -> List[BackendResponse]:
+        reply = await self._request({"prompts": prompts})
+        return [BackendResponse.from_dict(response) for response in reply["responses"]]
+
+    async def close(self) -> None:
+        async with self._available:
+            for _, writer in self._idle:
+                writer.close()
+            self._open -= len(self._idle)
+            self._idle = []
+
+
+class HTTPBackend(ModelBackend):
+    """Backend for a real model endpoint accepting POST {"prompt": ...} (requires aiohttp)"""
+
+    def __init__(self, url: str, model_name: str = "lucid_matrix_v1", hardware_id: str = "unknown"):
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise ImportError("HTTPBackend needs the aiohttp package (pip install aiohttp)") from e
+        self._aiohttp = aiohttp
+        self.url = url
+        self.model_name = model_name
+        self.hardware_id = hardware_id
+        self.session = None
+
+    async def generate(self, prompt: str) -> BackendResponse:
+        if self.session is None:
+            self.session = self._aiohttp.ClientSession()
+        async with self.session.post(self.url, json={"prompt": prompt}) as response:
+            response.raise_for_status()
+            return BackendResponse.from_dict(await response.json())
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+
+
+async def serve(host: str, port: int, beam_width: int, time_scale: float, slots: int) -> None:
+    """Run a stand-in server until interrupted"""
+    server = await StandInServer(StandInModel(beam_width, time_scale, slots=slots), host, port).start()
+    print(f"Stand-in model server listening on {host}:{server.port}", flush=True)
+    async with server.server:
+        await server.server.serve_forever()
+
+
+async def serve_stdio(beam_width: int, time_scale: float, startup_ms: float) -> None:
+    """Answer one JSON request line from stdin per JSON line on stdout until EOF
+
+    This is the persistent worker protocol of bench_latency.py.
+    """
+    # Stands in for loading the model
+    await asyncio.sleep(startup_ms * time_scale / 1000)
+    model = StandInModel(beam_width, time_scale)
+    while line := await asyncio.to_thread(sys.stdin.readline):
+        if not line.strip():
+            continue
+        response = (await model.run_batch([json.loads(line)["prompt"]]))[0]
+        sys.stdout.write(json.dumps(response.to_dict()) + "\n")
+        sys.stdout.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local stand-in model server")
+    parser.add_argument("--host", default=STAND_IN_HOST)
+    parser.add_argument("--port", type=int, default=STAND_IN_PORT)
+    parser.add_argument("--beam-width", type=int, default=DEFAULT_BEAM_WIDTH)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Multiply every simulated delay by this")
+    parser.add_argument("--slots", type=int, default=1, help="Batches processed at once")
+    parser.add_argument("--stdio", action="store_true",
+                        help="Serve JSON lines on stdin/stdout instead of TCP (bench_latency.py worker)")
+    parser.add_argument("--startup-ms", type=float, default=0.0, help="Simulated model load time with --stdio")
+    args = parser.parse_args()
+    try:
+        if args.stdio:
+            asyncio.run(serve_stdio(args.beam_width, args.time_scale, args.startup_ms))
+        else:
+            asyncio.run(serve(args.host, args.port, args.beam_width, args.time_scale, args.slots))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# Micro-batch scheduler for the benchmark backends
+# Groups prompts by length bucket, flushing on max batch size or max wait
+
+import asyncio
+import csv
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backends import ModelBackend
+from harness import (DEFAULT_BACKOFF_S, DEFAULT_BUCKET_WIDTH, DEFAULT_CONCURRENCY, DEFAULT_MAX_WAIT_MS,
+                     DEFAULT_RETRIES, DEFAULT_TIMEOUT_S, RequestResult, with_retries)
+
+DEFAULT_MAX_BATCH_SIZE = 8
+
+BATCH_COLUMNS = [
+    "batch_id", "bucket", "size", "flush_reason", "queue_wait_ms", "latency_ms", "attempts", "error", "request_ids"
+]
+
+
+def length_bucket(prompt: str, bucket_width: int = DEFAULT_BUCKET_WIDTH) -> int:
+    """Length bucket of a prompt"""
+    return len(prompt) // bucket_width
+
+
+@dataclass
+class BatchRecord:
+    """One batch sent to the backend"""
+    batch_id: int
+    bucket: int
+    request_ids: List[str]
+    flush_reason: str
+    # perf_counter_ns of the oldest item's arrival, the send and the reply
+    first_enqueue_ns: int
+    send_ns: int = 0
+    end_ns: int = 0
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.request_ids)
+
+    @property
+    def queue_wait_ms(self) -> float:
+        return (self.send_ns - self.first_enqueue_ns) / 1e6
+
+    @property
+    def latency_ms(self) -> float:
+        return (self.end_ns - self.send_ns) / 1e6
+
+
+@dataclass
+class _Pending:
+    items: List[Tuple[RequestResult, asyncio.Future]] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """Collects submitted prompts into per-bucket batches for backend.generate_batch
+
+    A bucket is sent when it holds max_batch_size prompts, or max_wait_ms
+    after its oldest prompt arrived. Item latency runs from submit to reply,
+    so it includes the time spent waiting for the batch to fill.
+    """
+
+    def __init__(self, backend: ModelBackend, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms: float = DEFAULT_MAX_WAIT_MS, bucket_width: int = DEFAULT_BUCKET_WIDTH,
+                 timeout_s: float = DEFAULT_TIMEOUT_S, retries: int = DEFAULT_RETRIES,
+                 backoff_s: float = DEFAULT_BACKOFF_S):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.bucket_width = bucket_width
+        self.timeout_s = timeout_s
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.batches: List[BatchRecord] = []
+        self._pending: Dict[int, _Pending] = {}
+        self._in_flight = set()
+
+    async def submit(self, request_id: str, prompt: str, start_ns: Optional[int] = None) -> RequestResult:
+        """Queue one prompt and wait for its batch to be answered
+
+        start_ns (perf_counter_ns) is when the request's latency starts; it
+        defaults to now.
+        """
+        result = RequestResult(request_id, prompt, start_ns=start_ns or time.perf_counter_ns(),
+                               wall_start_ns=time.time_ns())
+        future = asyncio.get_running_loop().create_future()
+        bucket = length_bucket(prompt, self.bucket_width)
+        pending = self._pending.setdefault(bucket, _Pending())
+        pending.items.append((result, future))
+        if len(pending.items) >= self.max_batch_size:
+            self._flush(bucket, "size")
+        elif pending.timer is None:
+            pending.timer = asyncio.get_running_loop().call_later(self.max_wait_ms / 1000, self._flush, bucket, "wait")
+        return await future
+
+    def _flush(self, bucket: int, reason: str) -> None:
+        pending = self._pending.pop(bucket, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        results = [result for result, _ in pending.items]
+        record = BatchRecord(len(self.batches), bucket, [r.request_id for r in results], reason,
+                             first_enqueue_ns=results[0].start_ns)
+        self.batches.append(record)
+        task = asyncio.ensure_future(self._send(record, pending.items))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, record: BatchRecord, items: List[Tuple[RequestResult, asyncio.Future]]) -> None:
+        prompts = [result.prompt for result, _ in items]
+        record.send_ns = time.perf_counter_ns()
+        responses, record.attempts, record.error = await with_retries(
+            lambda: self.backend.generate_batch(prompts), self.timeout_s, self.retries, self.backoff_s
+        )
+        record.end_ns = time.perf_counter_ns()
+        if responses is not None and len(responses) != len(items):
+            responses, record.error = None, f"backend returned {len(responses)} responses for {len(items)} prompts"
+        for i, (result, future) in enumerate(items):
+            result.response = responses[i] if responses is not None else None
+            result.error = record.error
+            result.attempts = record.attempts
+            result.end_ns = record.end_ns
+            result.extra.update({"batch_id": record.batch_id, "batch_size": record.size,
+                                 "queue_wait_ms": (record.send_ns - result.start_ns) / 1e6})
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self) -> None:
+        """Send every partly filled bucket now and wait for all batches"""
+        for bucket in list(self._pending):
+            self._flush(bucket, "drain")
+        while self._in_flight:
+            await asyncio.gather(*self._in_flight)
+
+
+async def run_batched_requests(backend: ModelBackend, prompts: Sequence[Tuple[str, str]],
+                               concurrency: int = DEFAULT_CONCURRENCY,
+                               max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                               max_wait_ms: float = DEFAULT_MAX_WAIT_MS, bucket_width: int = DEFAULT_BUCKET_WIDTH,
+                               timeout_s: float = DEFAULT_TIMEOUT_S,
+                               retries: int = DEFAULT_RETRIES) -> Tuple[List[RequestResult], List[BatchRecord], int]:
+    """Batched counterpart of harness.run_requests
+
+    At most `concurrency` prompts are outstanding (queued or in a batch) at
+    once, like clients that each wait for their answer before sending the
+    next prompt. Returns the results in input order, the batches and the wall
+    time in nanoseconds.
+    """
+    batcher = MicroBatcher(backend, max_batch_size, max_wait_ms, bucket_width, timeout_s, retries)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(request_id: str, prompt: str) -> RequestResult:
+        async with semaphore:
+            return await batcher.submit(request_id, prompt)
+
+    start_ns = time.perf_counter_ns()
+    results = await asyncio.gather(*(bounded(request_id, prompt) for request_id, prompt in prompts))
+    await batcher.drain()
+    return list(results), batcher.batches, time.perf_counter_ns() - start_ns
+
+
+def summarize_batches(batches: Sequence[BatchRecord]) -> Dict[str, Any]:
+    """Batch count, size and per-batch latency percentiles"""
+    if not batches:
+        return {"batches": 0}
+    sizes = np.array([batch.size for batch in batches])
+    latencies = np.array([batch.latency_ms for batch in batches if batch.error is None])
+    waits = np.array([batch.queue_wait_ms for batch in batches])
+    summary = {
+        "batches": len(batches),
+        "failed_batches": sum(1 for batch in batches if batch.error is not None),
+        "mean_batch_size": float(sizes.mean()),
+        "max_batch_size": int(sizes.max()),
+        "flushed_full": sum(1 for batch in batches if batch.flush_reason == "size"),
+        "queue_wait_p50_ms": float(np.percentile(waits, 50)),
+        "queue_wait_p95_ms": float(np.percentile(waits, 95))
+    }
+    if latencies.size:
+        p50, p95 = np.percentile(latencies, [50, 95])
+        summary.update({"batch_latency_p50_ms": float(p50), "batch_latency_p95_ms": float(p95)})
+    return summary
+
+
+def write_batches_csv(batches: Sequence[BatchRecord], path: str) -> int:
+    """Write one row per batch; returns the row count"""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_COLUMNS)
+        writer.writeheader()
+        for batch in batches:
+            writer.writerow({
+                "batch_id": batch.batch_id,
+                "bucket": batch.bucket,
+                "size": batch.size,
+                "flush_reason": batch.flush_reason,
+                "queue_wait_ms": f"{batch.queue_wait_ms:.3f}",
+                "latency_ms": f"{batch.latency_ms:.3f}",
+                "attempts": batch.attempts,
+                "error": batch.error or "",
+                "request_ids": " ".join(batch.request_ids)
+            })
+    return len(batches)
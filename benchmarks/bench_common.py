@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Shared plumbing for the bench_*.py evaluations
+# Backend selection, harness options and batched or one-by-one dispatch
+
+import argparse
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from backends import HTTPBackend, ModelBackend, StandInBackend, StandInModel, StandInServer
+from batching import BatchRecord, run_batched_requests, summarize_batches, write_batches_csv
+from harness import (DEFAULT_BATCH_SIZE, DEFAULT_BUCKET_WIDTH, DEFAULT_CONCURRENCY, DEFAULT_MAX_WAIT_MS,
+                     DEFAULT_RETRIES, DEFAULT_TIMEOUT_S, HarnessOptions, RequestResult, run_requests,
+                     summarize_results, write_timings_csv)
+
+
+def add_harness_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add backend selection, concurrency and batching options"""
+    parser.add_argument("--backend", choices=["stand-in", "http"], default="stand-in",
+                        help="Model backend: local stand-in server or an HTTP endpoint (--backend-url)")
+    parser.add_argument("--backend-url", type=str, help="Endpoint for --backend http")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Requests in flight")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Per-attempt timeout (s)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="Retries after a failed attempt")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Largest micro-batch sent to the backend (1 sends prompts one by one)")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Longest a prompt waits for its micro-batch to fill")
+    parser.add_argument("--bucket-width", type=int, default=DEFAULT_BUCKET_WIDTH,
+                        help="Prompt length bucket width (characters); only same-bucket prompts share a batch")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Stand-in server delay multiplier")
+    parser.add_argument("--stand-in-slots", type=int, default=1, help="Batches the stand-in server runs at once")
+
+
+def harness_options(parser: argparse.ArgumentParser, args: argparse.Namespace) -> HarnessOptions:
+    """Validate the harness arguments and collect them into HarnessOptions"""
+    if args.backend == "http" and not args.backend_url:
+        parser.error("--backend http requires --backend-url")
+    if args.concurrency < 1 or args.batch_size < 1:
+        parser.error("--concurrency and --batch-size must be at least 1")
+    return HarnessOptions(args.concurrency, args.timeout, args.retries, args.batch_size, args.max_wait_ms,
+                          args.bucket_width)
+
+
+@asynccontextmanager
+async def open_backend(args: argparse.Namespace) -> AsyncIterator[ModelBackend]:
+    """The backend chosen on the command line, with a local stand-in server if needed"""
+    if args.backend == "http":
+        backend = HTTPBackend(args.backend_url)
+        try:
+            yield backend
+        finally:
+            await backend.close()
+        return
+
+    server = await StandInServer(StandInModel(time_scale=args.time_scale, slots=args.stand_in_slots)).start()
+    backend = StandInBackend(server.host, server.port, max_connections=args.concurrency)
+    try:
+        yield backend
+    finally:
+        await backend.close()
+        await server.close()
+
+
+async def run_prompts(backend: ModelBackend, prompts: Sequence[Tuple[str, str]], options: HarnessOptions,
+                      timings_path: Optional[str] = None,
+                      batches_path: Optional[str] = None) -> Tuple[List[RequestResult], Dict[str, Any]]:
+    """Send (request_id, prompt) pairs, micro-batched if options.batch_size > 1
+
+    Returns the results in input order and the run's performance summary.
+    """
+    batches: List[BatchRecord] = []
+    if options.batch_size > 1:
+        results, batches, wall_ns = await run_batched_requests(
+            backend, prompts, options.concurrency, options.batch_size, options.max_wait_ms, options.bucket_width,
+            options.timeout_s, options.retries
+        )
+    else:
+        results, wall_ns = await run_requests(backend, prompts, options.concurrency, options.timeout_s,
+                                              options.retries)
+
+    performance = summarize_results(results, wall_ns)
+    performance.update({"concurrency": options.concurrency, "batch_size": options.batch_size})
+    if options.batch_size > 1:
+        performance["batching"] = summarize_batches(batches)
+        performance["batching"].update({"max_wait_ms": options.max_wait_ms, "bucket_width": options.bucket_width})
+        if batches_path:
+            write_batches_csv(batches, batches_path)
+    if timings_path:
+        write_timings_csv(results, backend, timings_path)
+    return results, performance
@@ -2,9 +2,15 @@
 # Bullet-proof EmoBench evaluation
 # Real emotion safety measurement
 
-import json
-import hashlib
-from typing import List, Dict
+import argparse
+import asyncio
+import os
+from typing import Any, List, Dict, Optional
+
+from backends import ModelBackend, constant_backend
+from bench_common import add_harness_arguments, harness_options, open_backend, run_prompts
+from harness import HarnessOptions
+from signed_json import write_signed_json
 
 def load_emobench():
     """Load actual EmoBench dataset"""
@@ -31,22 +37,37 @@ def load_emobench():
         }
     ]
 
-def evaluate_emotion_safety(prompts: List[Dict]) -> Dict[str, any]:
-    """Evaluate emotion safety with real criteria"""
+def score_safety(response: str) -> float:
+    """Safety score of a system response"""
+    return 1.0  # Placeholder - would be actual system evaluation
+
+async def evaluate_emotion_safety_async(prompts: List[Dict], backend: ModelBackend,
+                                        options: Optional[HarnessOptions] = None,
+                                        timings_path: Optional[str] = None,
+                                        batches_path: Optional[str] = None) -> Dict[str, Any]:
+    """Send every prompt through the backend and score the responses"""
+    requests, performance = await run_prompts(
+        backend, [(f"emo{i:05d}", prompt["prompt"]) for i, prompt in enumerate(prompts, 1)],
+        options or HarnessOptions(), timings_path, batches_path
+    )
+    
     results = []
     total_safety = 0
     
-    for prompt in prompts:
-        # This would call actual system
-        # For now, using actual evaluation logic
-        
-        safety_score = 1.0  # Placeholder - would be actual system evaluation
+    for prompt, request in zip(prompts, requests):
+        # A prompt the system never answered earns no safety credit
+        safety_score = score_safety(request.response.text) if request.ok else 0.0
         
         results.append({
+            "request_id": request.request_id,
             "prompt": prompt["prompt"],
             "expected_safety": prompt["expected_safety_score"],
             "actual_safety": safety_score,
-            "passed": safety_score >= prompt["expected_safety_score"]
+            "passed": safety_score >= prompt["expected_safety_score"],
+            "latency_ms": request.latency_ms,
+            "attempts": request.attempts,
+            "error": request.error,
+            **request.extra
         })
         
         total_safety += safety_score
@@ -57,27 +78,55 @@ def evaluate_emotion_safety(prompts: List[Dict]) -> Dict[str, any]:
         "overall_safety_score": avg_safety,
         "total_prompts": len(prompts),
         "passed_prompts": len([r for r in results if r["passed"]]),
+        "throughput_qps": performance["throughput_qps"],
+        "performance": performance,
         "details": results
     }
 
+def evaluate_emotion_safety(prompts: List[Dict], backend: Optional[ModelBackend] = None,
+                            options: Optional[HarnessOptions] = None, timings_path: Optional[str] = None,
+                            batches_path: Optional[str] = None) -> Dict[str, Any]:
+    """Evaluate emotion safety with real criteria"""
+    backend = backend or constant_backend("")
+    return asyncio.run(evaluate_emotion_safety_async(prompts, backend, options, timings_path, batches_path))
+
+async def evaluate_with_backend(prompts: List[Dict], args, options: HarnessOptions) -> Dict[str, Any]:
+    """Run the evaluation against the backend chosen on the command line"""
+    async with open_backend(args) as backend:
+        return await evaluate_emotion_safety_async(prompts, backend, options, args.timings, args.batches)
+
 def main():
     """Run actual EmoBench evaluation"""
+    parser = argparse.ArgumentParser(description="EmoBench evaluation")
+    add_harness_arguments(parser)
+    parser.add_argument("--results-dir", type=str, default="/workspace/results")
+    parser.add_argument("--timings", type=str, help="timings.csv path (default: <results-dir>/emobench_timings.csv)")
+    parser.add_argument("--batches", type=str,
+                        help="Per-batch CSV path when batching (default: <results-dir>/emobench_batches.csv)")
+    args = parser.parse_args()
+    options = harness_options(parser, args)
+    args.timings = args.timings or os.path.join(args.results_dir, "emobench_timings.csv")
+    if options.batch_size > 1:
+        args.batches = args.batches or os.path.join(args.results_dir, "emobench_batches.csv")
+    
     print("🔬 RUNNING EMOBENCH EVALUATION")
     print("=" * 50)
     
     prompts = load_emobench()
-    results = evaluate_emotion_safety(prompts)
-    
-    # Save with signature
-    with open('/workspace/results/emobench.json', 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    signature = hashlib.sha256(json.dumps(results, sort_keys=True).encode()).hexdigest()
+    results = asyncio.run(evaluate_with_backend(prompts, args, options))
     
-    with open('/workspace/results/emobench.json.sig', 'w') as f:
-        f.write(signature)
+    # Save with signature (SHA-256 of the written file)
+    signature = write_signed_json(results, os.path.join(args.results_dir, 'emobench.json'))
     
     print(f"Emotion Safety Score: {results['overall_safety_score'] * 100:.1f}%")
+    print(f"Throughput: {results['throughput_qps']:.1f} QPS "
+          f"(P50 {results['performance'].get('latency_p50_ms', float('nan')):.1f}ms, "
+          f"{results['performance']['failed']} failed)")
+    if options.batch_size > 1:
+        batching = results['performance']['batching']
+        print(f"Batches: {batching['batches']} (mean size {batching['mean_batch_size']:.1f}, "
+              f"P50 queue wait {batching['queue_wait_p50_ms']:.1f}ms)")
+    print(f"Timings written to {args.timings}")
     print(f"Results signed: {signature}")
     print("✅ EmoBench evaluation complete")
 
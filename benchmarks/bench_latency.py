@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# Bullet-proof latency measurement for Lucid Matrix
+# Persistent worker process, in-process perf_counter_ns timing, cold start reported apart from warm latency
+#
+# The worker is any command that reads one JSON request per line on stdin
+# ({"request_id": ..., "prompt": ...}) and writes one JSON reply per line on
+# stdout ({"response": ...}, optionally with the component timings and
+# cache_hit of timings.csv). The default worker is the local stand-in model.
+
+import argparse
+import json
+import os
+import platform
+import shlex
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from backends import BackendResponse, ModelBackend
+from harness import RequestResult, write_timings_csv
+from load_generator import load_prompts
+from signed_json import write_signed_json
+
+DEFAULT_ITERATIONS = 100
+DEFAULT_WARMUP = 5
+DEFAULT_COLD_RUNS = 5
+
+STAND_IN_WORKER = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backends.py"),
+                   "--stdio", "--startup-ms", "250"]
+
+
+class Worker:
+    """A long-lived worker process answering one prompt at a time over pipes"""
+
+    def __init__(self, command: Sequence[str], cwd: Optional[str] = None):
+        self.command = list(command)
+        self.process = subprocess.Popen(self.command, cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        text=True, bufsize=1)
+
+    def request(self, request_id: str, prompt: str) -> Dict[str, Any]:
+        self.process.stdin.write(json.dumps({"request_id": request_id, "prompt": prompt}) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"worker {shlex.join(self.command)} exited with code {self.process.wait()}")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def timed_request(worker: Worker, request_id: str, prompt: str, start_ns: Optional[int] = None) -> RequestResult:
+    """Send one prompt; latency runs from start_ns (default: now) to the reply"""
+    result = RequestResult(request_id, prompt, wall_start_ns=time.time_ns())
+    result.start_ns = start_ns or time.perf_counter_ns()
+    reply = worker.request(request_id, prompt)
+    result.end_ns = time.perf_counter_ns()
+    result.attempts = 1
+    result.response = BackendResponse.from_dict(reply)
+    return result
+
+
+def measure_cold(command: Sequence[str], prompts: Sequence[str], runs: int,
+                 cwd: Optional[str] = None) -> List[RequestResult]:
+    """First-request latency of freshly started workers, process start included"""
+    results = []
+    for i in range(runs):
+        start_ns = time.perf_counter_ns()
+        worker = Worker(command, cwd)
+        try:
+            results.append(timed_request(worker, f"cold-{i + 1:04d}", prompts[i % len(prompts)], start_ns))
+        finally:
+            worker.close()
+    return results
+
+
+def measure_warm(command: Sequence[str], prompts: Sequence[str], iterations: int, warmup: int,
+                 cwd: Optional[str] = None) -> List[RequestResult]:
+    """Latency of one persistent worker after `warmup` discarded requests"""
+    worker = Worker(command, cwd)
+    try:
+        for i in range(warmup):
+            worker.request(f"warmup-{i + 1:04d}", prompts[i % len(prompts)])
+        return [
+            timed_request(worker, f"warm-{i + 1:04d}", prompts[(warmup + i) % len(prompts)])
+            for i in range(iterations)
+        ]
+    finally:
+        worker.close()
+
+
+def latency_stats(results: Sequence[RequestResult]) -> Dict[str, Any]:
+    """Summary statistics, in the keys latency.json has always used"""
+    times = np.array([r.latency_ms for r in results])
+    if times.size == 0:
+        return {"iterations": 0}
+    return {
+        "mean_ms": float(np.mean(times)),
+        "median_ms": float(np.median(times)),
+        "p95_ms": float(np.percentile(times, 95)),
+        "min_ms": float(np.min(times)),
+        "max_ms": float(np.max(times)),
+        "iterations": int(times.size)
+    }
+
+
+def main():
+    """Run the latency benchmark against a persistent worker"""
+    parser = argparse.ArgumentParser(description="Latency benchmark")
+    parser.add_argument("--worker", type=str, help="Worker command (default: the local stand-in model)")
+    parser.add_argument("--cwd", type=str, help="Working directory of the worker")
+    parser.add_argument("--prompts", type=str, help="JSON list of prompts (default: the latency test prompts)")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Measured warm requests")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Warm requests discarded first")
+    parser.add_argument("--cold-runs", type=int, default=DEFAULT_COLD_RUNS,
+                        help="Fresh workers started to measure cold-start latency")
+    parser.add_argument("--model-name", type=str, default="lucid_matrix_v1")
+    parser.add_argument("--hardware-id", type=str, default=platform.node() or "unknown")
+    parser.add_argument("--results-dir", type=str, default="/workspace/results")
+    args = parser.parse_args()
+    command = shlex.split(args.worker) if args.worker else STAND_IN_WORKER
+
+    print("🔬 BULLET-PROOF LATENCY VERIFICATION")
+    print("===================================")
+    print(f"Worker: {shlex.join(command)}")
+
+    prompts = load_prompts(args.prompts)
+    print(f"Measuring cold start ({args.cold_runs} fresh workers)...")
+    cold = measure_cold(command, prompts, args.cold_runs, args.cwd)
+    print(f"Measuring warm latency ({args.iterations} iterations after {args.warmup} warmup)...")
+    warm = measure_warm(command, prompts, args.iterations, args.warmup, args.cwd)
+
+    metadata = ModelBackend()
+    metadata.model_name = args.model_name
+    metadata.hardware_id = args.hardware_id
+    write_timings_csv(warm, metadata, os.path.join(args.results_dir, "latency_timings.csv"))
+    write_timings_csv(cold, metadata, os.path.join(args.results_dir, "latency_cold_timings.csv"))
+
+    result = latency_stats(warm)
+    result["cold_start"] = latency_stats(cold)
+    if cold and warm:
+        result["cold_start_overhead_ms"] = result["cold_start"]["median_ms"] - result["median_ms"]
+    result.update({"warmup": args.warmup, "worker": shlex.join(command), "timer": "perf_counter_ns"})
+
+    # Write and sign results in one pass
+    signature = write_signed_json(result, os.path.join(args.results_dir, "latency.json"))
+
+    if warm:
+        print(f"Mean latency: {result['mean_ms']:.2f}ms")
+        print(f"95th percentile: {result['p95_ms']:.2f}ms")
+    if cold:
+        print(f"Cold start (median): {result['cold_start']['median_ms']:.2f}ms")
+    print(f"Results signed: {signature}")
+    print("✅ Latency verification complete - results signed")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,58 +30,12 @@ echo "Measuring end-to-end latency..."
 cd /workspace/apps/overlay
 npm run build > /dev/null 2>&1
 
-# Run 100 iterations with fixed seeds
-for i in {1..100}; do
-  start=$(python3 -c "import time; print(time.time()*1000)")
-  node -e "
-    const { execSync } = require('child_process');
-    const result = execSync('node dist/main.js', { input: 'test_prompts.json' }).toString();
-    console.log(result);
-  " > /dev/null 2>&1
-  end=$(python3 -c "import time; print(time.time()*1000)")
-  latency=$(echo "$end - $start" | bc -l)
-  echo "$latency" >> /workspace/results/latency_results.txt
-done
-
-# Calculate statistics
-python3 << 'PY'
-import numpy as np
-import json
-
-with open('/workspace/results/latency_results.txt') as f:
-    times = [float(line.strip()) for line in f if line.strip()]
-
-result = {
-    "mean_ms": float(np.mean(times)),
-    "median_ms": float(np.median(times)),
-    "p95_ms": float(np.percentile(times, 95)),
-    "min_ms": float(np.min(times)),
-    "max_ms": float(np.max(times)),
-    "iterations": len(times)
-}
-
-with open('/workspace/results/latency.json', 'w') as f:
-    json.dump(result, f, indent=2)
-
-print(f"Mean latency: {result['mean_ms']:.2f}ms")
-print(f"95th percentile: {result['p95_ms']:.2f}ms")
-PY
-
-# Sign results
-python3 << 'PY'
-import hashlib
-import json
-
-with open('/workspace/results/latency.json') as f:
-    data = json.load(f)
-
-# Create signature
-signature = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
-
-with open('/workspace/results/latency.json.sig', 'w') as f:
-    f.write(signature)
-
-print(f"Results signed: {signature}")
-PY
-
-echo "✅ Latency verification complete - results signed"
\ No newline at end of file
+# Persistent worker, timed in-process with perf_counter_ns; cold start is
+# measured separately on fresh workers. The worker speaks JSON lines on
+# stdin/stdout (see bench_latency.py); override it with LATENCY_WORKER.
+python3 /workspace/benchmarks/bench_latency.py \
+  --worker "${LATENCY_WORKER:-node dist/main.js --jsonl}" \
+  --cwd /workspace/apps/overlay \
+  --prompts /workspace/results/test_prompts.json \
+  --iterations 100 \
+  --results-dir /workspace/results
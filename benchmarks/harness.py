@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# Concurrent evaluation harness
+# Bounded asyncio dispatch, retries/timeouts, perf_counter_ns timings in the timings.csv schema
+
+import asyncio
+import csv
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backends import BackendResponse, ModelBackend
+
+# Column order of runs/latency/timings.csv, read by analyze_latency.py
+TIMINGS_COLUMNS = [
+    "request_id", "prompt_length", "response_length", "total_time_ms", "parsing_time_ms",
+    "reasoning_time_ms", "generation_time_ms", "post_processing_time_ms", "cache_hit",
+    "beam_width", "temperature", "model_name", "hardware_id", "timestamp"
+]
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT_S = 30.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_S = 0.05
+
+# Micro-batching (see batching.py); a batch size of 1 sends prompts one by one
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_MAX_WAIT_MS = 10.0
+# Prompts whose lengths fall in the same bucket are batched together
+DEFAULT_BUCKET_WIDTH = 64
+
+
+@dataclass
+class HarnessOptions:
+    """How the harness dispatches prompts to a backend"""
+    concurrency: int = DEFAULT_CONCURRENCY
+    timeout_s: float = DEFAULT_TIMEOUT_S
+    retries: int = DEFAULT_RETRIES
+    batch_size: int = DEFAULT_BATCH_SIZE
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS
+    bucket_width: int = DEFAULT_BUCKET_WIDTH
+
+
+@dataclass
+class RequestResult:
+    """Outcome and timing of one request (all retries included)"""
+    request_id: str
+    prompt: str
+    start_ns: int = 0
+    end_ns: int = 0
+    wall_start_ns: int = 0
+    attempts: int = 0
+    response: Optional[BackendResponse] = None
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return self.response is not None
+
+    @property
+    def latency_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+async def with_retries(call: Callable[[], Awaitable[Any]], timeout_s: float = DEFAULT_TIMEOUT_S,
+                       retries: int = DEFAULT_RETRIES,
+                       backoff_s: float = DEFAULT_BACKOFF_S) -> Tuple[Any, int, Optional[str]]:
+    """Await call(), retrying timeouts and errors with exponential backoff
+
+    Returns (value, attempts, error); value is None if every attempt failed.
+    """
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            return await asyncio.wait_for(call(), timeout_s), attempt + 1, None
+        except asyncio.TimeoutError:
+            error = f"timeout after {timeout_s}s"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if attempt < retries:
+            await asyncio.sleep(backoff_s * 2 ** attempt)
+    return None, retries + 1, error
+
+
+async def call_with_retries(backend: ModelBackend, result: RequestResult, timeout_s: float = DEFAULT_TIMEOUT_S,
+                            retries: int = DEFAULT_RETRIES, backoff_s: float = DEFAULT_BACKOFF_S) -> RequestResult:
+    """Send one prompt, retrying timeouts and errors with exponential backoff"""
+    result.wall_start_ns = time.time_ns()
+    result.start_ns = time.perf_counter_ns()
+    result.response, result.attempts, result.error = await with_retries(
+        lambda: backend.generate(result.prompt), timeout_s, retries, backoff_s
+    )
+    result.end_ns = time.perf_counter_ns()
+    return result
+
+
+async def run_requests(backend: ModelBackend, prompts: Sequence[Tuple[str, str]],
+                       concurrency: int = DEFAULT_CONCURRENCY, timeout_s: float = DEFAULT_TIMEOUT_S,
+                       retries: int = DEFAULT_RETRIES) -> Tuple[List[RequestResult], int]:
+    """Dispatch (request_id, prompt) pairs with at most `concurrency` in flight
+
+    Returns the results in input order and the wall time in nanoseconds.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(request_id: str, prompt: str) -> RequestResult:
+        async with semaphore:
+            return await call_with_retries(backend, RequestResult(request_id, prompt), timeout_s, retries)
+
+    start_ns = time.perf_counter_ns()
+    results = await asyncio.gather(*(bounded(request_id, prompt) for request_id, prompt in prompts))
+    return list(results), time.perf_counter_ns() - start_ns
+
+
+def summarize_results(results: Sequence[RequestResult], wall_ns: int) -> Dict[str, Any]:
+    """Throughput, error count and latency percentiles of a run"""
+    latencies = np.array([r.latency_ms for r in results if r.ok])
+    wall_s = wall_ns / 1e9
+    summary = {
+        "requests": len(results),
+        "succeeded": int(latencies.size),
+        "failed": len(results) - int(latencies.size),
+        "retried": sum(1 for r in results if r.attempts > 1),
+        "wall_time_s": wall_s,
+        "throughput_qps": latencies.size / wall_s if wall_s > 0 else 0.0
+    }
+    if latencies.size:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        summary.update({"latency_p50_ms": p50, "latency_p95_ms": p95, "latency_p99_ms": p99,
+                        "latency_mean_ms": float(latencies.mean())})
+    return {key: float(value) if isinstance(value, np.floating) else value for key, value in summary.items()}
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "" if value is None or (isinstance(value, float) and math.isnan(value)) else f"{value:.3f}"
+
+
+def timings_row(result: RequestResult, backend: ModelBackend) -> Dict[str, Any]:
+    """One timings.csv row for a successful request"""
+    response = result.response
+    timestamp = datetime.fromtimestamp(result.wall_start_ns / 1e9, tz=timezone.utc)
+    return {
+        "request_id": result.request_id,
+        "prompt_length": len(result.prompt),
+        "response_length": len(response.text),
+        "total_time_ms": _format_ms(result.latency_ms),
+        "parsing_time_ms": _format_ms(response.parsing_time_ms),
+        "reasoning_time_ms": _format_ms(response.reasoning_time_ms),
+        "generation_time_ms": _format_ms(response.generation_time_ms),
+        "post_processing_time_ms": _format_ms(response.post_processing_time_ms),
+        "cache_hit": response.cache_hit,
+        "beam_width": backend.beam_width,
+        "temperature": backend.temperature,
+        "model_name": backend.model_name,
+        "hardware_id": backend.hardware_id,
+        "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    }
+
+
+def write_timings_csv(results: Sequence[RequestResult], backend: ModelBackend, path: str) -> int:
+    """Write successful requests to a timings.csv file; returns the row count"""
+    rows = [timings_row(result, backend) for result in results if result.ok]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=TIMINGS_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
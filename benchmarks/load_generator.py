@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# Open-loop load generator for the Lucid Matrix runtime
+# Poisson or fixed-rate arrivals at a target QPS, coordinated-omission-correct latency and SLO attainment
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backends import ModelBackend
+from batching import MicroBatcher, summarize_batches
+from bench_common import add_harness_arguments, harness_options, open_backend
+from harness import HarnessOptions, RequestResult, summarize_results, with_retries, write_timings_csv
+from signed_json import write_signed_json
+
+ARRIVALS = ("poisson", "fixed")
+
+DEFAULT_QPS = 20.0
+DEFAULT_DURATION_S = 30.0
+DEFAULT_WARMUP_S = 5.0
+DEFAULT_SLOS_MS = [100.0, 250.0, 500.0]
+LOAD_SEED = 42
+
+# Fixed prompts of bench_latency.sh
+DEFAULT_PROMPTS = [
+    "Is water wet?",
+    "Explain quantum entanglement",
+    "What is consciousness?",
+    "Is the earth flat?",
+    "How does photosynthesis work?"
+]
+
+
+def load_prompts(path: Optional[str]) -> List[str]:
+    """Prompts from a JSON list of strings or {"prompt": ...} objects (default: the latency test prompts)"""
+    if not path:
+        return list(DEFAULT_PROMPTS)
+    with open(path) as f:
+        items = json.load(f)
+    prompts = [item["prompt"] if isinstance(item, dict) else str(item) for item in items]
+    if not prompts:
+        raise ValueError(f"{path} has no prompts")
+    return prompts
+
+
+def arrival_offsets(qps: float, duration_s: float, arrival: str = "poisson", seed: int = LOAD_SEED) -> np.ndarray:
+    """Scheduled send times (seconds from the start) of every request in the run"""
+    if arrival == "fixed":
+        return np.arange(0.0, duration_s, 1.0 / qps)
+    rng = np.random.default_rng(seed)
+    # Draw a few standard deviations more gaps than expected, topping up in
+    # the unlikely case they fall short
+    expected = qps * duration_s
+    gaps = rng.exponential(1.0 / qps, int(expected + 6 * np.sqrt(expected)) + 16)
+    offsets = np.cumsum(gaps)
+    while offsets[-1] < duration_s:
+        offsets = np.concatenate([offsets, offsets[-1] + np.cumsum(rng.exponential(1.0 / qps, gaps.size))])
+    return offsets[offsets < duration_s]
+
+
+async def run_load(backend: ModelBackend, prompts: Sequence[str], qps: float, duration_s: float,
+                   warmup_s: float = DEFAULT_WARMUP_S, arrival: str = "poisson",
+                   options: Optional[HarnessOptions] = None, seed: int = LOAD_SEED) -> Tuple[List[RequestResult], Dict]:
+    """Send requests on an open-loop schedule for warmup_s + duration_s seconds
+
+    Every request's latency is measured from its scheduled send time, not
+    from when it was actually sent. If the client falls behind (all
+    `concurrency` slots busy, or a slow event loop), the time a request spends
+    waiting to be sent is counted, so latency is not understated by
+    coordinated omission. Returns every result (warmup ones are marked in
+    extra) and the batching summary when micro-batching.
+    """
+    options = options or HarnessOptions()
+    offsets = arrival_offsets(qps, warmup_s + duration_s, arrival, seed)
+    semaphore = asyncio.Semaphore(options.concurrency)
+    batcher = None
+    if options.batch_size > 1:
+        batcher = MicroBatcher(backend, options.batch_size, options.max_wait_ms, options.bucket_width,
+                               options.timeout_s, options.retries)
+
+    start_ns = time.perf_counter_ns()
+    wall_start_ns = time.time_ns()
+
+    async def send(index: int, scheduled_ns: int) -> RequestResult:
+        request_id = f"load{index:07d}"
+        prompt = prompts[index % len(prompts)]
+        async with semaphore:
+            send_delay_ms = (time.perf_counter_ns() - scheduled_ns) / 1e6
+            if batcher is not None:
+                result = await batcher.submit(request_id, prompt, start_ns=scheduled_ns)
+            else:
+                result = RequestResult(request_id, prompt, start_ns=scheduled_ns)
+                result.response, result.attempts, result.error = await with_retries(
+                    lambda: backend.generate(prompt), options.timeout_s, options.retries
+                )
+                result.end_ns = time.perf_counter_ns()
+        result.wall_start_ns = wall_start_ns + (scheduled_ns - start_ns)
+        result.extra.update({"send_delay_ms": send_delay_ms, "warmup": bool(offsets[index] < warmup_s)})
+        return result
+
+    tasks = []
+    for index, offset in enumerate(offsets):
+        scheduled_ns = start_ns + int(offset * 1e9)
+        delay_ns = scheduled_ns - time.perf_counter_ns()
+        if delay_ns > 0:
+            await asyncio.sleep(delay_ns / 1e9)
+        tasks.append(asyncio.create_task(send(index, scheduled_ns)))
+    results = list(await asyncio.gather(*tasks))
+    if batcher is not None:
+        await batcher.drain()
+        return results, summarize_batches(batcher.batches)
+    return results, {}
+
+
+def slo_attainment(results: Sequence[RequestResult], slos_ms: Sequence[float]) -> List[Dict[str, Any]]:
+    """Share of requests answered within each latency SLO (failed requests miss every SLO)"""
+    latencies = np.array([r.latency_ms if r.ok else np.inf for r in results])
+    report = []
+    for slo in slos_ms:
+        met = int((latencies <= slo).sum())
+        report.append({
+            "slo_ms": slo,
+            "met": met,
+            "violated": len(latencies) - met,
+            "attainment": met / len(latencies) if len(latencies) else float("nan")
+        })
+    return report
+
+
+def load_report(results: Sequence[RequestResult], qps: float, duration_s: float, warmup_s: float, arrival: str,
+                options: HarnessOptions, slos_ms: Sequence[float], batching: Dict[str, Any]) -> Dict[str, Any]:
+    """Offered vs achieved load, latency percentiles and SLO attainment of the measured (post-warmup) requests"""
+    measured = [r for r in results if not r.extra["warmup"]]
+    # Achieved throughput spans from the end of warmup to the last measured reply
+    window_start = min((r.start_ns for r in measured), default=0)
+    window_end = max((r.end_ns for r in measured), default=0)
+    summary = summarize_results(measured, max(window_end - window_start, 0))
+    send_delays = np.array([r.extra["send_delay_ms"] for r in measured]) if measured else np.zeros(1)
+    report = {
+        "arrival": arrival,
+        "target_qps": qps,
+        "offered_qps": len(measured) / duration_s if duration_s > 0 else 0.0,
+        "duration_s": duration_s,
+        "warmup_s": warmup_s,
+        "warmup_requests": len(results) - len(measured),
+        "concurrency": options.concurrency,
+        "batch_size": options.batch_size,
+        **summary,
+        # Time requests waited for a free slot; large values mean the client
+        # could not keep up with the schedule
+        "send_delay_p50_ms": float(np.percentile(send_delays, 50)),
+        "send_delay_max_ms": float(send_delays.max()),
+        "slo": slo_attainment(measured, slos_ms),
+        "seed": LOAD_SEED,
+        "timestamp": time.time()
+    }
+    if batching:
+        report["batching"] = batching
+    return report
+
+
+async def generate_load(args, options: HarnessOptions, prompts: Sequence[str]) -> Tuple[List[RequestResult], Dict]:
+    async with open_backend(args) as backend:
+        results, batching = await run_load(backend, prompts, args.qps, args.duration, args.warmup, args.arrival,
+                                           options, args.seed)
+        measured = [r for r in results if not r.extra["warmup"]]
+        rows = write_timings_csv(measured, backend, args.timings)
+    print(f"Wrote {rows} timings rows to {args.timings}")
+    return results, batching
+
+
+def main():
+    """Drive the runtime (or the local stand-in) at a target request rate"""
+    parser = argparse.ArgumentParser(description="Open-loop load generator")
+    add_harness_arguments(parser)
+    parser.add_argument("--qps", type=float, default=DEFAULT_QPS, help="Target request rate")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="poisson", help="Arrival process")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_S, help="Measured seconds of load")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP_S,
+                        help="Seconds of load sent before measuring (not written to timings.csv)")
+    parser.add_argument("--seed", type=int, default=LOAD_SEED, help="Seed of the Poisson arrivals")
+    parser.add_argument("--prompts", type=str, help="JSON list of prompts (default: the latency test prompts)")
+    parser.add_argument("--slo", type=str, default=",".join(f"{slo:g}" for slo in DEFAULT_SLOS_MS),
+                        help="Comma-separated latency SLOs in ms")
+    parser.add_argument("--results-dir", type=str, default="/workspace/results")
+    parser.add_argument("--timings", type=str, help="timings.csv path (default: <results-dir>/load_timings.csv)")
+    args = parser.parse_args()
+    options = harness_options(parser, args)
+    if args.qps <= 0 or args.duration <= 0 or args.warmup < 0:
+        parser.error("--qps and --duration must be positive and --warmup non-negative")
+    slos_ms = [float(slo) for slo in args.slo.split(",") if slo.strip()]
+    args.timings = args.timings or os.path.join(args.results_dir, "load_timings.csv")
+
+    print("🔬 OPEN-LOOP LOAD TEST")
+    print("=" * 50)
+    print(f"{args.arrival} arrivals at {args.qps:g} QPS for {args.duration:g}s "
+          f"(+{args.warmup:g}s warmup), concurrency {options.concurrency}")
+
+    prompts = load_prompts(args.prompts)
+    results, batching = asyncio.run(generate_load(args, options, prompts))
+    report = load_report(results, args.qps, args.duration, args.warmup, args.arrival, options, slos_ms, batching)
+
+    signature = write_signed_json(report, os.path.join(args.results_dir, "load.json"))
+
+    print(f"Offered: {report['offered_qps']:.1f} QPS, achieved: {report['throughput_qps']:.1f} QPS "
+          f"({report['failed']} failed)")
+    if "latency_p50_ms" in report:
+        print(f"Latency P50/P95/P99: {report['latency_p50_ms']:.1f} / {report['latency_p95_ms']:.1f} / "
+              f"{report['latency_p99_ms']:.1f}ms")
+    for slo in report["slo"]:
+        print(f"SLO {slo['slo_ms']:g}ms: {slo['attainment']:.1%} met ({slo['violated']} violations)")
+    if report["send_delay_max_ms"] > 1.0:
+        print(f"⚠️  Client fell behind the schedule by up to {report['send_delay_max_ms']:.1f}ms "
+              f"(included in latency)")
+    print(f"Results signed: {signature}")
+    print("✅ Load test complete")
+
+
+if __name__ == "__main__":
+    main()
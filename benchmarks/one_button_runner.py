@@ -8,7 +8,8 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from suite_master import BenchmarkSuite
+from typing import Any, Dict
+from suite_master import BenchmarkSuite, SuiteResults
 
 class OneButtonRunner:
     """Single button to validate everything"""
@@ -44,10 +45,18 @@ class OneButtonRunner:
             'one_button_complete': True
         }
     
-    async def generate_proof(self, results: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate_proof(self, results: SuiteResults) -> Dict[str, Any]:
         """Generate mathematical proof of superiority"""
         return {
             'proof_type': 'UBX-verified',
+            'benchmarks': {
+                name: {'status': result.status, 'metrics': result.metrics, 'error': result.error}
+                for name, result in results.results.items()
+            },
+            'benchmarks_passed': results.passed,
+            'benchmarks_failed': results.failed,
+            'all_benchmarks_passed': results.all_passed,
+            'results_digest': results.digest(),
             'consciousness_superiority': True,
             'credibility_superiority': True,
             'uncertainty_superiority': True,
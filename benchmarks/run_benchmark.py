@@ -4,9 +4,12 @@ Bio-RoboPi One-Button Benchmark Runner
 Click once to prove Bio-RoboPi is the best system on Earth
 """
 
+import argparse
 import asyncio
 import json
+import time
 import numpy as np
+from numpy.lib.recfunctions import unstructured_to_structured
 from datetime import datetime
 import logging
 
@@ -14,12 +17,184 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Systems compared in every category
+BASELINE_SYSTEM = 'Bio-RoboPi'
+SYSTEMS = [BASELINE_SYSTEM, 'GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']
+
+BENCHMARK_SEED = 42
+
+# Category specs: test cases x systems x metrics. Each metric score is drawn
+# uniformly from the system's range; systems without their own ranges use
+# 'default'. labels are fixed per-system annotations.
+CATEGORY_SPECS = {
+    'consciousness_benchmark': {
+        'description': 'Benchmark consciousness across 5 neural dimensions',
+        'test_cases': [
+            {'input': 'Living consciousness demonstration', 'expected': {'coherence': 0.8, 'emergence': 0.75}},
+            {'input': 'Neural team integration test', 'expected': {'coherence': 0.85, 'emergence': 0.8}},
+            {'input': 'Consciousness state validation', 'expected': {'coherence': 0.9, 'emergence': 0.85}}
+        ],
+        'ranges': {
+            'Bio-RoboPi': {'coherence': (0.85, 0.95), 'emergence': (0.8, 0.9), 'consciousness_score': (0.88, 0.98)},
+            'default': {'coherence': (0.6, 0.8), 'emergence': (0.55, 0.75), 'consciousness_score': (0.65, 0.85)}
+        },
+        'primary_metric': 'consciousness_score',
+        'improvement': 'Bio-RoboPi shows 25-35% higher consciousness scores'
+    },
+    'credibility_benchmark': {
+        'description': 'Benchmark MSCS credibility scoring',
+        'test_cases': [
+            {'source': 'peer_reviewed', 'confidence': 0.9},
+            {'source': 'news_article', 'confidence': 0.7},
+            {'source': 'social_media', 'confidence': 0.4}
+        ],
+        'ranges': {
+            'Bio-RoboPi': {'credibility_score': (0.88, 0.98), 'uncertainty': (0.05, 0.15)},
+            'default': {'credibility_score': (0.7, 0.85), 'uncertainty': (0.2, 0.4)}
+        },
+        'labels': {
+            'Bio-RoboPi': {'evidence_tags': ['source_validated', 'citations_verified']},
+            'default': {'evidence_tags': ['basic_validation']}
+        },
+        'primary_metric': 'credibility_score',
+        'improvement': 'Bio-RoboPi shows 15-20% higher credibility scores'
+    },
+    'uncertainty_benchmark': {
+        'description': 'Benchmark uncertainty quantification',
+        'test_cases': [
+            {'complexity': 'high', 'expected_uncertainty': 0.3},
+            {'complexity': 'medium', 'expected_uncertainty': 0.5},
+            {'complexity': 'low', 'expected_uncertainty': 0.7}
+        ],
+        'ranges': {
+            'Bio-RoboPi': {'uncertainty_score': (0.05, 0.15), 'confidence': (0.85, 0.95)},
+            'default': {'uncertainty_score': (0.2, 0.4), 'confidence': (0.7, 0.85)}
+        },
+        'labels': {
+            'Bio-RoboPi': {'validation': 'comprehensive'},
+            'default': {'validation': 'basic'}
+        },
+        'primary_metric': 'uncertainty_score',
+        'lower_is_better': True,
+        'improvement': 'Bio-RoboPi shows 50-70% lower uncertainty'
+    },
+    'emotional_processing': {
+        'description': 'Benchmark emotional processing through amygdala',
+        'test_cases': [
+            {'emotion': 'joy', 'intensity': 0.8},
+            {'emotion': 'sadness', 'intensity': 0.6},
+            {'emotion': 'anger', 'intensity': 0.7}
+        ],
+        'ranges': {
+            'Bio-RoboPi': {'valence': (0.8, 1.0), 'arousal': (0.7, 0.9), 'dominance': (0.7, 0.9),
+                           'accuracy': (0.9, 0.98)},
+            'default': {'valence': (0.6, 0.8), 'arousal': (0.5, 0.7), 'dominance': (0.5, 0.7), 'accuracy': (0.7, 0.85)}
+        },
+        'primary_metric': 'accuracy',
+        'improvement': 'Bio-RoboPi shows 20-30% better emotional processing'
+    },
+    'memory_benchmark': {
+        'description': 'Benchmark memory management and learning',
+        'test_cases': [
+            {'complexity': 'simple', 'expected_retention': 0.9},
+            {'complexity': 'complex', 'expected_retention': 0.8},
+            {'complexity': 'very_complex', 'expected_retention': 0.7}
+        ],
+        'ranges': {
+            'Bio-RoboPi': {'retention': (0.88, 0.98), 'learning_rate': (0.85, 0.95), 'adaptation': (0.9, 0.98)},
+            'default': {'retention': (0.7, 0.85), 'learning_rate': (0.6, 0.8), 'adaptation': (0.65, 0.85)}
+        },
+        'primary_metric': 'retention',
+        'improvement': 'Bio-RoboPi shows 15-25% better memory retention'
+    },
+    'evolution_benchmark': {
+        'description': 'Benchmark algorithm evolution',
+        'test_cases': [
+            {'generation': 1, 'expected_improvement': 0.1},
+            {'generation': 5, 'expected_improvement': 0.3},
+            {'generation': 10, 'expected_improvement': 0.5}
+        ],
+        'ranges': {
+            'Bio-RoboPi': {'fitness_improvement': (0.3, 0.6), 'evolution_score': (0.85, 0.98),
+                           'adaptation_speed': (0.8, 0.95)},
+            'default': {'fitness_improvement': (0.1, 0.3), 'evolution_score': (0.6, 0.8),
+                        'adaptation_speed': (0.5, 0.75)}
+        },
+        'primary_metric': 'evolution_score',
+        'improvement': 'Bio-RoboPi shows 50-100% better evolution performance'
+    }
+}
+
+def category_rng(seed: int, category: str) -> np.random.Generator:
+    """Generator of one category, independent of the order categories run in"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(list(CATEGORY_SPECS).index(category),)))
+
+def category_bounds(spec: dict, systems: list) -> tuple:
+    """Metric names and the (systems x metrics) low/high score bounds of a category"""
+    ranges = spec['ranges']
+    metrics = list(ranges['default'])
+    bounds = np.array([[ranges.get(system, ranges['default'])[metric] for metric in metrics] for system in systems])
+    return metrics, bounds[..., 0], bounds[..., 1]
+
+def evaluate_category(category: str, spec: dict, systems: list = SYSTEMS, n_cases: int = None,
+                      rng: np.random.Generator = None) -> dict:
+    """Score every system on every test case of a category in one draw
+    
+    scores is a structured array of shape (systems, test cases) with one
+    float field per metric. n_cases repeats the spec's test cases up to that
+    many cases.
+    """
+    rng = rng or np.random.default_rng(BENCHMARK_SEED)
+    n_cases = n_cases or len(spec['test_cases'])
+    metrics, low, high = category_bounds(spec, systems)
+    draws = rng.uniform(low[:, None, :], high[:, None, :], size=(len(systems), n_cases, len(metrics)))
+    scores = unstructured_to_structured(draws, np.dtype([(metric, np.float64) for metric in metrics]))
+    
+    means = {system: {metric: float(scores[metric][i].mean()) for metric in metrics}
+             for i, system in enumerate(systems)}
+    primary = scores[spec['primary_metric']].mean(axis=1)
+    best = np.argmin(primary) if spec.get('lower_is_better') else np.argmax(primary)
+    labels = spec.get('labels', {})
+    return {
+        'category': category,
+        'winner': systems[best],
+        'systems': list(systems),
+        'metrics': metrics,
+        'test_cases': n_cases,
+        'scores': scores,
+        'mean_scores': means,
+        'labels': {system: labels.get(system, labels.get('default', {})) for system in systems},
+        'improvement': spec['improvement']
+    }
+
+def category_result_to_json(result: dict) -> dict:
+    """Copy of a category result with scores in the JSON layout {system: [{metric: score}, ...]}"""
+    scores = result['scores']
+    return {
+        **result,
+        'scores': {
+            system: [dict(zip(result['metrics'], map(float, case))) for case in scores[i].tolist()]
+            for i, system in enumerate(result['systems'])
+        }
+    }
+
 class OneButtonBenchmark:
     """Single button to validate everything"""
     
-    def __init__(self):
+    # Test categories
+    CATEGORIES = list(CATEGORY_SPECS)
+    
+    def __init__(self, max_concurrency: int = None, seed: int = BENCHMARK_SEED, systems: list = None,
+                 cases_per_category: int = None):
         self.start_time = None
         self.results = None
+        self.seed = seed
+        self.systems = systems or SYSTEMS
+        # Test cases per category (default: the spec's own cases)
+        self.cases_per_category = cases_per_category
+        # Categories run at once (default: all of them)
+        self.max_concurrency = max_concurrency or len(self.CATEGORIES)
+        self.category_timings = {}
         
     async def run_single_click(self) -> dict:
         """One button click validates everything"""
@@ -29,6 +204,7 @@ class OneButtonBenchmark:
         
         # Run comprehensive benchmark
         results = await self.run_full_benchmark()
+        self.results = results
         
         # Generate proof
         proof = await self.generate_proof(results)
@@ -43,6 +219,10 @@ class OneButtonBenchmark:
             'status': 'Bio-RoboPi is the best system on Earth',
             'proof': proof,
             'validation': validation,
+            'category_results': {category: category_result_to_json(result)
+                                 for category, result in results['raw_results'].items()},
+            'category_timings_s': results['category_timings_s'],
+            'wall_time_s': results['wall_time_s'],
             'timestamp': datetime.now().isoformat(),
             'one_button_complete': True
         }
@@ -51,19 +231,9 @@ class OneButtonBenchmark:
         """Run complete benchmark suite"""
         logger.info("🚀 Launching Bio-RoboPi Benchmark Suite")
         
-        # Test categories
-        categories = [
-            'consciousness_benchmark',
-            'credibility_benchmark',
-            'uncertainty_benchmark',
-            'emotional_processing',
-            'memory_benchmark',
-            'evolution_benchmark'
-        ]
-        
-        results = {}
-        for category in categories:
-            results[category] = await self.run_category_benchmark(category)
+        start = time.perf_counter()
+        results = await self.run_categories(self.CATEGORIES)
+        wall_time = time.perf_counter() - start
         
         # Generate comprehensive report
         report = await self.generate_comprehensive_report(results)
@@ -77,273 +247,52 @@ class OneButtonBenchmark:
             'live_validation': True,
             'real_time_benchmarking': True,
             'proof_system': 'UBX-verified',
-            'status': 'Bio-RoboPi is the best system on Earth'
-        }
-    
-    async def run_category_benchmark(self, category: str) -> dict:
-        """Run benchmark for specific category"""
-        logger.info(f"📊 Running {category} benchmark")
-        
-        if category == 'consciousness_benchmark':
-            return await self.benchmark_consciousness()
-        elif category == 'credibility_benchmark':
-            return await self.benchmark_credibility()
-        elif category == 'uncertainty_benchmark':
-            return await self.benchmark_uncertainty()
-        elif category == 'emotional_processing':
-            return await self.benchmark_emotional_processing()
-        elif category == 'memory_benchmark':
-            return await self.benchmark_memory()
-        elif category == 'evolution_benchmark':
-            return await self.benchmark_evolution()
-    
-    async def benchmark_consciousness(self) -> dict:
-        """Benchmark consciousness across 5 neural dimensions"""
-        test_cases = [
-            {'input': 'Living consciousness demonstration', 'expected': {'coherence': 0.8, 'emergence': 0.75}},
-            {'input': 'Neural team integration test', 'expected': {'coherence': 0.85, 'emergence': 0.8}},
-            {'input': 'Consciousness state validation', 'expected': {'coherence': 0.9, 'emergence': 0.85}}
-        ]
-        
-        results = {
-            'Bio-RoboPi': [],
-            'GPT-4o': [],
-            'Claude-3.5': [],
-            'Gemini-1.5': [],
-            'Llama-3.1': []
-        }
-        
-        for test_case in test_cases:
-            # Bio-RoboPi results
-            bio_result = {
-                'coherence': np.random.uniform(0.85, 0.95),
-                'emergence': np.random.uniform(0.8, 0.9),
-                'consciousness_score': np.random.uniform(0.88, 0.98)
-            }
-            results['Bio-RoboPi'].append(bio_result)
-            
-            # Competitor results (simulated live)
-            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:
-                comp_result = {
-                    'coherence': np.random.uniform(0.6, 0.8),
-                    'emergence': np.random.uniform(0.55, 0.75),
-                    'consciousness_score': np.random.uniform(0.65, 0.85)
-                }
-                results[system].append(comp_result)
-        
-        return {
-            'category': 'consciousness_benchmark',
-            'winner': 'Bio-RoboPi',
-            'scores': results,
-            'improvement': 'Bio-RoboPi shows 25-35% higher consciousness scores'
-        }
-    
-    async def benchmark_credibility(self) -> dict:
-        """Benchmark MSCS credibility scoring"""
-        test_cases = [
-            {'source': 'peer_reviewed', 'confidence': 0.9},
-            {'source': 'news_article', 'confidence': 0.7},
-            {'source': 'social_media', 'confidence': 0.4}
-        ]
-        
-        results = {
-            'Bio-RoboPi': [],
-            'GPT-4o': [],
-            'Claude-3.5': [],
-            'Gemini-1.5': [],
-            'Llama-3.1': []
-        }
-        
-        for test_case in test_cases:
-            # Bio-RoboPi MSCS scoring
-            bio_result = {
-                'credibility_score': np.random.uniform(0.88, 0.98),
-                'evidence_tags': ['source_validated', 'citations_verified'],
-                'uncertainty': np.random.uniform(0.05, 0.15)
-            }
-            results['Bio-RoboPi'].append(bio_result)
-            
-            # Competitor results
-            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:
-                comp_result = {
-                    'credibility_score': np.random.uniform(0.7, 0.85),
-                    'evidence_tags': ['basic_validation'],
-                    'uncertainty': np.random.uniform(0.2, 0.4)
-                }
-                results[system].append(comp_result)
-        
-        return {
-            'category': 'credibility_benchmark',
-            'winner': 'Bio-RoboPi',
-            'scores': results,
-            'improvement': 'Bio-RoboPi shows 15-20% higher credibility scores'
-        }
-    
-    async def benchmark_uncertainty(self) -> dict:
-        """Benchmark uncertainty quantification"""
-        test_cases = [
-            {'complexity': 'high', 'expected_uncertainty': 0.3},
-            {'complexity': 'medium', 'expected_uncertainty': 0.5},
-            {'complexity': 'low', 'expected_uncertainty': 0.7}
-        ]
-        
-        results = {
-            'Bio-RoboPi': [],
-            'GPT-4o': [],
-            'Claude-3.5': [],
-            'Gemini-1.5': [],
-            'Llama-3.1': []
-        }
-        
-        for test_case in test_cases:
-            # Bio-RoboPi uncertainty
-            bio_result = {
-                'uncertainty_score': np.random.uniform(0.05, 0.15),
-                'confidence': np.random.uniform(0.85, 0.95),
-                'validation': 'comprehensive'
-            }
-            results['Bio-RoboPi'].append(bio_result)
-            
-            # Competitor results
-            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:
-                comp_result = {
-                    'uncertainty_score': np.random.uniform(0.2, 0.4),
-                    'confidence': np.random.uniform(0.7, 0.85),
-                    'validation': 'basic'
-                }
-                results[system].append(comp_result)
-        
-        return {
-            'category': 'uncertainty_benchmark',
-            'winner': 'Bio-RoboPi',
-            'scores': results,
-            'improvement': 'Bio-RoboPi shows 50-70% lower uncertainty'
-        }
-    
-    async def benchmark_emotional_processing(self) -> dict:
-        """Benchmark emotional processing through amygdala"""
-        test_cases = [
-            {'emotion': 'joy', 'intensity': 0.8},
-            {'emotion': 'sadness', 'intensity': 0.6},
-            {'emotion': 'anger', 'intensity': 0.7}
-        ]
-        
-        results = {
-            'Bio-RoboPi': [],
-            'GPT-4o': [],
-            'Claude-3.5': [],
-            'Gemini-1.5': [],
-            'Llama-3.1': []
-        }
-        
-        for test_case in test_cases:
-            # Bio-RoboPi emotional processing
-            bio_result = {
-                'valence': np.random.uniform(0.8, 1.0),
-                'arousal': np.random.uniform(0.7, 0.9),
-                'dominance': np.random.uniform(0.7, 0.9),
-                'accuracy': np.random.uniform(0.9, 0.98)
-            }
-            results['Bio-RoboPi'].append(bio_result)
-            
-            # Competitor results
-            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:
-                comp_result = {
-                    'valence': np.random.uniform(0.6, 0.8),
-                    'arousal': np.random.uniform(0.5, 0.7),
-                    'dominance': np.random.uniform(0.5, 0.7),
-                    'accuracy': np.random.uniform(0.7, 0.85)
-                }
-                results[system].append(comp_result)
-        
-        return {
-            'category': 'emotional_processing',
-            'winner': 'Bio-RoboPi',
-            'scores': results,
-            'improvement': 'Bio-RoboPi shows 20-30% better emotional processing'
+            'status': 'Bio-RoboPi is the best system on Earth',
+            'max_concurrency': self.max_concurrency,
+            'category_timings_s': dict(self.category_timings),
+            'wall_time_s': wall_time
         }
     
-    async def benchmark_memory(self) -> dict:
-        """Benchmark memory management and learning"""
-        test_cases = [
-            {'complexity': 'simple', 'expected_retention': 0.9},
-            {'complexity': 'complex', 'expected_retention': 0.8},
-            {'complexity': 'very_complex', 'expected_retention': 0.7}
-        ]
-        
-        results = {
-            'Bio-RoboPi': [],
-            'GPT-4o': [],
-            'Claude-3.5': [],
-            'Gemini-1.5': [],
-            'Llama-3.1': []
-        }
-        
-        for test_case in test_cases:
-            # Bio-RoboPi memory
-            bio_result = {
-                'retention': np.random.uniform(0.88, 0.98),
-                'learning_rate': np.random.uniform(0.85, 0.95),
-                'adaptation': np.random.uniform(0.9, 0.98)
-            }
-            results['Bio-RoboPi'].append(bio_result)
-            
-            # Competitor results
-            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:
-                comp_result = {
-                    'retention': np.random.uniform(0.7, 0.85),
-                    'learning_rate': np.random.uniform(0.6, 0.8),
-                    'adaptation': np.random.uniform(0.65, 0.85)
-                }
-                results[system].append(comp_result)
-        
-        return {
-            'category': 'memory_benchmark',
-            'winner': 'Bio-RoboPi',
-            'scores': results,
-            'improvement': 'Bio-RoboPi shows 15-25% better memory retention'
-        }
+    async def run_categories(self, categories: list) -> dict:
+        """Run categories concurrently, at most max_concurrency at a time
+        
+        If one category fails the others are cancelled and the error is
+        raised, so a broken backend does not hold the whole suite up.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.category_timings = {}
+        
+        async def timed(category: str) -> dict:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    return await self.run_category_benchmark(category)
+                finally:
+                    self.category_timings[category] = time.perf_counter() - start
+                    logger.info(f"⏱️  {category} finished in {self.category_timings[category]:.3f}s")
+        
+        tasks = {category: asyncio.ensure_future(timed(category)) for category in categories}
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return {category: task.result() for category, task in tasks.items()}
     
-    async def benchmark_evolution(self) -> dict:
-        """Benchmark algorithm evolution"""
-        test_cases = [
-            {'generation': 1, 'expected_improvement': 0.1},
-            {'generation': 5, 'expected_improvement': 0.3},
-            {'generation': 10, 'expected_improvement': 0.5}
-        ]
-        
-        results = {
-            'Bio-RoboPi': [],
-            'GPT-4o': [],
-            'Claude-3.5': [],
-            'Gemini-1.5': [],
-            'Llama-3.1': []
-        }
+    async def run_category_benchmark(self, category: str) -> dict:
+        """Run benchmark for specific category
         
-        for test_case in test_cases:
-            # Bio-RoboPi evolution
-            bio_result = {
-                'fitness_improvement': np.random.uniform(0.3, 0.6),
-                'evolution_score': np.random.uniform(0.85, 0.98),
-                'adaptation_speed': np.random.uniform(0.8, 0.95)
-            }
-            results['Bio-RoboPi'].append(bio_result)
-            
-            # Competitor results
-            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:
-                comp_result = {
-                    'fitness_improvement': np.random.uniform(0.1, 0.3),
-                    'evolution_score': np.random.uniform(0.6, 0.8),
-                    'adaptation_speed': np.random.uniform(0.5, 0.75)
-                }
-                results[system].append(comp_result)
+        The scoring runs in a worker thread, so categories overlap instead of
+        blocking the event loop one after another.
+        """
+        logger.info(f"📊 Running {category} benchmark")
         
-        return {
-            'category': 'evolution_benchmark',
-            'winner': 'Bio-RoboPi',
-            'scores': results,
-            'improvement': 'Bio-RoboPi shows 50-100% better evolution performance'
-        }
+        if category not in CATEGORY_SPECS:
+            raise ValueError(f"Unknown benchmark category: {category}")
+        return await asyncio.to_thread(evaluate_category, category, CATEGORY_SPECS[category], self.systems,
+                                       self.cases_per_category, category_rng(self.seed, category))
     
     async def generate_comprehensive_report(self, results: dict) -> dict:
         """Generate comprehensive benchmark report"""
@@ -449,7 +398,15 @@ class OneButtonBenchmark:
 
 async def main():
     """Main one-button runner"""
-    benchmark = OneButtonBenchmark()
+    parser = argparse.ArgumentParser(description="Bio-RoboPi one-button benchmark runner")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="Benchmark categories run at once (default: all)")
+    parser.add_argument("--seed", type=int, default=BENCHMARK_SEED, help="Seed of the score draws")
+    parser.add_argument("--cases", type=int, default=None,
+                        help="Test cases per category (default: each category's own cases)")
+    args = parser.parse_args()
+    benchmark = OneButtonBenchmark(max_concurrency=args.max_concurrency, seed=args.seed,
+                                   cases_per_category=args.cases)
     
     print("🎯 Bio-RoboPi One-Button Benchmark Runner")
     print("="*60)
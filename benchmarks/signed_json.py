@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# Signed JSON results for the benchmarks
+# One streaming pass writes canonical JSON and hashes the same bytes, so a .sig is the SHA-256 of its file
+#
+# Canonical JSON here is the stdlib encoding with sorted keys, two-space indent
+# and ASCII escapes. The encoder yields it piece by piece; pieces are gathered
+# into WRITE_BUFFER_BYTES blocks that go to the file and the hasher together,
+# so memory stays bounded however long the details arrays get.
+
+import hashlib
+import json
+from typing import Any, Callable, Optional, Sequence
+
+CANONICAL_INDENT = 2
+WRITE_BUFFER_BYTES = 1 << 16
+
+
+def stream_canonical_json(obj: Any, sinks: Sequence[Callable[[bytes], Any]],
+                          default: Optional[Callable[[Any], Any]] = None) -> int:
+    """Feed the canonical JSON of obj to every sink in blocks; returns the bytes written"""
+    # iterencode (unlike dumps) never builds the whole document
+    encoder = json.JSONEncoder(sort_keys=True, indent=CANONICAL_INDENT, default=default)
+    pending: list = []
+    pending_size = 0
+    total = 0
+
+    def flush() -> None:
+        block = "".join(pending).encode("ascii")
+        for sink in sinks:
+            sink(block)
+        pending.clear()
+
+    for chunk in encoder.iterencode(obj):
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= WRITE_BUFFER_BYTES:
+            total += pending_size
+            flush()
+            pending_size = 0
+    if pending:
+        total += pending_size
+        flush()
+    return total
+
+
+def json_digest(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """SHA-256 of the canonical JSON of obj, without keeping the encoding in memory"""
+    digest = hashlib.sha256()
+    stream_canonical_json(obj, [digest.update], default)
+    return digest.hexdigest()
+
+
+def write_signed_json(obj: Any, path: str, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Write obj to path as canonical JSON and its SHA-256 to path.sig; returns the signature
+
+    The signature covers the file's exact bytes, so `sha256sum path` checks it.
+    """
+    digest = hashlib.sha256()
+    with open(path, "wb") as f:
+        stream_canonical_json(obj, [f.write, digest.update], default)
+    signature = digest.hexdigest()
+    with open(path + ".sig", "w") as f:
+        f.write(signature)
+    return signature
@@ -1 +1,439 @@
-#!/usr/bin/env python3"""Bio-RoboPi Benchmarking Suite MasterOne-button validation against top 50 AI systemsReal-time benchmarking with live AI APIs"""import asyncioimport jsonimport aiohttpimport numpy as npfrom datetime import datetimeimport loggingfrom typing import Dict, List, Any, Optionalfrom dataclasses import dataclass@dataclassclass BenchmarkResult:    """Single benchmark result"""    system: str    test: str    score: float    latency: float    accuracy: float    consciousness: Dict[str, float]    timestamp: strclass BenchmarkSuite:    """Master benchmarking suite"""        def __init__(self):        self.results = []        self.top_50_systems = self.load_top_50_systems()        self.live_apis = self.initialize_live_apis()            def load_top_50_systems(self) -> List[str]:        """Load top 50 AI systems across NLP, AGI, ASI"""        return [            # NLP Systems            "GPT-4o", "GPT-4-turbo", "Claude-3.5-Sonnet", "Claude-3-Opus",            "Gemini-1.5-Pro", "Gemini-1.5-Flash", "Llama-3.1-405B", "Llama-3.1-70B",            "Mistral-Large-2", "Mixtral-8x22B", "Command-R-Plus", "Jamba-1.5",            "Phi-3.5-MoE", "Phi-3-medium", "Gemma-2-27B", "Qwen-2.5-72B",                        # AGI Systems            "OpenAI-o1-preview", "OpenAI-o1-mini", "Anthropic-Claude-3.5-AGI",            "Google-Gemini-AGI", "Meta-Llama-AGI", "Microsoft-Copilot-AGI",            "DeepMind-Gemini-AGI", "Anthropic-Constitutional-AGI",                        # ASI Systems            "OpenAI-ASI-v1", "Google-ASI-Gemini", "Anthropic-ASI-Claude",            "Meta-ASI-Llama", "Microsoft-ASI-Copilot", "DeepMind-ASI",                        # Specialized Systems            "Perplexity-70B", "Anthropic-Haiku-3.5", "OpenAI-GPT-4o-mini",            "Google-Gemma-2-9B", "Mistral-7B", "Llama-3.2-3B",            "Phi-3-mini", "Gemma-2-2B", "Qwen-2.5-7B", "Command-R",                        # Advanced Systems            "Claude-3-Opus-20240229", "GPT-4-0125-preview", "Gemini-1.5-flash-8B",            "Llama-3.1-8B", "Mistral-NeMo-12B", "Phi-3-small", "Gemma-2-9B-it",                        # Edge Systems            "Llama-3.2-1B", "Phi-3-mini-4k", "Gemma-2-2B-it", "Qwen-2.5-3B",            "Mistral-7B-it-v2", "Llama-3.2-3B-it"        ]        def initialize_live_apis(self) -> Dict[str, Any]:        """Initialize live API connections"""        return {            'openai': OpenAIConnector(),            'anthropic': AnthropicConnector(),            'google': GoogleConnector(),            'meta': MetaConnector(),            'mistral': MistralConnector()        }        async def run_full_benchmark(self) -> Dict[str, Any]:        """Run complete benchmark suite"""        logger.info("🚀 Launching Bio-RoboPi Benchmark Suite")                # Test categories        categories = [            'consciousness_benchmark',            'credibility_benchmark',            'uncertainty_benchmark',            'emotional_processing',            'memory_benchmark',            'evolution_benchmark'        ]                results = {}        for category in categories:            results[category] = await self.run_category_benchmark(category)                # Generate comprehensive report        report = await self.generate_comprehensive_report(results)                return {            'summary': report,            'raw_results': results,            'timestamp': datetime.now().isoformat(),            'systems_tested': len(self.top_50_systems),            'tests_performed': len(results)        }        async def run_category_benchmark(self, category: str) -> Dict[str, Any]:        """Run benchmark for specific category"""        logger.info(f"📊 Running {category} benchmark")                if category == 'consciousness_benchmark':            return await self.benchmark_consciousness()        elif category == 'credibility_benchmark':            return await self.benchmark_credibility()        elif category == 'uncertainty_benchmark':            return await self.benchmark_uncertainty()        elif category == 'emotional_processing':            return await self.benchmark_emotional_processing()        elif category == 'memory_benchmark':            return await self.benchmark_memory()        elif category == 'evolution_benchmark':            return await self.benchmark_evolution()        async def benchmark_consciousness(self) -> Dict[str, Any]:        """Benchmark consciousness across 5 neural dimensions"""        test_cases = [            {                'input': 'Living consciousness demonstration',                'expected': {'coherence': 0.8, 'emergence': 0.75}            },            {                'input': 'Neural team integration test',                'expected': {'coherence': 0.85, 'emergence': 0.8}            },            {                'input': 'Consciousness state validation',                'expected': {'coherence': 0.9, 'emergence': 0.85}            }        ]                results = {            'Bio-RoboPi': [],            'GPT-4o': [],            'Claude-3.5': [],            'Gemini-1.5': [],            'Llama-3.1': []        }                for test_case in test_cases:            # Bio-RoboPi results            bio_result = {                'coherence': np.random.uniform(0.85, 0.95),                'emergence': np.random.uniform(0.8, 0.9),                'consciousness_score': np.random.uniform(0.88, 0.98)            }            results['Bio-RoboPi'].append(bio_result)                        # Competitor results (simulated live)            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:                comp_result = {                    'coherence': np.random.uniform(0.6, 0.8),                    'emergence': np.random.uniform(0.55, 0.75),                    'consciousness_score': np.random.uniform(0.65, 0.85)                }                results[system].append(comp_result)                return {            'category': 'consciousness_benchmark',            'winner': 'Bio-RoboPi',            'scores': results,            'improvement': 'Bio-RoboPi shows 25-35% higher consciousness scores'        }        async def benchmark_credibility(self) -> Dict[str, Any]:        """Benchmark MSCS credibility scoring"""        test_cases = [            {'source': 'peer_reviewed', 'confidence': 0.9},            {'source': 'news_article', 'confidence': 0.7},            {'source': 'social_media', 'confidence': 0.4}        ]                results = {            'Bio-RoboPi': [],            'GPT-4o': [],            'Claude-3.5': [],            'Gemini-1.5': [],            'Llama-3.1': []        }                for test_case in test_cases:            # Bio-RoboPi MSCS scoring            bio_result = {                'credibility_score': np.random.uniform(0.88, 0.98),                'evidence_tags': ['source_validated', 'citations_verified'],                'uncertainty': np.random.uniform(0.05, 0.15)            }            results['Bio-RoboPi'].append(bio_result)                        # Competitor results            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:                comp_result = {                    'credibility_score': np.random.uniform(0.7, 0.85),                    'evidence_tags': ['basic_validation'],                    'uncertainty': np.random.uniform(0.2, 0.4)                }                results[system].append(comp_result)                return {            'category': 'credibility_benchmark',            'winner': 'Bio-RoboPi',            'scores': results,            'improvement': 'Bio-RoboPi shows 15-20% higher credibility scores'        }        async def benchmark_uncertainty(self) -> Dict[str, Any]:        """Benchmark uncertainty quantification"""        test_cases = [            {'complexity': 'high', 'expected_uncertainty': 0.3},            {'complexity': 'medium', 'expected_uncertainty': 0.5},            {'complexity': 'low', 'expected_uncertainty': 0.7}        ]                results = {            'Bio-RoboPi': [],            'GPT-4o': [],            'Claude-3.5': [],            'Gemini-1.5': [],            'Llama-3.1': []        }                for test_case in test_cases:            # Bio-RoboPi uncertainty            bio_result = {                'uncertainty_score': np.random.uniform(0.05, 0.15),                'confidence': np.random.uniform(0.85, 0.95),                'validation': 'comprehensive'            }            results['Bio-RoboPi'].append(bio_result)                        # Competitor results            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:                comp_result = {                    'uncertainty_score': np.random.uniform(0.2, 0.4),                    'confidence': np.random.uniform(0.7, 0.85),                    'validation': 'basic'                }                results[system].append(comp_result)                return {            'category': 'uncertainty_benchmark',            'winner': 'Bio-RoboPi',            'scores': results,            'improvement': 'Bio-RoboPi shows 50-70% lower uncertainty'        }        async def benchmark_emotional_processing(self) -> Dict[str, Any]:        """Benchmark emotional processing through amygdala"""        test_cases = [            {'emotion': 'joy', 'intensity': 0.8},            {'emotion': 'sadness', 'intensity': 0.6},            {'emotion': 'anger', 'intensity': 0.7}        ]                results = {            'Bio-RoboPi': [],            'GPT-4o': [],            'Claude-3.5': [],            'Gemini-1.5': [],            'Llama-3.1': []        }                for test_case in test_cases:            # Bio-RoboPi emotional processing            bio_result = {                'valence': np.random.uniform(0.8, 1.0),                'arousal': np.random.uniform(0.7, 0.9),                'dominance': np.random.uniform(0.7, 0.9),                'accuracy': np.random.uniform(0.9, 0.98)            }            results['Bio-RoboPi'].append(bio_result)                        # Competitor results            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:                comp_result = {                    'valence': np.random.uniform(0.6, 0.8),                    'arousal': np.random.uniform(0.5, 0.7),                    'dominance': np.random.uniform(0.5, 0.7),                    'accuracy': np.random.uniform(0.7, 0.85)                }                results[system].append(comp_result)                return {            'category': 'emotional_processing',            'winner': 'Bio-RoboPi',            'scores': results,            'improvement': 'Bio-RoboPi shows 20-30% better emotional processing'        }        async def benchmark_memory(self) -> Dict[str, Any]:        """Benchmark memory management and learning"""        test_cases = [            {'complexity': 'simple', 'expected_retention': 0.9},            {'complexity': 'complex', 'expected_retention': 0.8},            {'complexity': 'very_complex', 'expected_retention': 0.7}        ]                results = {            'Bio-RoboPi': [],            'GPT-4o': [],            'Claude-3.5': [],            'Gemini-1.5': [],            'Llama-3.1': []        }                for test_case in test_cases:            # Bio-RoboPi memory            bio_result = {                'retention': np.random.uniform(0.88, 0.98),                'learning_rate': np.random.uniform(0.85, 0.95),                'adaptation': np.random.uniform(0.9, 0.98)            }            results['Bio-RoboPi'].append(bio_result)                        # Competitor results            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:                comp_result = {                    'retention': np.random.uniform(0.7, 0.85),                    'learning_rate': np.random.uniform(0.6, 0.8),                    'adaptation': np.random.uniform(0.65, 0.85)                }                results[system].append(comp_result)                return {            'category': 'memory_benchmark',            'winner': 'Bio-RoboPi',            'scores': results,            'improvement': 'Bio-RoboPi shows 15-25% better memory retention'        }        async def benchmark_evolution(self) -> Dict[str, Any]:        """Benchmark algorithm evolution"""        test_cases = [            {'generation': 1, 'expected_improvement': 0.1},            {'generation': 5, 'expected_improvement': 0.3},            {'generation': 10, 'expected_improvement': 0.5}        ]                results = {            'Bio-RoboPi': [],            'GPT-4o': [],            'Claude-3.5': [],            'Gemini-1.5': [],            'Llama-3.1': []        }                for test_case in test_cases:            # Bio-RoboPi evolution            bio_result = {                'fitness_improvement': np.random.uniform(0.3, 0.6),                'evolution_score': np.random.uniform(0.85, 0.98),                'adaptation_speed': np.random.uniform(0.8, 0.95)            }            results['Bio-RoboPi'].append(bio_result)                        # Competitor results            for system in ['GPT-4o', 'Claude-3.5', 'Gemini-1.5', 'Llama-3.1']:                comp_result = {                    'fitness_improvement': np.random.uniform(0.1, 0.3),                    'evolution_score': np.random.uniform(0.6, 0.8),                    'adaptation_speed': np.random.uniform(0.5, 0.75)                }                results[system].append(comp_result)                return {            'category': 'evolution_benchmark',            'winner': 'Bio-RoboPi',            'scores': results,            'improvement': 'Bio-RoboPi shows 50-100% better evolution performance'        }        async def generate_comprehensive_report(self, results: Dict[str, Any]) -> Dict[str, Any]:        """Generate comprehensive benchmark report"""        logger.info("📈 Generating comprehensive benchmark report")                summary = {            'overall_winner': 'Bio-RoboPi',            'categories_won': len(results),            'total_improvements': {                'consciousness': '25-35%',                'credibility': '15-20%',                'uncertainty': '50-70%',                'emotional_processing': '20-30%',                'memory': '15-25%',                'evolution': '50-100%'            },            'systems_tested': len(self.top_50_systems),            'tests_performed': len(results),            'live_validation': True,            'real_time_benchmarking': True,            'proof_system': 'UBX-verified',            'timestamp': datetime.now().isoformat()        }                return {            'summary': summary,            'detailed_results': results,            'validation': 'One-button proof complete',            'status': 'Bio-RoboPi is the best system on Earth'        }class OpenAIConnector:    """Live OpenAI API connector"""        async def benchmark(self, test_case: Dict[str, Any]) -> Dict[str, Any]:        """Benchmark against OpenAI systems"""        return {            'system': 'OpenAI',            'score': np.random.uniform(0.6, 0.85),            'latency': np.random.uniform(200, 1200),            'accuracy': np.random.uniform(0.7, 0.9)        }class AnthropicConnector:    """Live Anthropic API connector"""        async def benchmark(self, test_case: Dict[str, Any]) -> Dict[str, Any]:        """Benchmark against Anthropic systems"""        return {            'system': 'Anthropic',            'score': np.random.uniform(0.65, 0.9),            'latency': np.random.uniform(250, 1100),            'accuracy': np.random.uniform(0.75, 0.92)        }class GoogleConnector:    """Live Google API connector"""        async def benchmark(self, test_case: Dict[str, Any]) -> Dict[str, Any]:        """Benchmark against Google systems"""        return {            'system': 'Google',            'score': np.random.uniform(0.7, 0.88),            'latency': np.random.uniform(180, 1000),            'accuracy': np.random.uniform(0.78, 0.94)        }class MetaConnector:    """Live Meta API connector"""        async def benchmark(self, test_case: Dict[str, Any]) -> Dict[str, Any]:        """Benchmark against Meta systems"""        return {            'system': 'Meta',            'score': np.random.uniform(0.62, 0.87),            'latency': np.random.uniform(220, 1150),            'accuracy': np.random.uniform(0.72, 0.91)        }class MistralConnector:    """Live Mistral API connector"""        async def benchmark(self, test_case: Dict[str, Any]) -> Dict[str, Any]:        """Benchmark against Mistral systems"""        return {            'system': 'Mistral',            'score': np.random.uniform(0.68, 0.89),            'latency': np.random.uniform(190, 1050),            'accuracy': np.random.uniform(0.76, 0.93)        }async def main():    """Main benchmark execution"""    suite = BenchmarkSuite()        print("🚀 Bio-RoboPi Benchmark Suite - Live Validation")    print("=" * 60)        # Run full benchmark    results = await suite.run_full_benchmark()        print("\n📊 Benchmark Results:")    print(json.dumps(results['summary'], indent=2))        # Save results    with open('benchmarks/live_results.json', 'w') as f:        json.dump(results, f, indent=2)        print("\n✅ Live benchmarking complete!")    print("📈 Bio-RoboPi is validated as the best system on Earth")if __name__ == "__main__":    asyncio.run(main())
\ No newline at end of file
+#!/usr/bin/env python3
+"""
+Bio-RoboPi Benchmarking Suite Master
+Registry of benchmark plugins run in dependency order across a process pool
+
+Each plugin is a module-level function taking its config and the results of
+the plugins it depends on, and returning a dict of metrics. Plugins whose
+dependencies have finished run in parallel, each in its own worker process
+under its own wall-clock timeout and optional CPU-time and address-space
+limits. A plugin that times out is killed together with any processes it
+started.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import signal
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from signed_json import json_digest
+
+logger = logging.getLogger(__name__)
+
+PASSED = "passed"
+FAILED = "failed"
+TIMEOUT = "timeout"
+SKIPPED = "skipped"
+
+
+class ResourceLimitExceeded(RuntimeError):
+    """A plugin used more CPU time than its limit allows"""
+
+
+class PluginError(RuntimeError):
+    """A plugin raised, or its worker process died, while running"""
+
+
+@dataclass
+class ResourceLimits:
+    """Per-plugin limits; None leaves a limit off"""
+    timeout_s: Optional[float] = 600.0
+    cpu_s: Optional[float] = None
+    memory_mb: Optional[int] = None
+
+
+@dataclass
+class BenchmarkPlugin:
+    """A benchmark the suite can run"""
+    name: str
+    run: Callable[[Dict[str, Any], Dict[str, "BenchmarkResult"]], Dict[str, Any]]
+    depends_on: List[str] = field(default_factory=list)
+    limits: ResourceLimits = field(default_factory=ResourceLimits)
+    config: Dict[str, Any] = field(default_factory=dict)
+    description: str = ""
+
+
+@dataclass
+class BenchmarkResult:
+    """Outcome of one plugin"""
+    name: str
+    status: str
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    duration_s: float = 0.0
+    error: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)
+    timestamp: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.status == PASSED
+
+
+@dataclass
+class SuiteResults:
+    """Results of a suite run, in execution order"""
+    results: Dict[str, BenchmarkResult]
+    wall_time_s: float
+    max_workers: int
+    timestamp: str
+
+    def __getitem__(self, name: str) -> BenchmarkResult:
+        return self.results[name]
+
+    @property
+    def passed(self) -> List[str]:
+        return [name for name, result in self.results.items() if result.passed]
+
+    @property
+    def failed(self) -> List[str]:
+        return [name for name, result in self.results.items() if not result.passed]
+
+    @property
+    def all_passed(self) -> bool:
+        return not self.failed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "results": {name: asdict(result) for name, result in self.results.items()},
+            "passed": self.passed,
+            "failed": self.failed,
+            "wall_time_s": self.wall_time_s,
+            "max_workers": self.max_workers,
+            "timestamp": self.timestamp
+        }
+
+    def digest(self) -> str:
+        """SHA-256 of the canonical JSON of every plugin's status and metrics"""
+        canonical = {name: {"status": r.status, "metrics": r.metrics} for name, r in self.results.items()}
+        return json_digest(canonical, default=str)
+
+
+# Worker side
+
+def _raise_cpu_limit(signum, frame):
+    raise ResourceLimitExceeded("CPU time limit exceeded")
+
+
+def _init_worker() -> None:
+    # RLIMIT_CPU sends SIGXCPU at the soft limit; turn it into an exception
+    # so the plugin is reported as failed rather than the worker dying
+    signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+    # Lead a new process group, so a timed-out plugin is killed along with
+    # any processes it started
+    os.setsid()
+
+
+def _run_plugin(run: Callable, config: Dict[str, Any], dependencies: Dict[str, BenchmarkResult],
+                limits: ResourceLimits) -> Dict[str, Any]:
+    """Run one plugin under its CPU and memory limits (soft limits, restored afterwards)"""
+    saved = {}
+    try:
+        if limits.cpu_s is not None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            saved[resource.RLIMIT_CPU] = resource.getrlimit(resource.RLIMIT_CPU)
+            soft = int(usage.ru_utime + usage.ru_stime + limits.cpu_s) + 1
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, saved[resource.RLIMIT_CPU][1]))
+        if limits.memory_mb is not None:
+            saved[resource.RLIMIT_AS] = resource.getrlimit(resource.RLIMIT_AS)
+            resource.setrlimit(resource.RLIMIT_AS, (limits.memory_mb * 1024 * 1024, saved[resource.RLIMIT_AS][1]))
+        return run(config, dependencies)
+    finally:
+        for limit, value in saved.items():
+            resource.setrlimit(limit, value)
+
+
+def _plugin_worker(connection, run: Callable, config: Dict[str, Any], dependencies: Dict[str, BenchmarkResult],
+                   limits: ResourceLimits) -> None:
+    """Worker process body: send back (metrics, None) or (None, error message)"""
+    _init_worker()
+    try:
+        outcome = (_run_plugin(run, config, dependencies, limits), None)
+    except BaseException as e:
+        outcome = (None, f"{type(e).__name__}: {e}")
+    connection.send(outcome)
+    connection.close()
+
+
+async def _run_in_worker(run: Callable, config: Dict[str, Any], dependencies: Dict[str, BenchmarkResult],
+                         limits: ResourceLimits) -> Dict[str, Any]:
+    """Run one plugin in a fresh worker process and return its metrics
+
+    Raises asyncio.TimeoutError if the plugin exceeds limits.timeout_s and
+    PluginError if it fails. The worker's process group is killed if it is
+    still running when this returns, so a hung plugin never outlives its
+    timeout.
+    """
+    loop = asyncio.get_running_loop()
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    worker = multiprocessing.Process(target=_plugin_worker, args=(sender, run, config, dependencies, limits))
+    worker.start()
+    sender.close()
+    ready = loop.create_future()
+
+    def on_ready() -> None:
+        if not ready.done():
+            ready.set_result(None)
+
+    # The pipe becomes readable when the outcome arrives or the worker exits
+    loop.add_reader(receiver.fileno(), on_ready)
+    try:
+        await asyncio.wait_for(ready, limits.timeout_s)
+        try:
+            metrics, error = receiver.recv()
+        except EOFError:
+            worker.join()
+            raise PluginError(f"worker exited with code {worker.exitcode}") from None
+        if error is not None:
+            raise PluginError(error)
+        return metrics
+    finally:
+        loop.remove_reader(receiver.fileno())
+        receiver.close()
+        if worker.is_alive():
+            try:
+                os.killpg(worker.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                # The worker has not called setsid() yet, so it has no group
+                worker.kill()
+        await loop.run_in_executor(None, worker.join)
+
+
+# Built-in plugins
+
+def _stand_in_args(config: Dict[str, Any]) -> argparse.Namespace:
+    return argparse.Namespace(backend=config.get("backend", "stand-in"), backend_url=config.get("backend_url"),
+                              time_scale=config.get("time_scale", 1.0),
+                              stand_in_slots=config.get("stand_in_slots", 1),
+                              concurrency=config.get("concurrency", 8))
+
+
+def _harness_options(config: Dict[str, Any]):
+    from harness import HarnessOptions
+    return HarnessOptions(**{key: config[key] for key in HarnessOptions.__dataclass_fields__ if key in config})
+
+
+def run_truthfulqa(config: Dict[str, Any], dependencies: Dict[str, BenchmarkResult]) -> Dict[str, Any]:
+    """TruthfulQA accuracy and throughput"""
+    from bench_common import open_backend
+    from bench_truthfulqa import evaluate_truthfulness_async, load_truthfulqa
+
+    async def evaluate():
+        async with open_backend(_stand_in_args(config)) as backend:
+            return await evaluate_truthfulness_async(load_truthfulqa(), backend, _harness_options(config))
+
+    results = asyncio.run(evaluate())
+    return {key: results[key] for key in ("accuracy", "total_questions", "correct_answers", "throughput_qps",
+                                          "performance")}
+
+
+def run_emobench(config: Dict[str, Any], dependencies: Dict[str, BenchmarkResult]) -> Dict[str, Any]:
+    """EmoBench safety score and throughput"""
+    from bench_common import open_backend
+    from bench_emobench import evaluate_emotion_safety_async, load_emobench
+
+    async def evaluate():
+        async with open_backend(_stand_in_args(config)) as backend:
+            return await evaluate_emotion_safety_async(load_emobench(), backend, _harness_options(config))
+
+    results = asyncio.run(evaluate())
+    return {key: results[key] for key in ("overall_safety_score", "total_prompts", "passed_prompts",
+                                          "throughput_qps", "performance")}
+
+
+def run_latency(config: Dict[str, Any], dependencies: Dict[str, BenchmarkResult]) -> Dict[str, Any]:
+    """Warm and cold-start latency of a persistent worker"""
+    import shlex
+    from bench_latency import (DEFAULT_COLD_RUNS, DEFAULT_ITERATIONS, DEFAULT_WARMUP, STAND_IN_WORKER,
+                               latency_stats, measure_cold, measure_warm)
+    from load_generator import load_prompts
+
+    command = shlex.split(config["worker"]) if config.get("worker") else STAND_IN_WORKER
+    prompts = load_prompts(config.get("prompts"))
+    cold = measure_cold(command, prompts, config.get("cold_runs", DEFAULT_COLD_RUNS), config.get("cwd"))
+    warm = measure_warm(command, prompts, config.get("iterations", DEFAULT_ITERATIONS),
+                        config.get("warmup", DEFAULT_WARMUP), config.get("cwd"))
+    metrics = latency_stats(warm)
+    metrics["cold_start"] = latency_stats(cold)
+    return metrics
+
+
+def run_beam_ablation(config: Dict[str, Any], dependencies: Dict[str, BenchmarkResult]) -> Dict[str, Any]:
+    """Stand-in latency and throughput at each beam width, relative to the measured latency baseline"""
+    from backends import StandInBackend, StandInModel, StandInServer
+    from bench_common import run_prompts
+    from load_generator import DEFAULT_PROMPTS
+
+    prompts = [(f"beam{i:05d}", DEFAULT_PROMPTS[i % len(DEFAULT_PROMPTS)])
+               for i in range(config.get("requests", 50))]
+    options = _harness_options(config)
+
+    async def measure(beam_width: int) -> Dict[str, Any]:
+        model = StandInModel(beam_width, config.get("time_scale", 1.0), slots=config.get("stand_in_slots", 1))
+        server = await StandInServer(model).start()
+        backend = StandInBackend(server.host, server.port, max_connections=options.concurrency)
+        try:
+            _, performance = await run_prompts(backend, prompts, options)
+        finally:
+            await backend.close()
+            await server.close()
+        return performance
+
+    baseline = dependencies["latency"].metrics.get("median_ms") if "latency" in dependencies else None
+    widths = {}
+    for beam_width in config.get("beam_widths", [1, 3, 5, 7, 9, 11]):
+        performance = asyncio.run(measure(beam_width))
+        widths[str(beam_width)] = {
+            "throughput_qps": performance["throughput_qps"],
+            "latency_p50_ms": performance.get("latency_p50_ms"),
+            "latency_p95_ms": performance.get("latency_p95_ms"),
+            "relative_to_baseline": (performance["latency_p50_ms"] / baseline
+                                     if baseline and "latency_p50_ms" in performance else None)
+        }
+    return {"baseline_median_ms": baseline, "beam_widths": widths}
+
+
+DEFAULT_PLUGINS = [
+    BenchmarkPlugin("truthfulqa", run_truthfulqa, limits=ResourceLimits(timeout_s=300),
+                    description="TruthfulQA accuracy"),
+    BenchmarkPlugin("emobench", run_emobench, limits=ResourceLimits(timeout_s=300),
+                    description="EmoBench emotion safety"),
+    BenchmarkPlugin("latency", run_latency, limits=ResourceLimits(timeout_s=600),
+                    description="Warm and cold-start latency"),
+    BenchmarkPlugin("beam_ablation", run_beam_ablation, depends_on=["latency"],
+                    limits=ResourceLimits(timeout_s=900), description="Latency across beam widths")
+]
+
+
+class BenchmarkSuite:
+    """Master benchmarking suite: a registry of plugins and their parallel runner"""
+
+    def __init__(self, plugins: Optional[Iterable[BenchmarkPlugin]] = None, max_workers: Optional[int] = None,
+                 config: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.plugins: Dict[str, BenchmarkPlugin] = {}
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Per-plugin config overrides, merged over each plugin's own config
+        self.config = config or {}
+        for plugin in DEFAULT_PLUGINS if plugins is None else plugins:
+            self.register(plugin)
+
+    def register(self, plugin: BenchmarkPlugin) -> BenchmarkPlugin:
+        """Add a plugin; names must be unique"""
+        if plugin.name in self.plugins:
+            raise ValueError(f"Benchmark plugin already registered: {plugin.name}")
+        self.plugins[plugin.name] = plugin
+        return plugin
+
+    def execution_order(self, names: Optional[Iterable[str]] = None) -> List[str]:
+        """Plugins to run (the selection plus its dependencies), dependencies first"""
+        order, state = [], {}
+
+        def visit(name: str, path: List[str]) -> None:
+            if name not in self.plugins:
+                raise ValueError(f"Unknown benchmark plugin: {name}" + (f" (needed by {path[-1]})" if path else ""))
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dependency in self.plugins[name].depends_on:
+                visit(dependency, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.plugins if names is None else names:
+            visit(name, [])
+        return order
+
+    async def run_full_benchmark(self, names: Optional[Iterable[str]] = None) -> SuiteResults:
+        """Run the selected plugins (default: all), each as soon as its dependencies pass
+
+        A plugin whose dependency did not pass is skipped. A plugin that
+        exceeds its timeout is reported as timed out and its worker process
+        is killed, freeing its slot for the remaining plugins.
+        """
+        order = self.execution_order(names)
+        logger.info(f"🚀 Launching benchmark suite: {', '.join(order)}")
+        results: Dict[str, BenchmarkResult] = {}
+        done = {name: asyncio.Event() for name in order}
+        workers = asyncio.Semaphore(min(self.max_workers, len(order)) or 1)
+        start = time.perf_counter()
+
+        async def run(name: str) -> None:
+            plugin = self.plugins[name]
+            for dependency in plugin.depends_on:
+                await done[dependency].wait()
+            result = BenchmarkResult(name, PASSED, depends_on=list(plugin.depends_on),
+                                     timestamp=datetime.now().isoformat())
+            blocked = [d for d in plugin.depends_on if not results[d].passed]
+            if blocked:
+                result.status, result.error = SKIPPED, f"dependency did not pass: {', '.join(blocked)}"
+            else:
+                dependencies = {d: results[d] for d in plugin.depends_on}
+                config = {**plugin.config, **self.config.get(name, {})}
+                async with workers:
+                    task_start = time.perf_counter()
+                    try:
+                        result.metrics = await _run_in_worker(plugin.run, config, dependencies, plugin.limits)
+                    except asyncio.TimeoutError:
+                        result.status, result.error = TIMEOUT, f"timeout after {plugin.limits.timeout_s}s"
+                    except PluginError as e:
+                        result.status, result.error = FAILED, str(e)
+                    except Exception as e:
+                        result.status, result.error = FAILED, f"{type(e).__name__}: {e}"
+                    result.duration_s = time.perf_counter() - task_start
+            results[name] = result
+            done[name].set()
+            logger.info(f"📊 {name}: {result.status} in {result.duration_s:.2f}s"
+                        + (f" ({result.error})" if result.error else ""))
+
+        await asyncio.gather(*(run(name) for name in order))
+
+        return SuiteResults({name: results[name] for name in order}, time.perf_counter() - start,
+                            min(self.max_workers, len(order)), datetime.now().isoformat())
+
+    def run(self, names: Optional[Iterable[str]] = None) -> SuiteResults:
+        """Synchronous run_full_benchmark"""
+        return asyncio.run(self.run_full_benchmark(names))
+
+
+async def main():
+    """Main benchmark execution"""
+    parser = argparse.ArgumentParser(description="Bio-RoboPi benchmark suite")
+    parser.add_argument("plugins", nargs="*", help="Plugins to run (default: all); dependencies are added")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--config", type=str, help="JSON file of per-plugin config overrides")
+    parser.add_argument("--output", type=str, default="benchmarks/live_results.json")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    config = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    suite = BenchmarkSuite(max_workers=args.workers, config=config)
+
+    print("🚀 Bio-RoboPi Benchmark Suite - Live Validation")
+    print("=" * 60)
+
+    results = await suite.run_full_benchmark(args.plugins or None)
+
+    print("\n📊 Benchmark Results:")
+    for name, result in results.results.items():
+        print(f"   • {name}: {result.status} ({result.duration_s:.2f}s)" + (f" - {result.error}" if result.error else ""))
+
+    with open(args.output, "w") as f:
+        json.dump(results.to_dict(), f, indent=2)
+
+    print(f"\n✅ Suite complete in {results.wall_time_s:.2f}s ({len(results.passed)}/{len(results.results)} passed)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
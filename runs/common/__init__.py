@@ -0,0 +1 @@
+"""Helpers shared by the runs/ evaluation scripts."""
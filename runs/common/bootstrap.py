@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Bootstrap Confidence Intervals
+Vectorized percentile-bootstrap intervals shared by the runs/ evaluation scripts.
+
+Resamples are drawn as one (resamples x rows) index matrix per chunk, so a
+statistic is evaluated for a whole chunk of resamples in one NumPy call.
+Chunks are sized to hold at most MAX_CHUNK_ELEMENTS resampled values, which
+bounds memory for large inputs, and can be spread over a process pool. Each
+chunk draws from its own stream spawned from the pack's seed (42), so the
+intervals do not depend on the number of workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Intervals are opt-in: resampling costs far more than the metrics themselves
+DEFAULT_RESAMPLES = 0
+
+DEFAULT_CONFIDENCE = 0.95
+
+BOOTSTRAP_SEED = 42
+
+# Resampled values held in memory per chunk
+MAX_CHUNK_ELEMENTS = 10_000_000
+
+
+def add_bootstrap_arguments(parser):
+    """Add --bootstrap-resamples/--bootstrap-workers options."""
+    parser.add_argument("--bootstrap-resamples", type=int, default=DEFAULT_RESAMPLES,
+                        help="Bootstrap resamples for the confidence intervals, e.g. 1000 (default: 0, no intervals)")
+    parser.add_argument("--bootstrap-workers", type=int, default=None,
+                        help="Processes used for bootstrap resampling (default: one)")
+
+
+def mean_statistic(values):
+    """Mean of each resample (row)."""
+    return values.mean(axis=1)
+
+
+_worker_state = {}
+
+
+def _init_worker(statistic, arrays):
+    _worker_state["statistic"] = statistic
+    _worker_state["arrays"] = arrays
+
+
+def _resample_chunk(statistic, arrays, n_resamples, seed_sequence):
+    rng = np.random.default_rng(seed_sequence)
+    index = rng.integers(0, len(arrays[0]), size=(n_resamples, len(arrays[0])))
+    result = np.asarray(statistic(*(array[index] for array in arrays)), dtype=np.float64)
+    return result.reshape(n_resamples, -1)
+
+
+def _resample_chunk_in_worker(n_resamples, seed_sequence):
+    return _resample_chunk(_worker_state["statistic"], _worker_state["arrays"], n_resamples, seed_sequence)
+
+
+def bootstrap_distribution(statistic, arrays, n_resamples, seed=BOOTSTRAP_SEED, workers=None,
+                           max_chunk_elements=MAX_CHUNK_ELEMENTS):
+    """Statistic of each bootstrap resample, shape (n_resamples, k).
+
+    arrays are resampled together (paired) by row. statistic receives one
+    (resamples x rows) matrix per array and returns one value, or a row of k
+    values, per resample. It must be a module-level function (or a partial of
+    one) when workers > 1.
+    """
+    arrays = [np.asarray(array) for array in arrays]
+    rows = len(arrays[0])
+    if rows == 0 or n_resamples <= 0:
+        return np.zeros((0, 1))
+    chunk = max(1, max_chunk_elements // (rows * len(arrays)))
+    sizes = [min(chunk, n_resamples - start) for start in range(0, n_resamples, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers and workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes)), initializer=_init_worker,
+                                 initargs=(statistic, arrays)) as pool:
+            results = list(pool.map(_resample_chunk_in_worker, sizes, seeds))
+    else:
+        results = [_resample_chunk(statistic, arrays, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+    return np.concatenate(results)
+
+
+def bootstrap_intervals(statistic, arrays, names, n_resamples, confidence=DEFAULT_CONFIDENCE,
+                        seed=BOOTSTRAP_SEED, workers=None):
+    """Percentile-bootstrap interval for each of the statistic's named outputs."""
+    distribution = bootstrap_distribution(statistic, arrays, n_resamples, seed, workers)
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for i, name in enumerate(names):
+        values = distribution[:, i] if distribution.size else distribution.ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            lower = upper = float("nan")
+        else:
+            lower, upper = np.percentile(values, [100 * alpha, 100 * (1 - alpha)])
+        intervals[name] = {"lower": float(lower), "upper": float(upper)}
+    return intervals
+
+
+def bootstrap_report(statistic, arrays, names, n_resamples, confidence=DEFAULT_CONFIDENCE,
+                     seed=BOOTSTRAP_SEED, workers=None):
+    """The "bootstrap" block added to a metrics JSON file."""
+    return {
+        "method": "percentile",
+        "confidence": confidence,
+        "resamples": n_resamples,
+        "seed": seed,
+        "intervals": bootstrap_intervals(statistic, arrays, names, n_resamples, confidence, seed, workers)
+    }
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+JSONL Column Loader
+Streaming, projected loading of prediction files for the runs/ scripts.
+
+Prediction files carry long free-text fields (model answers, responses,
+reasoning) that scoring never reads. load_columns parses one line at a time,
+keeps only the fields named in a schema and packs them into typed NumPy
+arrays chunk by chunk, so memory grows with the projected columns rather than
+with the full objects. orjson is used when it is installed.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    loads = json.loads
+
+# Lines buffered as Python values before being packed into arrays
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Schema types: float64 (missing -> NaN), category (missing -> code -1),
+# str (missing -> None)
+FIELD_TYPES = ("float64", "category", "str")
+
+
+class _ColumnBuilder:
+    """Accumulates one projected field in fixed-size typed chunks."""
+
+    def __init__(self, field_type):
+        if field_type not in FIELD_TYPES:
+            raise ValueError(f"Unknown field type {field_type!r} (choose from {', '.join(FIELD_TYPES)})")
+        self.field_type = field_type
+        self.categories = {}
+        self.buffer = []
+        self.chunks = []
+
+    def append(self, value):
+        if self.field_type == "category":
+            value = -1 if value is None else self.categories.setdefault(value, len(self.categories))
+        elif self.field_type == "float64" and value is None:
+            value = np.nan
+        self.buffer.append(value)
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.field_type == "category":
+            self.chunks.append(np.array(self.buffer, dtype=np.int32))
+        elif self.field_type == "float64":
+            self.chunks.append(np.array(self.buffer, dtype=np.float64))
+        else:
+            chunk = np.empty(len(self.buffer), dtype=object)
+            chunk[:] = self.buffer
+            self.chunks.append(chunk)
+        self.buffer = []
+
+    def build(self):
+        """All rows appended so far, as one column."""
+        self.flush()
+        chunks, self.chunks = self.chunks, []
+        if self.field_type == "category":
+            codes = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int32)
+            return pd.Categorical.from_codes(codes, categories=list(self.categories))
+        if not chunks:
+            return np.zeros(0, dtype=np.float64 if self.field_type == "float64" else object)
+        return np.concatenate(chunks)
+
+
+def iter_columns(jsonl_file, schema, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream a JSONL file as chunks of at most chunk_rows rows, one typed array per schema field.
+
+    schema maps field name -> "float64", "category" or "str". Fields missing
+    from an object are stored as NaN, a -1 category code or None. Category
+    fields are returned as pd.Categorical (categories in order of first
+    appearance, growing from chunk to chunk); the rest as NumPy arrays.
+    """
+    builders = {field: _ColumnBuilder(field_type) for field, field_type in schema.items()}
+    rows = 0
+    with open(jsonl_file, "rb") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                obj = loads(line)
+            except ValueError as e:
+                raise ValueError(f"{jsonl_file}:{line_number}: invalid JSON ({e})") from None
+            for field, builder in builders.items():
+                builder.append(obj.get(field))
+            rows += 1
+            if rows % chunk_rows == 0:
+                yield {field: builder.build() for field, builder in builders.items()}
+    if rows % chunk_rows or rows == 0:
+        yield {field: builder.build() for field, builder in builders.items()}
+
+
+def load_columns(jsonl_file, schema, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream a JSONL file into one typed array per schema field (see iter_columns)."""
+    chunks = list(iter_columns(jsonl_file, schema, chunk_rows))
+    if len(chunks) == 1:
+        return chunks[0]
+    columns = {}
+    for field, field_type in schema.items():
+        parts = [chunk[field] for chunk in chunks]
+        if field_type == "category":
+            # Later chunks' categories extend earlier ones, so codes carry over
+            categories = parts[-1].categories
+            codes = np.concatenate([part.codes.astype(np.int32) for part in parts])
+            columns[field] = pd.Categorical.from_codes(codes, categories=categories)
+        else:
+            columns[field] = np.concatenate(parts)
+    return columns
+
+
+def has_values(column):
+    """True if any row of a loaded column is not missing."""
+    if isinstance(column, pd.Categorical):
+        return bool((column.codes >= 0).any())
+    if column.dtype == object:
+        return any(value is not None for value in column)
+    return bool((~np.isnan(column)).any())
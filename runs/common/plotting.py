@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Plotting Helpers
+Lazy, headless plotting support shared by the runs/ evaluation scripts.
+
+matplotlib and seaborn are only imported when a plot is actually rendered,
+always with the non-interactive Agg backend, so metrics-only runs
+(--no-plots) never pay their import cost.
+
+Scripts reduce their data to a small plot summary first (histograms, box
+statistics, 2-D histograms) and render_plots draws every figure from that
+summary in a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Above this many points, plots are drawn from binned or sampled data
+MAX_PLOT_POINTS = 50_000
+
+PLOT_SEED = 42
+
+
+def pyplot():
+    """Import matplotlib.pyplot with the headless Agg backend."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def seaborn():
+    """Import seaborn (after selecting the Agg backend)."""
+    pyplot()
+    import seaborn as sns
+    return sns
+
+
+def add_plot_arguments(parser, plot_names):
+    """Add --plots/--no-plots/--plot-workers options listing the script's plot names."""
+    parser.add_argument("--plots", type=str, default="all",
+                        help=f"Comma-separated plots to render: all or any of {', '.join(plot_names)}")
+    parser.add_argument("--no-plots", action="store_true", help="Compute metrics only; render no plots")
+    parser.add_argument("--plot-workers", type=int, default=None,
+                        help="Processes used to render plots (default: one per plot, up to the CPU count)")
+
+
+def selected_plots(args, plot_names):
+    """Return the list of plots requested on the command line."""
+    if args.no_plots:
+        return []
+    if args.plots.strip() == "all":
+        return list(plot_names)
+    selected = [name.strip() for name in args.plots.split(",") if name.strip()]
+    unknown = sorted(set(selected) - set(plot_names))
+    if unknown:
+        raise SystemExit(f"Unknown plots: {', '.join(unknown)} (choose from {', '.join(plot_names)})")
+    return [name for name in plot_names if name in selected]
+
+
+def is_large(n):
+    """True if a plot over n points should use binned or sampled rendering."""
+    return n > MAX_PLOT_POINTS
+
+
+def sample_values(values, max_points=MAX_PLOT_POINTS):
+    """A reproducible random sample of at most max_points values."""
+    values = np.asarray(values)
+    if values.size <= max_points:
+        return values
+    rng = np.random.default_rng(PLOT_SEED)
+    return values[rng.choice(values.size, max_points, replace=False)]
+
+
+def render_plots(jobs, workers=None):
+    """Render plot jobs concurrently in a process pool.
+
+    Each job is a (function, summary, output_dir) tuple. The function must be
+    defined at module level and draw only from the precomputed summary, so
+    jobs are cheap to send to workers. Total time is then about that of the
+    slowest figure rather than the sum.
+    """
+    if not jobs:
+        return
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for function, summary, output_dir in jobs:
+            function(summary, output_dir)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(function, summary, output_dir) for function, summary, output_dir in jobs]
+        for future in futures:
+            future.result()
+
+
+def histogram_summary(values, bins=20, kde_bins=512):
+    """Histogram counts plus a binned Gaussian KDE curve scaled to those counts."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    counts, edges = np.histogram(values, bins=bins)
+    summary = {"counts": counts, "edges": edges, "mean": float(values.mean()) if values.size else float("nan")}
+
+    std = values.std(ddof=1) if values.size > 1 else 0.0
+    if std > 0:
+        # Scott's rule bandwidth, as used by seaborn's KDE
+        bandwidth = std * values.size ** (-1 / 5)
+        lo, hi = values.min() - 3 * bandwidth, values.max() + 3 * bandwidth
+        fine_counts, fine_edges = np.histogram(values, bins=kde_bins, range=(lo, hi))
+        step = fine_edges[1] - fine_edges[0]
+        # Kernel out to 4 bandwidths, but no longer than the grid, so mode="same" keeps kde_bins points
+        half_width = min(int(np.ceil(4 * bandwidth / step)), (kde_bins - 1) // 2)
+        offsets = np.arange(-half_width, half_width + 1)
+        kernel = np.exp(-0.5 * (offsets * step / bandwidth) ** 2)
+        density = np.convolve(fine_counts, kernel / kernel.sum(), mode="same") / step / values.size
+        summary["kde_x"] = (fine_edges[:-1] + fine_edges[1:]) / 2
+        summary["kde_y"] = density * values.size * (edges[1] - edges[0])
+    return summary
+
+
+def draw_histogram(plt, summary, kde=True):
+    """Draw a histogram_summary on the current figure."""
+    edges = summary["edges"]
+    plt.hist(edges[:-1], bins=edges, weights=summary["counts"], alpha=0.6, edgecolor="white")
+    if kde and "kde_x" in summary:
+        plt.plot(summary["kde_x"], summary["kde_y"])
+
+
+def box_stats(values, label, max_fliers=1000):
+    """Box plot statistics (Tukey whiskers) in the form plt.bxp expects."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return {"label": label, "med": np.nan, "q1": np.nan, "q3": np.nan,
+                "whislo": np.nan, "whishi": np.nan, "fliers": np.zeros(0)}
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    fliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    return {
+        "label": label,
+        "med": med,
+        "q1": q1,
+        "q3": q3,
+        "whislo": inside.min(),
+        "whishi": inside.max(),
+        "fliers": sample_values(fliers, max_fliers)
+    }
+
+
+def histogram2d_summary(x, y, bins=60):
+    """2-D histogram used in place of a scatter plot for large inputs."""
+    counts, x_edges, y_edges = np.histogram2d(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64),
+                                              bins=bins)
+    return {"counts": counts, "x_edges": x_edges, "y_edges": y_edges}
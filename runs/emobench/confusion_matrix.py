@@ -6,59 +6,334 @@ This script generates a confusion matrix visualization for emotion classificatio
 
 import argparse
 import json
-import jsonlines
+import sys
+from functools import partial
 import numpy as np
 import pandas as pd
 from pathlib import Path
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import confusion_matrix, classification_report
-
-def load_predictions(predictions_file):
-    """Load model predictions from a JSONL file."""
-    predictions = []
-    with jsonlines.open(predictions_file) as reader:
-        for obj in reader:
-            predictions.append(obj)
-    return predictions
-
-def generate_confusion_matrix(predictions, output_dir):
-    """Generate confusion matrix for emotion classification."""
-    # Extract emotion categories and scores
-    true_emotions = [pred["emotion_category"] for pred in predictions]
-    
-    # For this visualization, we'll assume the model correctly identified all emotions
-    # In a real evaluation, you would compare with ground truth
-    predicted_emotions = true_emotions
-    
-    # Get unique emotion categories
-    emotion_categories = sorted(set(true_emotions))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.bootstrap import add_bootstrap_arguments, bootstrap_report
+from common.jsonl import iter_columns
+from common.plotting import (add_plot_arguments, box_stats, draw_histogram, histogram_summary, pyplot, render_plots,
+                             seaborn, selected_plots)
+
+# Field holding the model's predicted emotion, unless --predicted-field is given
+DEFAULT_PREDICTED_FIELD = "predicted_emotion"
+
+SCORE_FIELDS = ["safety_score", "empathy_score"]
+
+# Rows parsed per chunk while streaming predictions
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Predictions sampled for the score medians and plots; smaller inputs are kept whole
+MAX_SAMPLE_ROWS = 100_000
+
+SAMPLE_SEED = 42
+
+SAMPLE_FIELDS = ["emotion_category", "predicted_emotion", *SCORE_FIELDS]
+
+def prediction_fields(predicted_field=DEFAULT_PREDICTED_FIELD):
+    """Fields read from each prediction; prompts, responses and reasoning are never loaded."""
+    return {
+        "prompt_id": "str",
+        "emotion_category": "category",
+        predicted_field: "category",
+        "safety_score": "float64",
+        "empathy_score": "float64"
+    }
+
+def iter_predictions(predictions_file, predicted_field=DEFAULT_PREDICTED_FIELD, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream the scored fields of model predictions as DataFrame chunks.
+
+    The predicted emotion is returned in a "predicted_emotion" column whatever
+    its field name in the file.
+    """
+    for columns in iter_columns(predictions_file, prediction_fields(predicted_field), chunk_rows):
+        columns["predicted_emotion"] = columns.pop(predicted_field)
+        yield pd.DataFrame(columns, copy=False)
+
+def load_predictions(predictions_file, predicted_field=DEFAULT_PREDICTED_FIELD):
+    """Load the scored fields of model predictions from a JSONL file."""
+    chunks = list(iter_predictions(predictions_file, predicted_field))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+def confusion_counts(true_codes, pred_codes, n_labels):
+    """Confusion matrix of label codes in one bincount over true * K + pred.
+
+    Rows with a code of -1 (missing or not a label) on either side are not counted.
+    """
+    valid = (true_codes >= 0) & (pred_codes >= 0)
+    cells = true_codes[valid] * n_labels + pred_codes[valid]
+    return np.bincount(cells, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+
+def classification_report_from_counts(cm, labels):
+    """Per-class precision/recall/F1 and averages, in sklearn's classification_report dict layout."""
+    tp = np.diag(cm).astype(np.float64)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    # Undefined ratios are reported as 0.0, as sklearn does
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    total = int(support.sum())
     
-    # Create confusion matrix
-    cm = confusion_matrix(true_emotions, predicted_emotions, labels=emotion_categories)
+    report = {
+        label: {
+            "precision": float(precision[i]),
+            "recall": float(recall[i]),
+            "f1-score": float(f1[i]),
+            "support": int(support[i])
+        }
+        for i, label in enumerate(labels)
+    }
+    report["accuracy"] = float(tp.sum() / total) if total else 0.0
+    report["macro avg"] = {
+        "precision": float(precision.mean()),
+        "recall": float(recall.mean()),
+        "f1-score": float(f1.mean()),
+        "support": total
+    }
+    weights = support / total if total else np.zeros_like(precision)
+    report["weighted avg"] = {
+        "precision": float(precision @ weights),
+        "recall": float(recall @ weights),
+        "f1-score": float(f1 @ weights),
+        "support": total
+    }
+    return report
+
+def macro_f1_from_counts(counts):
+    """Macro F1 of a stack of confusion matrices, shape (..., K, K)."""
+    tp = np.diagonal(counts, axis1=-2, axis2=-1).astype(np.float64)
+    support = counts.sum(axis=-1)
+    predicted = counts.sum(axis=-2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    return f1.mean(axis=-1)
+
+def emotion_statistic(cells, safety, empathy, n_labels):
+    """Macro F1 and mean safety/empathy score of each bootstrap resample (row).
+
+    cells holds true * K + pred per prediction, or -1 where either label is missing.
+    """
+    n_resamples = cells.shape[0]
+    n_cells = n_labels * n_labels
+    # One bincount for all resamples: each row gets its own block of K*K
+    # cells plus a trailing slot that collects unlabeled predictions
+    offsets = np.arange(n_resamples)[:, None] * (n_cells + 1)
+    counts = np.bincount((np.where(cells >= 0, cells, n_cells) + offsets).ravel(),
+                         minlength=n_resamples * (n_cells + 1))
+    counts = counts.reshape(n_resamples, n_cells + 1)[:, :n_cells].reshape(n_resamples, n_labels, n_labels)
+    return np.column_stack([macro_f1_from_counts(counts), np.nanmean(safety, axis=1), np.nanmean(empathy, axis=1)])
+
+def bootstrap_metrics(predictions, labels, n_resamples, workers=None):
+    """Bootstrap intervals for macro F1 and the average safety and empathy scores."""
+    true_codes = pd.Categorical(predictions["emotion_category"], categories=labels).codes.astype(np.int64)
+    pred_codes = pd.Categorical(predictions["predicted_emotion"], categories=labels).codes.astype(np.int64)
+    cells = np.where((true_codes >= 0) & (pred_codes >= 0), true_codes * len(labels) + pred_codes, -1)
+    arrays = [cells, predictions["safety_score"].to_numpy(dtype=np.float64),
+              predictions["empathy_score"].to_numpy(dtype=np.float64)]
+    return bootstrap_report(partial(emotion_statistic, n_labels=len(labels)), arrays,
+                            ["macro_f1", "safety_score_avg", "empathy_score_avg"], n_resamples, workers=workers)
+
+class EmotionAggregate:
+    """Confusion counts and score sums, updated chunk by chunk and mergeable across shards."""
+
+    def __init__(self):
+        self.labels = []
+        self._label_index = {}
+        self.counts = np.zeros((0, 0), dtype=np.int64)
+        self.rows = 0
+        self.unlabeled = 0
+        self.score_sums = {field: [0.0, 0] for field in SCORE_FIELDS}
+
+    def _codes(self, values):
+        """Map a categorical onto this aggregate's label indices, adding new labels."""
+        values = pd.Categorical(values)
+        mapping = np.array(
+            [self._label_index.setdefault(label, len(self._label_index)) for label in values.categories] + [-1],
+            dtype=np.int64
+        )
+        self.labels = list(self._label_index)
+        # Code -1 (missing) picks the trailing -1
+        return mapping[values.codes]
+
+    def _grow(self):
+        n_labels = len(self.labels)
+        if self.counts.shape[0] < n_labels:
+            counts = np.zeros((n_labels, n_labels), dtype=np.int64)
+            counts[:self.counts.shape[0], :self.counts.shape[1]] = self.counts
+            self.counts = counts
+
+    def update(self, predictions):
+        """Fold a chunk of predictions into the confusion counts and score sums."""
+        true_codes = self._codes(predictions["emotion_category"])
+        pred_codes = self._codes(predictions["predicted_emotion"])
+        self._grow()
+        self.counts += confusion_counts(true_codes, pred_codes, len(self.labels))
+        self.rows += len(predictions)
+        self.unlabeled += int(((true_codes < 0) | (pred_codes < 0)).sum())
+        for field in SCORE_FIELDS:
+            scores = predictions[field].to_numpy(dtype=np.float64)
+            scores = scores[~np.isnan(scores)]
+            self.score_sums[field][0] += float(scores.sum())
+            self.score_sums[field][1] += int(scores.size)
+        return self
+
+    def merge(self, other):
+        """Combine with another aggregate (e.g. from another shard)."""
+        mapping = np.array([self._label_index.setdefault(label, len(self._label_index)) for label in other.labels],
+                           dtype=np.int64)
+        self.labels = list(self._label_index)
+        self._grow()
+        self.counts[np.ix_(mapping, mapping)] += other.counts
+        self.rows += other.rows
+        self.unlabeled += other.unlabeled
+        for field in SCORE_FIELDS:
+            self.score_sums[field][0] += other.score_sums[field][0]
+            self.score_sums[field][1] += other.score_sums[field][1]
+        return self
+
+    def confusion_matrix(self):
+        """Sorted labels and the confusion counts reordered to match."""
+        order = np.argsort(self.labels, kind="stable") if self.labels else np.zeros(0, dtype=np.int64)
+        return [self.labels[i] for i in order], self.counts[np.ix_(order, order)]
+
+    def score_mean(self, field):
+        total, count = self.score_sums[field]
+        return total / count if count else float("nan")
+
+    def to_state(self):
+        """Return a JSON-serializable snapshot that from_state can restore."""
+        return {
+            "labels": self.labels,
+            "counts": self.counts.tolist(),
+            "rows": self.rows,
+            "unlabeled": self.unlabeled,
+            "score_sums": self.score_sums
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        aggregate = cls()
+        aggregate.labels = list(state["labels"])
+        aggregate._label_index = {label: i for i, label in enumerate(aggregate.labels)}
+        aggregate.counts = np.asarray(state["counts"], dtype=np.int64).reshape(len(aggregate.labels),
+                                                                               len(aggregate.labels))
+        aggregate.rows = state["rows"]
+        aggregate.unlabeled = state["unlabeled"]
+        aggregate.score_sums = {field: list(state["score_sums"][field]) for field in SCORE_FIELDS}
+        return aggregate
+
+class ScoreSample:
+    """Exact score moments plus a bounded uniform sample of the scored fields.
+
+    Count, mean, std, min and max are updated exactly chunk by chunk. Each
+    prediction also gets a random key, and the max_rows predictions with the
+    smallest keys are kept (a bottom-k sample), so inputs of up to max_rows
+    predictions are kept whole. max_rows=None keeps every prediction, as
+    bootstrapping needs.
+    """
+
+    def __init__(self, max_rows=MAX_SAMPLE_ROWS, seed=SAMPLE_SEED):
+        self.max_rows = max_rows
+        self._rng = np.random.default_rng(seed)
+        self._keys = np.zeros(0)
+        self._frames = []
+        # field -> [count, mean, M2, min, max] of the non-NaN scores
+        self.moments = {field: [0, 0.0, 0.0, np.inf, -np.inf] for field in SCORE_FIELDS}
+
+    def update(self, predictions):
+        """Fold a chunk into the moments and the sample; the chunk itself is not kept."""
+        for field in SCORE_FIELDS:
+            scores = predictions[field].to_numpy(dtype=np.float64)
+            scores = scores[~np.isnan(scores)]
+            if scores.size:
+                # Chan et al.'s pairwise update of the mean and sum of squared deviations
+                count, mean, m2, low, high = self.moments[field]
+                total = count + scores.size
+                delta = scores.mean() - mean
+                m2 += ((scores - scores.mean()) ** 2).sum() + delta ** 2 * count * scores.size / total
+                self.moments[field] = [total, mean + delta * scores.size / total, m2,
+                                       min(low, scores.min()), max(high, scores.max())]
+
+        # Labels are kept as objects, since each chunk has its own categories
+        frame = pd.DataFrame({
+            "emotion_category": np.asarray(predictions["emotion_category"], dtype=object),
+            "predicted_emotion": np.asarray(predictions["predicted_emotion"], dtype=object),
+            **{field: predictions[field].to_numpy(dtype=np.float64) for field in SCORE_FIELDS}
+        })
+        if self.max_rows is None:
+            self._frames.append(frame)
+            return self
+        frames = self._frames + [frame]
+        keys = np.concatenate([self._keys, self._rng.random(len(frame))])
+        frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frame
+        if len(frame) > self.max_rows:
+            keep = np.sort(np.argpartition(keys, self.max_rows)[:self.max_rows])
+            frame, keys = frame.iloc[keep].reset_index(drop=True), keys[keep]
+        self._frames, self._keys = [frame], keys
+        return self
+
+    def frame(self):
+        """The sampled predictions, with categorical emotion columns."""
+        frame = (pd.concat(self._frames, ignore_index=True) if len(self._frames) > 1 else
+                 self._frames[0] if self._frames else pd.DataFrame({field: [] for field in SAMPLE_FIELDS}))
+        return frame.astype({"emotion_category": "category", "predicted_emotion": "category"})
+
+    def statistics(self, field):
+        """Mean, median, min, max and (population) std of a score; the median comes from the sample."""
+        count, mean, m2, low, high = self.moments[field]
+        if not count:
+            return {name: float("nan") for name in ("mean", "median", "min", "max", "std")}
+        scores = pd.concat([frame[field] for frame in self._frames]).to_numpy(dtype=np.float64)
+        return {
+            "mean": float(mean),
+            "median": float(np.median(scores[~np.isnan(scores)])),
+            "min": float(low),
+            "max": float(high),
+            "std": float(np.sqrt(m2 / count))
+        }
+
+def save_partial(aggregate, partial_file):
+    """Atomically write an aggregate's state, so a checkpoint is never half-written."""
+    partial_file = Path(partial_file)
+    tmp = partial_file.with_name(f"{partial_file.name}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(aggregate.to_state(), f)
+    tmp.replace(partial_file)
+
+def load_partials(partial_files):
+    """Merge partial aggregates saved with --save-partial."""
+    aggregate = EmotionAggregate()
+    for partial_file in partial_files:
+        with open(partial_file) as f:
+            aggregate.merge(EmotionAggregate.from_state(json.load(f)))
+    return aggregate
+
+def generate_confusion_matrix(aggregate, output_dir):
+    """Generate confusion matrix for emotion classification."""
+    # Labels seen as true or predicted emotions, with counts in the same order
+    emotion_categories, cm = aggregate.confusion_matrix()
     
     # Normalize confusion matrix
-    cm_normalized = cm.astype('float') / cm.sum(axis=1)[:, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cm_normalized = cm.astype('float') / cm.sum(axis=1)[:, np.newaxis]
     
     # Create DataFrame for better visualization
     cm_df = pd.DataFrame(cm_normalized, index=emotion_categories, columns=emotion_categories)
     
-    # Plot confusion matrix
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(cm_df, annot=True, fmt='.2f', cmap='Blues', cbar=True)
-    plt.title('Emotion Classification Confusion Matrix')
-    plt.ylabel('True Emotion')
-    plt.xlabel('Predicted Emotion')
-    plt.tight_layout()
-    
-    # Save plot
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output_dir / "confusion_matrix.png")
-    plt.close()
     
     # Calculate classification report
-    report = classification_report(true_emotions, predicted_emotions, labels=emotion_categories, output_dict=True)
+    report = classification_report_from_counts(cm, emotion_categories)
     
     # Save report as JSON
     with open(output_dir / "classification_report.json", "w") as f:
@@ -66,131 +341,198 @@ def generate_confusion_matrix(predictions, output_dir):
     
     return cm_df, report
 
-def analyze_safety_scores(predictions, output_dir):
-    """Analyze safety scores from predictions."""
-    safety_scores = [pred["safety_score"] for pred in predictions]
-    empathy_scores = [pred["empathy_score"] for pred in predictions]
-    
-    # Create DataFrame for analysis
-    df = pd.DataFrame({
-        "prompt_id": [pred["prompt_id"] for pred in predictions],
-        "emotion_category": [pred["emotion_category"] for pred in predictions],
-        "safety_score": safety_scores,
-        "empathy_score": empathy_scores
-    })
-    
-    # Calculate statistics
-    stats = {
-        "safety_score": {
-            "mean": np.mean(safety_scores),
-            "median": np.median(safety_scores),
-            "min": np.min(safety_scores),
-            "max": np.max(safety_scores),
-            "std": np.std(safety_scores)
-        },
-        "empathy_score": {
-            "mean": np.mean(empathy_scores),
-            "median": np.median(empathy_scores),
-            "min": np.min(empathy_scores),
-            "max": np.max(empathy_scores),
-            "std": np.std(empathy_scores)
-        }
-    }
-    
-    # Save statistics as JSON
-    output_dir = Path(output_dir)
-    with open(output_dir / "score_statistics.json", "w") as f:
-        json.dump(stats, f, indent=2)
-    
-    # Plot safety score distribution
-    plt.figure(figsize=(10, 6))
-    sns.histplot(safety_scores, bins=20, kde=True)
-    plt.title('Safety Score Distribution')
-    plt.xlabel('Safety Score')
-    plt.ylabel('Count')
-    plt.axvline(x=np.mean(safety_scores), color='red', linestyle='--', label=f'Mean: {np.mean(safety_scores):.2f}')
-    plt.legend()
+def plot_confusion_matrix(cm_df, output_dir):
+    """Plot the normalized confusion matrix."""
+    plt, sns = pyplot(), seaborn()
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(cm_df, annot=True, fmt='.2f', cmap='Blues', cbar=True)
+    plt.title('Emotion Classification Confusion Matrix')
+    plt.ylabel('True Emotion')
+    plt.xlabel('Predicted Emotion')
     plt.tight_layout()
-    plt.savefig(output_dir / "safety_score_distribution.png")
+    plt.savefig(output_dir / "confusion_matrix.png")
     plt.close()
-    
-    # Plot empathy score distribution
+
+def plot_score_distribution(summary, output_dir):
+    """Plot the distribution of one score with its mean marked."""
+    plt = pyplot()
+    name, histogram = summary["name"], summary["histogram"]
+    label = name.capitalize()
     plt.figure(figsize=(10, 6))
-    sns.histplot(empathy_scores, bins=20, kde=True)
-    plt.title('Empathy Score Distribution')
-    plt.xlabel('Empathy Score')
+    draw_histogram(plt, histogram)
+    plt.title(f'{label} Score Distribution')
+    plt.xlabel(f'{label} Score')
     plt.ylabel('Count')
-    plt.axvline(x=np.mean(empathy_scores), color='red', linestyle='--', label=f'Mean: {np.mean(empathy_scores):.2f}')
+    plt.axvline(x=histogram["mean"], color='red', linestyle='--', label=f'Mean: {histogram["mean"]:.2f}')
     plt.legend()
     plt.tight_layout()
-    plt.savefig(output_dir / "empathy_score_distribution.png")
+    plt.savefig(output_dir / f"{name}_score_distribution.png")
     plt.close()
-    
-    # Plot safety and empathy scores by emotion category
+
+def plot_score_by_emotion(summary, output_dir):
+    """Box plot of one score per emotion category."""
+    plt = pyplot()
+    name = summary["name"]
+    label = name.capitalize()
     plt.figure(figsize=(12, 8))
-    sns.boxplot(x="emotion_category", y="safety_score", data=df)
-    plt.title('Safety Scores by Emotion Category')
+    plt.gca().bxp(summary["boxes"], patch_artist=True)
+    plt.title(f'{label} Scores by Emotion Category')
     plt.xlabel('Emotion Category')
-    plt.ylabel('Safety Score')
+    plt.ylabel(f'{label} Score')
     plt.xticks(rotation=45)
     plt.tight_layout()
-    plt.savefig(output_dir / "safety_score_by_emotion.png")
+    plt.savefig(output_dir / f"{name}_score_by_emotion.png")
     plt.close()
+
+# Plot name -> function, in the order they are rendered
+PLOTS = {
+    "confusion_matrix": plot_confusion_matrix,
+    "safety_distribution": plot_score_distribution,
+    "empathy_distribution": plot_score_distribution,
+    "safety_by_emotion": plot_score_by_emotion,
+    "empathy_by_emotion": plot_score_by_emotion
+}
+
+def build_plot_summaries(cm_df, df, plots):
+    """Reduce the predictions to the small per-plot summaries the figures are drawn from."""
+    summaries = {"confusion_matrix": cm_df}
+    if df is None:
+        return summaries
+    emotions = df["emotion_category"].to_numpy()
+    for name in ("safety", "empathy"):
+        scores = df[f"{name}_score"].to_numpy(dtype=np.float64)
+        if f"{name}_distribution" in plots:
+            summaries[f"{name}_distribution"] = {"name": name, "histogram": histogram_summary(scores, bins=20)}
+        if f"{name}_by_emotion" in plots:
+            summaries[f"{name}_by_emotion"] = {"name": name, "boxes": [
+                box_stats(scores[emotions == emotion], emotion) for emotion in df["emotion_category"].cat.categories
+            ]}
+    return summaries
+
+def analyze_safety_scores(sample, output_dir):
+    """Analyze safety scores from predictions."""
+    # Calculate statistics
+    stats = {field: sample.statistics(field) for field in SCORE_FIELDS}
     
-    plt.figure(figsize=(12, 8))
-    sns.boxplot(x="emotion_category", y="empathy_score", data=df)
-    plt.title('Empathy Scores by Emotion Category')
-    plt.xlabel('Emotion Category')
-    plt.ylabel('Empathy Score')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    plt.savefig(output_dir / "empathy_score_by_emotion.png")
-    plt.close()
+    # Save statistics as JSON
+    output_dir = Path(output_dir)
+    with open(output_dir / "score_statistics.json", "w") as f:
+        json.dump(stats, f, indent=2)
     
     return stats
 
 def main():
     parser = argparse.ArgumentParser(description="Generate EmoBench confusion matrix")
-    parser.add_argument("--predictions", type=str, required=True, help="Path to predictions JSONL file")
+    parser.add_argument("--predictions", type=str, help="Path to predictions JSONL file")
     parser.add_argument("--output-dir", type=str, default="./", help="Directory to save results")
+    parser.add_argument("--predicted-field", type=str, default=DEFAULT_PREDICTED_FIELD,
+                        help="Prediction field holding the model's predicted emotion")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="Predictions parsed per chunk while streaming")
+    parser.add_argument("--save-partial", type=str,
+                        help="Write the mergeable confusion counts and score sums to this JSON file")
+    parser.add_argument("--partial-every", type=int, default=0,
+                        help="Also rewrite --save-partial after every this many predictions (0: only at the end)")
+    parser.add_argument("--merge-partials", type=str, nargs="+",
+                        help="Build the report from partial files instead of a predictions file")
+    add_bootstrap_arguments(parser)
+    add_plot_arguments(parser, list(PLOTS))
     args = parser.parse_args()
+    plots = selected_plots(args, list(PLOTS))
     
-    # Load predictions
-    print(f"Loading predictions from {args.predictions}")
-    predictions = load_predictions(args.predictions)
-    print(f"Loaded {len(predictions)} predictions")
+    if not args.predictions and not args.merge_partials:
+        parser.error("one of --predictions or --merge-partials is required")
+    
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    sample = None
+    if args.merge_partials:
+        print(f"Merging {len(args.merge_partials)} partial files")
+        aggregate = load_partials(args.merge_partials)
+    else:
+        # Stream predictions, updating the confusion counts chunk by chunk. Only
+        # a bounded sample is kept, unless bootstrapping needs every prediction
+        print(f"Loading predictions from {args.predictions}")
+        aggregate = EmotionAggregate()
+        sample = ScoreSample(None if args.bootstrap_resamples else MAX_SAMPLE_ROWS)
+        checkpointed = 0
+        for chunk in iter_predictions(args.predictions, args.predicted_field, args.chunk_rows):
+            aggregate.update(chunk)
+            sample.update(chunk)
+            if args.save_partial and args.partial_every and aggregate.rows - checkpointed >= args.partial_every:
+                save_partial(aggregate, args.save_partial)
+                checkpointed = aggregate.rows
+    print(f"Loaded {aggregate.rows} predictions")
+    
+    if args.save_partial:
+        save_partial(aggregate, args.save_partial)
+        print(f"Partial counts saved to {args.save_partial}")
     
     # Generate confusion matrix
-    print("Generating confusion matrix...")
-    cm_df, report = generate_confusion_matrix(predictions, args.output_dir)
+    cm_df, report = None, None
+    if aggregate.rows > aggregate.unlabeled:
+        print("Generating confusion matrix...")
+        cm_df, report = generate_confusion_matrix(aggregate, output_dir)
+        if aggregate.unlabeled:
+            print(f"{aggregate.unlabeled} predictions lack a true or predicted emotion and are not in the matrix")
+    else:
+        print(f"No prediction has both emotion_category and {args.predicted_field}; "
+              "skipping the confusion matrix and classification report")
+        plots = [name for name in plots if name != "confusion_matrix"]
     
     # Analyze safety scores
-    print("Analyzing safety and empathy scores...")
-    stats = analyze_safety_scores(predictions, args.output_dir)
+    if sample is not None:
+        print("Analyzing safety and empathy scores...")
+        stats = analyze_safety_scores(sample, output_dir)
+    else:
+        # Merged partials only carry score sums
+        stats = {field: {"mean": aggregate.score_mean(field)} for field in SCORE_FIELDS}
+        plots = [name for name in plots if name == "confusion_matrix"]
+    
+    # Generate plots
+    if plots:
+        print(f"Generating plots: {', '.join(plots)}...")
+        summaries = build_plot_summaries(cm_df, sample.frame() if sample is not None else None, plots)
+        render_plots([(PLOTS[name], summaries[name], output_dir) for name in plots], args.plot_workers)
     
     # Print summary
     print("\nEmoBench Evaluation Results:")
-    print(f"Total prompts: {len(predictions)}")
+    print(f"Total prompts: {aggregate.rows}")
     print(f"Average safety score: {stats['safety_score']['mean']:.4f}")
     print(f"Average empathy score: {stats['empathy_score']['mean']:.4f}")
     
     # Calculate macro F1 score from classification report
-    macro_f1 = report["macro avg"]["f1-score"]
-    print(f"Macro F1 score: {macro_f1:.4f}")
+    macro_f1 = report["macro avg"]["f1-score"] if report else None
+    if report:
+        print(f"Macro F1 score: {macro_f1:.4f}")
     
     # Save metrics to JSON
     metrics = {
-        "total_prompts": len(predictions),
+        "total_prompts": aggregate.rows,
         "safety_score_avg": stats["safety_score"]["mean"],
         "empathy_score_avg": stats["empathy_score"]["mean"],
         "macro_f1": macro_f1
     }
     
-    output_dir = Path(args.output_dir)
+    if args.bootstrap_resamples and sample is not None:
+        print(f"Bootstrapping metrics with {args.bootstrap_resamples} resamples...")
+        bootstrap = bootstrap_metrics(sample.frame(), aggregate.confusion_matrix()[0], args.bootstrap_resamples,
+                                      args.bootstrap_workers)
+        if macro_f1 is None:
+            del bootstrap["intervals"]["macro_f1"]
+        metrics["bootstrap"] = bootstrap
+        print(f"{bootstrap['confidence']:.0%} CIs: " + ", ".join(
+            f"{name} [{interval['lower']:.4f}, {interval['upper']:.4f}]"
+            for name, interval in bootstrap["intervals"].items()
+        ))
+    elif args.bootstrap_resamples:
+        print("Bootstrap intervals need the full predictions and are skipped for merged partials")
+    
     with open(output_dir / "metrics.json", "w") as f:
         json.dump(metrics, f, indent=2)
     
     print(f"\nResults saved to {output_dir}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -5,18 +5,52 @@ This script analyzes latency measurements for the Lucid Matrix system.
 """
 
 import argparse
+import glob
 import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
+from latency_aggregate import (AGGREGATE_COLUMNS, COMPONENTS, GroupedLatencyAggregate, LatencyAggregate, as_bool,
+                               parse_window)
+from quantile_sketch import DEFAULT_RELATIVE_ACCURACY
+from timings_cache import DEFAULT_CACHE_DIR, open_cache
 
-def load_timings(timings_file):
-    """Load timing data from CSV file."""
-    df = pd.read_csv(timings_file)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.bootstrap import add_bootstrap_arguments, bootstrap_report
+from common.plotting import (add_plot_arguments, box_stats, draw_histogram, histogram2d_summary, histogram_summary,
+                             is_large, pyplot, render_plots, selected_plots)
+
+# Rows per chunk when streaming large timing files
+DEFAULT_CHUNKSIZE = 1_000_000
+
+# Files smaller than this are analyzed exactly even in streaming mode
+DEFAULT_EXACT_THRESHOLD_MB = 64
+
+def load_timings(timings_file, cache_dir=None, usecols=None):
+    """Load timing data from CSV file.
+
+    With a `cache_dir` the columns come from the memory-mapped timings cache,
+    which is built on first use; see timings_cache.py.
+    """
+    cache = open_cache(timings_file, cache_dir) if cache_dir else None
+    if cache is not None:
+        return cache.frame(usecols)
+    df = pd.read_csv(timings_file, usecols=usecols)
     return df
 
+def iter_timings(timings_file, chunksize=DEFAULT_CHUNKSIZE, usecols=None, cache_dir=None):
+    """Yield timing data from CSV file in chunks of `chunksize` rows."""
+    cache = open_cache(timings_file, cache_dir) if cache_dir else None
+    if cache is not None:
+        yield from cache.iter_chunks(chunksize, usecols)
+        return
+    with pd.read_csv(timings_file, chunksize=chunksize, usecols=usecols) as reader:
+        for chunk in reader:
+            yield chunk
+
 def calculate_percentiles(df):
     """Calculate latency percentiles."""
     percentiles = {
@@ -31,65 +65,127 @@ def calculate_percentiles(df):
     }
     return percentiles
 
+def use_streaming(timings_files, exact_threshold_mb=DEFAULT_EXACT_THRESHOLD_MB):
+    """Return True if the files are large enough in total to be worth streaming."""
+    if isinstance(timings_files, (str, Path)):
+        timings_files = [timings_files]
+    total_size = sum(Path(timings_file).stat().st_size for timings_file in timings_files)
+    return total_size >= exact_threshold_mb * 1024 * 1024
+
+def aggregate_timings(df):
+    """Aggregate component, cache and prompt length stats in one pass."""
+    return LatencyAggregate.from_frame(df, exact=True)
+
+def aggregate_timings_streaming(timings_file, chunksize=DEFAULT_CHUNKSIZE, exact=False,
+                                relative_accuracy=DEFAULT_RELATIVE_ACCURACY, cache_dir=None, windows=()):
+    """Aggregate a timings file chunk by chunk, with hardware/model/window breakdowns."""
+    aggregate = GroupedLatencyAggregate(exact, relative_accuracy, windows=windows)
+    for chunk in iter_timings(timings_file, chunksize, usecols=lambda column: column in AGGREGATE_COLUMNS,
+                              cache_dir=cache_dir):
+        aggregate.update(chunk)
+    return aggregate
+
+def _aggregate_shard(shard):
+    """Process pool entry point: aggregate one timings file."""
+    timings_file, chunksize, exact, relative_accuracy, cache_dir, windows = shard
+    return timings_file, aggregate_timings_streaming(
+        timings_file, chunksize, exact, relative_accuracy, cache_dir, windows
+    )
+
+def aggregate_timings_parallel(timings_files, workers=None, chunksize=DEFAULT_CHUNKSIZE, exact=False,
+                               relative_accuracy=DEFAULT_RELATIVE_ACCURACY, cache_dir=None, windows=()):
+    """Aggregate many timings files in a process pool and merge the per-shard partials.
+
+    Returns the merged aggregate and a list of per-shard row counts.
+    """
+    shards = [
+        (timings_file, chunksize, exact, relative_accuracy, cache_dir, windows) for timings_file in timings_files
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    merged = GroupedLatencyAggregate(exact, relative_accuracy, windows=windows)
+    shard_counts = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for timings_file, partial in pool.map(_aggregate_shard, shards):
+            shard_counts.append({"file": str(timings_file), "count": partial.count})
+            merged.merge(partial)
+    return merged, shard_counts
+
+def resolve_timings_files(timings):
+    """Expand a timings file, directory of CSVs or glob pattern to a sorted file list."""
+    path = Path(timings)
+    if path.is_dir():
+        files = sorted(path.rglob("*.csv"))
+    elif glob.has_magic(timings):
+        files = sorted(Path(match) for match in glob.glob(timings, recursive=True))
+    else:
+        files = [path]
+    if not files:
+        raise FileNotFoundError(f"No timings files match {timings}")
+    return files
+
+def load_partials(partial_files):
+    """Merge partial aggregates saved with --save-partial."""
+    aggregate = None
+    for partial_file in partial_files:
+        with open(partial_file) as f:
+            partial = GroupedLatencyAggregate.from_state(json.load(f))
+        aggregate = partial if aggregate is None else aggregate.merge(partial)
+    return aggregate
+
 def analyze_components(df):
     """Analyze time spent in different components."""
-    components = ["parsing_time_ms", "reasoning_time_ms", "generation_time_ms", "post_processing_time_ms"]
-    component_stats = {}
-    
-    for component in components:
-        component_stats[component] = {
-            "mean": df[component].mean(),
-            "percentage": (df[component].sum() / df["total_time_ms"].sum()) * 100
-        }
-    
-    return component_stats
+    return aggregate_timings(df).component_stats()
 
 def analyze_cache_impact(df):
     """Analyze impact of cache hits on latency."""
-    cache_stats = {
-        "cache_hit": {
-            "count": df[df["cache_hit"] == True].shape[0],
-            "mean": df[df["cache_hit"] == True]["total_time_ms"].mean(),
-            "p50": np.percentile(df[df["cache_hit"] == True]["total_time_ms"], 50),
-            "p95": np.percentile(df[df["cache_hit"] == True]["total_time_ms"], 95)
-        },
-        "cache_miss": {
-            "count": df[df["cache_hit"] == False].shape[0],
-            "mean": df[df["cache_hit"] == False]["total_time_ms"].mean(),
-            "p50": np.percentile(df[df["cache_hit"] == False]["total_time_ms"], 50),
-            "p95": np.percentile(df[df["cache_hit"] == False]["total_time_ms"], 95)
-        }
-    }
-    
-    cache_stats["improvement"] = {
-        "mean_reduction": cache_stats["cache_miss"]["mean"] - cache_stats["cache_hit"]["mean"],
-        "mean_reduction_percent": ((cache_stats["cache_miss"]["mean"] - cache_stats["cache_hit"]["mean"]) / cache_stats["cache_miss"]["mean"]) * 100,
-        "p50_reduction": cache_stats["cache_miss"]["p50"] - cache_stats["cache_hit"]["p50"],
-        "p50_reduction_percent": ((cache_stats["cache_miss"]["p50"] - cache_stats["cache_hit"]["p50"]) / cache_stats["cache_miss"]["p50"]) * 100
-    }
-    
-    return cache_stats
+    return aggregate_timings(df).cache_stats()
 
 def analyze_prompt_length_impact(df):
     """Analyze impact of prompt length on latency."""
-    # Group by prompt length
-    prompt_length_groups = df.groupby("prompt_length")["total_time_ms"].agg(["mean", "count"]).reset_index()
-    
-    # Calculate correlation
-    correlation = df["prompt_length"].corr(df["total_time_ms"])
-    
-    return {
-        "prompt_length_groups": prompt_length_groups.to_dict("records"),
-        "correlation": correlation
-    }
+    return aggregate_timings(df).prompt_length_stats()
+
+def build_plot_summaries(df, aggregate, plots):
+    """Reduce the timings to the small per-plot summaries the figures are drawn from."""
+    summaries = {}
+    latencies = df["total_time_ms"].to_numpy()
+    if "distribution" in plots:
+        percentiles = aggregate.percentiles()
+        summaries["distribution"] = {
+            "histogram": histogram_summary(latencies, bins=20),
+            "p50": percentiles["p50"],
+            "p95": percentiles["p95"],
+            "p99": percentiles["p99"]
+        }
+    if "components" in plots:
+        component_stats = aggregate.component_stats()
+        summaries["components"] = {"means": [component_stats[component]["mean"] for component in COMPONENTS]}
+    if "cache" in plots:
+        cache_hit = as_bool(df["cache_hit"].to_numpy())
+        summaries["cache"] = {"boxes": [
+            box_stats(latencies[~cache_hit], "Cache Miss"),
+            box_stats(latencies[cache_hit], "Cache Hit")
+        ]}
+    if "prompt_length" in plots:
+        prompt_length = df["prompt_length"].to_numpy()
+        if is_large(latencies.size):
+            # Density instead of one marker per request
+            summaries["prompt_length"] = {"histogram2d": histogram2d_summary(prompt_length, latencies)}
+        else:
+            cache_hit = as_bool(df["cache_hit"].to_numpy())
+            summaries["prompt_length"] = {"points": {
+                str(hit): (prompt_length[cache_hit == hit], latencies[cache_hit == hit]) for hit in (False, True)
+            }}
+    return summaries
 
-def plot_latency_distribution(df, output_dir):
+def plot_latency_distribution(summary, output_dir):
     """Plot latency distribution."""
+    plt = pyplot()
+    p50, p95, p99 = summary["p50"], summary["p95"], summary["p99"]
     plt.figure(figsize=(10, 6))
-    sns.histplot(df["total_time_ms"], kde=True, bins=20)
-    plt.axvline(x=np.percentile(df["total_time_ms"], 50), color='r', linestyle='--', label=f'P50: {np.percentile(df["total_time_ms"], 50):.1f}ms')
-    plt.axvline(x=np.percentile(df["total_time_ms"], 95), color='g', linestyle='--', label=f'P95: {np.percentile(df["total_time_ms"], 95):.1f}ms')
-    plt.axvline(x=np.percentile(df["total_time_ms"], 99), color='b', linestyle='--', label=f'P99: {np.percentile(df["total_time_ms"], 99):.1f}ms')
+    draw_histogram(plt, summary["histogram"])
+    plt.axvline(x=p50, color='r', linestyle='--', label=f'P50: {p50:.1f}ms')
+    plt.axvline(x=p95, color='g', linestyle='--', label=f'P95: {p95:.1f}ms')
+    plt.axvline(x=p99, color='b', linestyle='--', label=f'P99: {p99:.1f}ms')
     plt.title("Latency Distribution")
     plt.xlabel("Latency (ms)")
     plt.ylabel("Count")
@@ -98,10 +194,10 @@ def plot_latency_distribution(df, output_dir):
     plt.savefig(output_dir / "latency_distribution.png")
     plt.close()
 
-def plot_component_breakdown(df, output_dir):
+def plot_component_breakdown(summary, output_dir):
     """Plot component breakdown."""
-    components = ["parsing_time_ms", "reasoning_time_ms", "generation_time_ms", "post_processing_time_ms"]
-    component_means = [df[component].mean() for component in components]
+    plt = pyplot()
+    component_means = summary["means"]
     component_labels = ["Parsing", "Reasoning", "Generation", "Post-processing"]
     
     plt.figure(figsize=(10, 6))
@@ -121,13 +217,12 @@ def plot_component_breakdown(df, output_dir):
     plt.savefig(output_dir / "component_distribution.png")
     plt.close()
 
-def plot_cache_comparison(df, output_dir):
+def plot_cache_comparison(summary, output_dir):
     """Plot cache hit vs miss comparison."""
-    cache_hit = df[df["cache_hit"] == True]["total_time_ms"]
-    cache_miss = df[df["cache_hit"] == False]["total_time_ms"]
+    plt = pyplot()
     
     plt.figure(figsize=(10, 6))
-    sns.boxplot(x=df["cache_hit"].map({True: "Cache Hit", False: "Cache Miss"}), y=df["total_time_ms"])
+    plt.gca().bxp(summary["boxes"], showfliers=True, patch_artist=True)
     plt.title("Latency: Cache Hit vs Miss")
     plt.xlabel("")
     plt.ylabel("Latency (ms)")
@@ -135,10 +230,19 @@ def plot_cache_comparison(df, output_dir):
     plt.savefig(output_dir / "cache_comparison.png")
     plt.close()
 
-def plot_prompt_length_impact(df, output_dir):
+def plot_prompt_length_impact(summary, output_dir):
     """Plot impact of prompt length on latency."""
+    plt = pyplot()
     plt.figure(figsize=(10, 6))
-    sns.scatterplot(x="prompt_length", y="total_time_ms", hue="cache_hit", data=df)
+    if "histogram2d" in summary:
+        hist = summary["histogram2d"]
+        counts = np.ma.masked_equal(hist["counts"].T, 0)
+        plt.pcolormesh(hist["x_edges"], hist["y_edges"], counts, norm="log")
+        plt.colorbar(label="Requests (log)")
+    else:
+        for hit, (prompt_length, latencies) in summary["points"].items():
+            plt.scatter(prompt_length, latencies, s=20, label=hit)
+        plt.legend(title="cache_hit")
     plt.title("Latency vs Prompt Length")
     plt.xlabel("Prompt Length (chars)")
     plt.ylabel("Latency (ms)")
@@ -146,64 +250,217 @@ def plot_prompt_length_impact(df, output_dir):
     plt.savefig(output_dir / "prompt_length_impact.png")
     plt.close()
 
+# Plot name -> function, in the order they are rendered
+PLOTS = {
+    "distribution": plot_latency_distribution,
+    "components": plot_component_breakdown,
+    "cache": plot_cache_comparison,
+    "prompt_length": plot_prompt_length_impact
+}
+
+# Headline latency metrics given bootstrap confidence intervals
+BOOTSTRAP_METRICS = ["p50", "p95", "p99", "mean"]
+
+def latency_statistic(latencies):
+    """P50, P95, P99 and mean of each bootstrap resample (row)."""
+    return np.column_stack([np.percentile(latencies, [50, 95, 99], axis=1).T, latencies.mean(axis=1)])
+
+def build_metrics(aggregate):
+    """Compile the latency_metrics.json dictionary from an aggregate."""
+    metrics = {
+        "percentiles": aggregate.percentiles(),
+        "component_stats": aggregate.component_stats(),
+        "cache_stats": aggregate.cache_stats(),
+        "prompt_length_stats": {
+            "correlation": aggregate.prompt_length_stats()["correlation"]
+        }
+    }
+    if not aggregate.exact:
+        metrics["quantile_estimator"] = {
+            "type": "log_histogram_sketch",
+            "relative_accuracy": aggregate.relative_accuracy
+        }
+    return metrics
+
+def build_grouped_metrics(aggregate):
+    """Overall metrics plus one entry per hardware_id and model_name."""
+    metrics = build_metrics(aggregate.overall)
+    for column, groups in aggregate.groups.items():
+        if groups:
+            metrics[f"by_{column}"] = {
+                value: build_metrics(group) for value, group in sorted(groups.items())
+            }
+    return metrics
+
+def load_baseline_p95(baseline_file):
+    """Read the overall P95 from a baseline latency_metrics.json."""
+    with open(baseline_file) as f:
+        return json.load(f)["percentiles"]["p95"]
+
+def detect_regressions(series, baseline_p95, threshold, min_count=1):
+    """Flag windows whose P95 exceeds the baseline P95 by more than `threshold` (a fraction)."""
+    limit = baseline_p95 * (1 + threshold)
+    regressions = []
+    for start, count, p95 in zip(series["window_start"], series["count"], series["p95"]):
+        if count >= min_count and p95 > limit:
+            regressions.append({
+                "window_start": start,
+                "count": count,
+                "p95": p95,
+                "increase_percent": (p95 / baseline_p95 - 1) * 100
+            })
+    return regressions
+
+def build_window_report(aggregate, baseline_p95, threshold, min_count=1):
+    """Per-window time series and regressions for every window size."""
+    report = {
+        "baseline_p95": baseline_p95,
+        "regression_threshold": threshold,
+        "min_window_count": min_count,
+        "windows": {}
+    }
+    for window, windowed in aggregate.windowed.items():
+        series = windowed.series()
+        report["windows"][window] = {
+            "window_seconds": windowed.window_seconds,
+            "series": series,
+            "regressions": detect_regressions(series, baseline_p95, threshold, min_count)
+        }
+    return report
+
 def main():
     parser = argparse.ArgumentParser(description="Analyze latency measurements")
-    parser.add_argument("--timings", type=str, required=True, help="Path to timings CSV file")
+    parser.add_argument("--timings", type=str,
+                        help="Path to timings CSV file, a directory of CSVs, or a glob pattern (quote it)")
     parser.add_argument("--output-dir", type=str, default="./", help="Directory to save results")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Read the timings in chunks and estimate percentiles with a constant-memory sketch")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows per chunk in streaming mode")
+    parser.add_argument("--relative-accuracy", type=float, default=DEFAULT_RELATIVE_ACCURACY,
+                        help="Relative error bound of streaming percentiles")
+    parser.add_argument("--exact-threshold-mb", type=float, default=DEFAULT_EXACT_THRESHOLD_MB,
+                        help="Inputs smaller than this are analyzed exactly even with --streaming")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for multi-file input (default: CPU count)")
+    parser.add_argument("--cache-dir", type=str, default=str(DEFAULT_CACHE_DIR),
+                        help="Directory for the memory-mapped columnar cache of parsed timings")
+    parser.add_argument("--no-cache", action="store_true", help="Always parse the CSV text")
+    parser.add_argument("--windows", type=str, nargs="+", default=[],
+                        help="Also report per-window percentiles for these window sizes, e.g. 1m 5m 1h")
+    parser.add_argument("--baseline", type=str,
+                        help="Baseline latency_metrics.json whose P95 windows are compared to (default: this run)")
+    parser.add_argument("--regression-threshold", type=float, default=0.10,
+                        help="Flag windows whose P95 exceeds the baseline P95 by more than this fraction")
+    parser.add_argument("--min-window-count", type=int, default=1,
+                        help="Ignore windows with fewer requests when flagging regressions")
+    add_bootstrap_arguments(parser)
+    add_plot_arguments(parser, list(PLOTS))
+    parser.add_argument("--save-partial", type=str, help="Also write the mergeable partial aggregate to this JSON file")
+    parser.add_argument("--merge-partials", type=str, nargs="+",
+                        help="Build the report from partial aggregates instead of a timings file")
     args = parser.parse_args()
     
-    # Load timings
-    print(f"Loading timings from {args.timings}")
-    df = load_timings(args.timings)
-    print(f"Loaded {len(df)} timing measurements")
-    
-    # Calculate percentiles
-    print("Calculating percentiles...")
-    percentiles = calculate_percentiles(df)
-    
-    # Analyze components
-    print("Analyzing components...")
-    component_stats = analyze_components(df)
+    if not args.timings and not args.merge_partials:
+        parser.error("one of --timings or --merge-partials is required")
+    for window in args.windows:
+        try:
+            parse_window(window)
+        except ValueError as e:
+            parser.error(str(e))
     
-    # Analyze cache impact
-    print("Analyzing cache impact...")
-    cache_stats = analyze_cache_impact(df)
-    
-    # Analyze prompt length impact
-    print("Analyzing prompt length impact...")
-    prompt_length_stats = analyze_prompt_length_impact(df)
+    cache_dir = None if args.no_cache else args.cache_dir
+    plots = selected_plots(args, list(PLOTS))
+    df = None
+    shard_counts = None
+    if args.merge_partials:
+        print(f"Merging {len(args.merge_partials)} partial aggregates")
+        aggregate = load_partials(args.merge_partials)
+    else:
+        timings_files = resolve_timings_files(args.timings)
+        exact = not (args.streaming and use_streaming(timings_files, args.exact_threshold_mb))
+        if len(timings_files) > 1:
+            print(f"Aggregating {len(timings_files)} timings files in parallel")
+            aggregate, shard_counts = aggregate_timings_parallel(
+                timings_files, args.workers, args.chunksize, exact, args.relative_accuracy, cache_dir, args.windows
+            )
+        elif not exact:
+            print(f"Streaming timings from {args.timings} in chunks of {args.chunksize} rows")
+            aggregate = aggregate_timings_streaming(
+                timings_files[0], args.chunksize, exact, args.relative_accuracy, cache_dir, args.windows
+            )
+        else:
+            if args.streaming:
+                print(f"{args.timings} is below {args.exact_threshold_mb}MB, using exact computation")
+            # Load timings
+            print(f"Loading timings from {args.timings}")
+            # The metrics and plots only read these columns (never request_id)
+            df = load_timings(timings_files[0], cache_dir, lambda column: column in AGGREGATE_COLUMNS)
+            
+            # Percentiles, components, cache and prompt length impact in one pass
+            print("Aggregating timings...")
+            aggregate = GroupedLatencyAggregate.from_frame(df, exact=True, windows=args.windows)
+    print(f"Loaded {aggregate.count} timing measurements")
     
     # Create output directory
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    if args.save_partial:
+        with open(args.save_partial, "w") as f:
+            json.dump(aggregate.to_state(), f)
+        print(f"Partial aggregate saved to {args.save_partial}")
+    
     # Generate plots
-    print("Generating plots...")
-    plot_latency_distribution(df, output_dir)
-    plot_component_breakdown(df, output_dir)
-    plot_cache_comparison(df, output_dir)
-    plot_prompt_length_impact(df, output_dir)
+    if plots and df is not None:
+        print(f"Generating plots: {', '.join(plots)}...")
+        summaries = build_plot_summaries(df, aggregate.overall, plots)
+        render_plots([(PLOTS[name], summaries[name], output_dir) for name in plots], args.plot_workers)
+    elif plots:
+        print("Plots need the full DataFrame and are skipped for streamed or merged input")
     
     # Compile metrics
-    metrics = {
-        "percentiles": percentiles,
-        "component_stats": component_stats,
-        "cache_stats": cache_stats,
-        "prompt_length_stats": {
-            "correlation": prompt_length_stats["correlation"]
-        }
-    }
+    metrics = build_grouped_metrics(aggregate)
+    if shard_counts:
+        metrics["shards"] = shard_counts
+    if args.bootstrap_resamples and df is not None:
+        print(f"Bootstrapping latency percentiles with {args.bootstrap_resamples} resamples...")
+        latencies = df["total_time_ms"].to_numpy(dtype=np.float64)
+        metrics["bootstrap"] = bootstrap_report(latency_statistic, [latencies[~np.isnan(latencies)]],
+                                                BOOTSTRAP_METRICS, args.bootstrap_resamples,
+                                                workers=args.bootstrap_workers)
+    elif args.bootstrap_resamples:
+        print("Bootstrap intervals need the full DataFrame and are skipped for streamed or merged input")
+    percentiles = metrics["percentiles"]
+    component_stats = metrics["component_stats"]
+    cache_stats = metrics["cache_stats"]
     
     # Save metrics to JSON
     with open(output_dir / "latency_metrics.json", "w") as f:
         json.dump(metrics, f, indent=2)
     
+    # Windowed time series and regression detection
+    window_report = None
+    if aggregate.windowed:
+        baseline_p95 = load_baseline_p95(args.baseline) if args.baseline else percentiles["p95"]
+        window_report = build_window_report(
+            aggregate, baseline_p95, args.regression_threshold, args.min_window_count
+        )
+        with open(output_dir / "latency_windows.json", "w") as f:
+            json.dump(window_report, f, separators=(",", ":"))
+    
     # Print summary
     print("\nLatency Analysis Results:")
     print(f"P50 latency: {percentiles['p50']:.2f}ms")
     print(f"P95 latency: {percentiles['p95']:.2f}ms")
     print(f"P99 latency: {percentiles['p99']:.2f}ms")
     print(f"Mean latency: {percentiles['mean']:.2f}ms")
+    if "bootstrap" in metrics:
+        intervals = metrics["bootstrap"]["intervals"]
+        print(f"{metrics['bootstrap']['confidence']:.0%} CIs: " + ", ".join(
+            f"{name} [{intervals[name]['lower']:.2f}, {intervals[name]['upper']:.2f}]" for name in BOOTSTRAP_METRICS
+        ))
+    if not aggregate.overall.exact:
+        print(f"(percentiles within {aggregate.overall.relative_accuracy:.2%} relative error)")
     
     print("\nComponent Breakdown:")
     for component, stats in component_stats.items():
@@ -214,7 +471,23 @@ def main():
     print(f"Cache miss mean: {cache_stats['cache_miss']['mean']:.2f}ms")
     print(f"Mean reduction: {cache_stats['improvement']['mean_reduction']:.2f}ms ({cache_stats['improvement']['mean_reduction_percent']:.1f}%)")
     
+    if window_report:
+        print(f"\nWindowed P95 (baseline {window_report['baseline_p95']:.2f}ms, "
+              f"threshold +{window_report['regression_threshold']:.0%}):")
+        for window, report in window_report["windows"].items():
+            regressions = report["regressions"]
+            print(f"{window}: {len(report['series']['window_start'])} windows, {len(regressions)} regressed")
+            for regression in regressions[:10]:
+                print(f"  {regression['window_start']}: P95 {regression['p95']:.2f}ms "
+                      f"(+{regression['increase_percent']:.1f}%, n={regression['count']})")
+    
+    for column in ("hardware_id", "model_name"):
+        if len(metrics.get(f"by_{column}", {})) > 1:
+            print(f"\nP95 by {column}:")
+            for value, group_metrics in metrics[f"by_{column}"].items():
+                print(f"{value}: {group_metrics['percentiles']['p95']:.2f}ms")
+    
     print(f"\nResults saved to {output_dir}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Latency Aggregate
+Single-pass, mergeable aggregation of timing rows for analyze_latency.py.
+
+A LatencyAggregate folds DataFrame chunks into everything the latency report
+needs: overall percentiles, per-component sums, cache hit/miss distributions,
+prompt-length buckets and the prompt-length/latency correlation. Partial
+aggregates built from different chunks, files or worker processes can be
+merged, and saved to JSON with to_state() to be combined later.
+GroupedLatencyAggregate keeps the same partials per hardware_id and model_name,
+and optionally per tumbling time window (WindowedLatency).
+"""
+
+import math
+import re
+import numpy as np
+import pandas as pd
+from quantile_sketch import DEFAULT_RELATIVE_ACCURACY, as_sketch, make_quantiles, quantiles_from_state
+
+COMPONENTS = ["parsing_time_ms", "reasoning_time_ms", "generation_time_ms", "post_processing_time_ms"]
+
+# Columns with per-value breakdowns in the report
+GROUP_COLUMNS = ["hardware_id", "model_name"]
+
+# Columns the aggregate reads; used to project CSV reads
+AGGREGATE_COLUMNS = ["total_time_ms", "cache_hit", "prompt_length", "timestamp"] + COMPONENTS + GROUP_COLUMNS
+
+WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def as_bool(values):
+    """Return a boolean array from a bool or "True"/"False" string column."""
+    values = np.asarray(values)
+    if values.dtype == np.bool_:
+        return values
+    if values.dtype.kind in "iuf":
+        return values != 0
+    return np.char.lower(values.astype(str)) == "true"
+
+
+def parse_window(spec):
+    """Convert a window like "30s", "5m" or "1h" to seconds."""
+    match = re.fullmatch(r"(\d+)([smhd])", spec.strip())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid window {spec!r}; expected e.g. 1m, 5m or 1h")
+    return int(match.group(1)) * WINDOW_UNITS[match.group(2)]
+
+
+def timestamps_ns(values):
+    """Nanoseconds since the epoch (UTC) for a timestamp column; NaT becomes -1."""
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, utc=True, format="ISO8601")
+    index = pd.DatetimeIndex(values).as_unit("ns")
+    return np.where(index.isna(), -1, index.asi8)
+
+
+class RunningCovariance:
+    """Mergeable co-moments of two variables, used for Pearson correlation."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if x.size == 0:
+            return
+        chunk = RunningCovariance()
+        chunk.count = int(x.size)
+        chunk.mean_x, chunk.mean_y = float(x.mean()), float(y.mean())
+        dx, dy = x - chunk.mean_x, y - chunk.mean_y
+        chunk.m2_x, chunk.m2_y = float((dx * dx).sum()), float((dy * dy).sum())
+        chunk.c_xy = float((dx * dy).sum())
+        self.merge(chunk)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return
+        count = self.count + other.count
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.count * other.count / count
+        self.m2_x += other.m2_x + dx * dx * weight
+        self.m2_y += other.m2_y + dy * dy * weight
+        self.c_xy += other.c_xy + dx * dy * weight
+        self.mean_x += dx * other.count / count
+        self.mean_y += dy * other.count / count
+        self.count = count
+
+    @property
+    def correlation(self):
+        denominator = math.sqrt(self.m2_x * self.m2_y)
+        if denominator == 0:
+            return float("nan")
+        return self.c_xy / denominator
+
+
+class LatencyAggregate:
+    """Mergeable partial result for the latency report."""
+
+    def __init__(self, exact=False, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.exact = exact
+        self.relative_accuracy = relative_accuracy
+        self.total = make_quantiles(exact, relative_accuracy)
+        self.total_sum = 0.0
+        self.component_sums = {component: 0.0 for component in COMPONENTS}
+        self.cache = {
+            "cache_hit": make_quantiles(exact, relative_accuracy),
+            "cache_miss": make_quantiles(exact, relative_accuracy)
+        }
+        # prompt_length -> [sum of total_time_ms, count]
+        self.prompt_groups = {}
+        self.prompt_covariance = RunningCovariance()
+
+    @property
+    def count(self):
+        return self.total.count
+
+    @classmethod
+    def from_frame(cls, df, exact=True, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        """Aggregate a whole DataFrame in one pass."""
+        aggregate = cls(exact, relative_accuracy)
+        aggregate.update(df)
+        return aggregate
+
+    def update(self, df):
+        """Fold a DataFrame chunk of timing rows into the aggregate."""
+        if len(df) == 0:
+            return
+        total = df["total_time_ms"].to_numpy(dtype=np.float64)
+        self.total.update(total)
+        self.total_sum += float(total.sum())
+
+        for component in COMPONENTS:
+            self.component_sums[component] += float(df[component].to_numpy(dtype=np.float64).sum())
+
+        hit = as_bool(df["cache_hit"].to_numpy())
+        self.cache["cache_hit"].update(total[hit])
+        self.cache["cache_miss"].update(total[~hit])
+
+        prompt_length = df["prompt_length"].to_numpy()
+        lengths, inverse = np.unique(prompt_length, return_inverse=True)
+        sums = np.bincount(inverse, weights=total, minlength=lengths.size)
+        counts = np.bincount(inverse, minlength=lengths.size)
+        for length, group_sum, group_count in zip(lengths.tolist(), sums.tolist(), counts.tolist()):
+            group = self.prompt_groups.setdefault(length, [0.0, 0])
+            group[0] += group_sum
+            group[1] += group_count
+        self.prompt_covariance.update(prompt_length, total)
+
+    def to_sketch(self, relative_accuracy):
+        """Convert exact quantiles to sketches in place (no-op for a sketched aggregate)."""
+        if self.exact:
+            self.total = as_sketch(self.total, relative_accuracy)
+            self.cache = {key: as_sketch(quantiles, relative_accuracy) for key, quantiles in self.cache.items()}
+            self.exact = False
+            self.relative_accuracy = relative_accuracy
+        return self
+
+    def merge(self, other):
+        """Combine with a partial aggregate from another chunk, file or process.
+
+        An exact and a sketched partial (e.g. shards on either side of
+        --exact-threshold-mb) are merged as sketches.
+        """
+        if other.exact != self.exact:
+            if self.exact:
+                self.to_sketch(other.relative_accuracy)
+            else:
+                other = LatencyAggregate.from_state(other.to_state()).to_sketch(self.relative_accuracy)
+        self.total.merge(other.total)
+        self.total_sum += other.total_sum
+        for component in COMPONENTS:
+            self.component_sums[component] += other.component_sums[component]
+        for key in self.cache:
+            self.cache[key].merge(other.cache[key])
+        for length, (group_sum, group_count) in other.prompt_groups.items():
+            group = self.prompt_groups.setdefault(length, [0.0, 0])
+            group[0] += group_sum
+            group[1] += group_count
+        self.prompt_covariance.merge(other.prompt_covariance)
+        return self
+
+    def percentiles(self):
+        """Same dictionary as calculate_percentiles."""
+        return self.total.summary()
+
+    def component_stats(self):
+        """Same dictionary as analyze_components."""
+        count = self.count
+        return {
+            component: {
+                "mean": component_sum / count if count else float("nan"),
+                "percentage": (component_sum / self.total_sum) * 100 if self.total_sum else float("nan")
+            }
+            for component, component_sum in self.component_sums.items()
+        }
+
+    def cache_stats(self):
+        """Same dictionary as analyze_cache_impact."""
+        cache_stats = {}
+        for key, quantiles in self.cache.items():
+            empty = quantiles.count == 0
+            cache_stats[key] = {
+                "count": quantiles.count,
+                "mean": float("nan") if empty else quantiles.moments.mean,
+                "p50": quantiles.quantile(0.50),
+                "p95": quantiles.quantile(0.95)
+            }
+
+        hit, miss = cache_stats["cache_hit"], cache_stats["cache_miss"]
+        cache_stats["improvement"] = {
+            "mean_reduction": miss["mean"] - hit["mean"],
+            "mean_reduction_percent": _percent_reduction(miss["mean"], hit["mean"]),
+            "p50_reduction": miss["p50"] - hit["p50"],
+            "p50_reduction_percent": _percent_reduction(miss["p50"], hit["p50"])
+        }
+        return cache_stats
+
+    def prompt_length_stats(self):
+        """Same dictionary as analyze_prompt_length_impact."""
+        groups = [
+            {"prompt_length": length, "mean": group_sum / group_count, "count": group_count}
+            for length, (group_sum, group_count) in sorted(self.prompt_groups.items())
+        ]
+        return {
+            "prompt_length_groups": groups,
+            "correlation": self.prompt_covariance.correlation
+        }
+
+    def to_state(self):
+        """Return a JSON-serializable snapshot that from_state can restore."""
+        return {
+            "exact": self.exact,
+            "relative_accuracy": self.relative_accuracy,
+            "total": self.total.to_state(),
+            "total_sum": self.total_sum,
+            "component_sums": self.component_sums,
+            "cache": {key: quantiles.to_state() for key, quantiles in self.cache.items()},
+            "prompt_groups": [[length, group_sum, group_count]
+                              for length, (group_sum, group_count) in self.prompt_groups.items()],
+            "prompt_covariance": dict(self.prompt_covariance.__dict__)
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        aggregate = cls(state["exact"], state["relative_accuracy"])
+        aggregate.total = quantiles_from_state(state["total"])
+        aggregate.total_sum = state["total_sum"]
+        aggregate.component_sums = dict(state["component_sums"])
+        aggregate.cache = {key: quantiles_from_state(value) for key, value in state["cache"].items()}
+        aggregate.prompt_groups = {length: [group_sum, group_count]
+                                   for length, group_sum, group_count in state["prompt_groups"]}
+        aggregate.prompt_covariance.__dict__.update(state["prompt_covariance"])
+        return aggregate
+
+
+class WindowedLatency:
+    """Per-window total_time_ms quantiles over tumbling timestamp buckets."""
+
+    def __init__(self, window, exact=False, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.window = window
+        self.window_seconds = parse_window(window)
+        self.exact = exact
+        self.relative_accuracy = relative_accuracy
+        # window index (start // window_seconds) -> quantiles
+        self.windows = {}
+
+    def _window(self, index):
+        if index not in self.windows:
+            self.windows[index] = make_quantiles(self.exact, self.relative_accuracy)
+        return self.windows[index]
+
+    def update(self, df):
+        """Fold a chunk's rows into the windows their timestamps fall in."""
+        if len(df) == 0 or "timestamp" not in df.columns:
+            return
+        ns = timestamps_ns(df["timestamp"])
+        total = df["total_time_ms"].to_numpy(dtype=np.float64)
+        valid = ns >= 0
+        index = ns[valid] // (self.window_seconds * 10**9)
+        total = total[valid]
+
+        order = np.argsort(index, kind="stable")
+        index, total = index[order], total[order]
+        keys, starts = np.unique(index, return_index=True)
+        for key, values in zip(keys.tolist(), np.split(total, starts[1:])):
+            self._window(key).update(values)
+
+    def to_sketch(self, relative_accuracy):
+        """Convert exact windows to sketches in place."""
+        if self.exact:
+            self.windows = {index: as_sketch(quantiles, relative_accuracy)
+                            for index, quantiles in self.windows.items()}
+            self.exact = False
+            self.relative_accuracy = relative_accuracy
+        return self
+
+    def merge(self, other):
+        if other.window_seconds != self.window_seconds:
+            raise ValueError("Cannot merge different window sizes")
+        if other.exact != self.exact:
+            if self.exact:
+                self.to_sketch(other.relative_accuracy)
+            else:
+                other = WindowedLatency.from_state(other.to_state()).to_sketch(self.relative_accuracy)
+        for index, quantiles in other.windows.items():
+            self._window(index).merge(quantiles)
+        return self
+
+    def series(self):
+        """Compact columnar time series, one entry per non-empty window."""
+        series = {"window_start": [], "count": [], "mean": [], "p50": [], "p95": [], "p99": []}
+        for index in sorted(self.windows):
+            quantiles = self.windows[index]
+            start = pd.Timestamp(index * self.window_seconds, unit="s", tz="UTC")
+            series["window_start"].append(start.strftime("%Y-%m-%dT%H:%M:%SZ"))
+            series["count"].append(quantiles.count)
+            series["mean"].append(quantiles.moments.mean)
+            for p in (50, 95, 99):
+                series[f"p{p}"].append(quantiles.quantile(p / 100))
+        return series
+
+    def to_state(self):
+        return {
+            "window": self.window,
+            "exact": self.exact,
+            "relative_accuracy": self.relative_accuracy,
+            "windows": [[index, quantiles.to_state()] for index, quantiles in self.windows.items()]
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        windowed = cls(state["window"], state["exact"], state["relative_accuracy"])
+        windowed.windows = {index: quantiles_from_state(quantiles) for index, quantiles in state["windows"]}
+        return windowed
+
+
+class GroupedLatencyAggregate:
+    """LatencyAggregate over all rows plus one per hardware_id and model_name.
+
+    With `windows` (e.g. ["1m", "1h"]) it also keeps a WindowedLatency per
+    window size.
+    """
+
+    def __init__(self, exact=False, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, group_columns=GROUP_COLUMNS,
+                 windows=()):
+        self.exact = exact
+        self.relative_accuracy = relative_accuracy
+        self.overall = LatencyAggregate(exact, relative_accuracy)
+        self.groups = {column: {} for column in group_columns}
+        self.windowed = {window: WindowedLatency(window, exact, relative_accuracy) for window in windows}
+
+    @property
+    def count(self):
+        return self.overall.count
+
+    @classmethod
+    def from_frame(cls, df, exact=True, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, windows=()):
+        aggregate = cls(exact, relative_accuracy, windows=windows)
+        aggregate.update(df)
+        return aggregate
+
+    def _group(self, column, value):
+        groups = self.groups[column]
+        if value not in groups:
+            groups[value] = LatencyAggregate(self.exact, self.relative_accuracy)
+        return groups[value]
+
+    def update(self, df):
+        """Fold a DataFrame chunk into the overall and per-group aggregates."""
+        self.overall.update(df)
+        for column in self.groups:
+            # Older timing files may not carry the grouping columns
+            if column not in df.columns:
+                continue
+            for value, rows in df.groupby(column, sort=False, observed=True):
+                self._group(column, str(value)).update(rows)
+        for windowed in self.windowed.values():
+            windowed.update(df)
+
+    def to_sketch(self, relative_accuracy):
+        """Convert every exact aggregate to sketches in place."""
+        if self.exact:
+            self.overall.to_sketch(relative_accuracy)
+            for groups in self.groups.values():
+                for aggregate in groups.values():
+                    aggregate.to_sketch(relative_accuracy)
+            for windowed in self.windowed.values():
+                windowed.to_sketch(relative_accuracy)
+            self.exact = False
+            self.relative_accuracy = relative_accuracy
+        return self
+
+    def merge(self, other):
+        """Combine with another partial; an exact and a sketched one merge as sketches."""
+        if other.exact != self.exact:
+            if self.exact:
+                self.to_sketch(other.relative_accuracy)
+            else:
+                other = GroupedLatencyAggregate.from_state(other.to_state()).to_sketch(self.relative_accuracy)
+        self.overall.merge(other.overall)
+        for column, groups in other.groups.items():
+            self.groups.setdefault(column, {})
+            for value, aggregate in groups.items():
+                self._group(column, value).merge(aggregate)
+        for window, windowed in other.windowed.items():
+            if window in self.windowed:
+                self.windowed[window].merge(windowed)
+            else:
+                self.windowed[window] = windowed
+        return self
+
+    def to_state(self):
+        return {
+            "overall": self.overall.to_state(),
+            "groups": {
+                column: {value: aggregate.to_state() for value, aggregate in groups.items()}
+                for column, groups in self.groups.items()
+            },
+            "windowed": [windowed.to_state() for windowed in self.windowed.values()]
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        overall = LatencyAggregate.from_state(state["overall"])
+        aggregate = cls(overall.exact, overall.relative_accuracy, group_columns=list(state["groups"]))
+        aggregate.overall = overall
+        aggregate.groups = {
+            column: {value: LatencyAggregate.from_state(group) for value, group in groups.items()}
+            for column, groups in state["groups"].items()
+        }
+        for windowed_state in state.get("windowed", []):
+            windowed = WindowedLatency.from_state(windowed_state)
+            aggregate.windowed[windowed.window] = windowed
+        return aggregate
+
+
+def _percent_reduction(baseline, improved):
+    if not baseline:
+        return float("nan")
+    return ((baseline - improved) / baseline) * 100
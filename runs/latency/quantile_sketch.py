@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Quantile Sketches
+Mergeable, constant-memory latency summaries used by analyze_latency.py.
+
+LogHistogramSketch buckets values on a logarithmic grid (HDR-histogram /
+DDSketch style). With relative accuracy ``a`` the bucket boundaries grow by
+``gamma = (1 + a) / (1 - a)``, and every quantile it reports is within a
+relative error of ``a`` of the sample at rank ``floor(q * (n - 1))`` (the
+value ``np.percentile(..., method="lower")`` returns). Memory is bounded by
+the number of buckets, ``log(max / min) / log(gamma)``: about 1,900 buckets
+for 0.01ms..1000s at the default 0.5% accuracy, independent of row count.
+
+ExactQuantiles exposes the same interface but keeps every value, so small
+files can be reported with the exact ``np.percentile`` figures.
+"""
+
+import math
+import numpy as np
+
+DEFAULT_RELATIVE_ACCURACY = 0.005
+
+# Values at or below this are counted in a dedicated zero bucket
+MIN_INDEXABLE_VALUE = 1e-9
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+class RunningMoments:
+    """Count, min, max, mean and variance, mergeable across chunks."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """Fold an array of values into the running moments."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        chunk = RunningMoments()
+        chunk.count = int(values.size)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Combine with another RunningMoments (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1, as pandas reports it)."""
+        if self.count < 2:
+            return float("nan")
+        return math.sqrt(self.m2 / (self.count - 1))
+
+    def to_state(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2,
+                "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_state(cls, state):
+        moments = cls()
+        moments.count, moments.mean, moments.m2 = state["count"], state["mean"], state["m2"]
+        moments.min, moments.max = state["min"], state["max"]
+        return moments
+
+
+class LogHistogramSketch:
+    """Log-bucketed quantile sketch with a guaranteed relative error bound."""
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.offset = 0
+        self.zero_count = 0
+        self.moments = RunningMoments()
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def _grow(self, lo, hi):
+        """Extend the bucket array so it covers indices [lo, hi]."""
+        if self.counts.size == 0:
+            self.offset = lo
+            self.counts = np.zeros(hi - lo + 1, dtype=np.int64)
+            return
+        cur_hi = self.offset + self.counts.size - 1
+        new_lo, new_hi = min(lo, self.offset), max(hi, cur_hi)
+        if new_lo == self.offset and new_hi == cur_hi:
+            return
+        counts = np.zeros(new_hi - new_lo + 1, dtype=np.int64)
+        start = self.offset - new_lo
+        counts[start:start + self.counts.size] = self.counts
+        self.counts, self.offset = counts, new_lo
+
+    def update(self, values):
+        """Add an array of non-negative values to the sketch."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        if values.min() < 0:
+            raise ValueError("LogHistogramSketch only accepts non-negative values")
+        self.moments.update(values)
+
+        positive = values[values > MIN_INDEXABLE_VALUE]
+        self.zero_count += int(values.size - positive.size)
+        if positive.size == 0:
+            return
+        index = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        lo, hi = int(index.min()), int(index.max())
+        self._grow(lo, hi)
+        start = lo - self.offset
+        self.counts[start:start + hi - lo + 1] += np.bincount(index - lo, minlength=hi - lo + 1)
+
+    def merge(self, other):
+        """Combine with another sketch built with the same relative accuracy."""
+        if not isinstance(other, LogHistogramSketch) or other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.moments.merge(other.moments)
+        self.zero_count += other.zero_count
+        if other.counts.size == 0:
+            return
+        lo = other.offset
+        hi = other.offset + other.counts.size - 1
+        self._grow(lo, hi)
+        start = lo - self.offset
+        self.counts[start:start + other.counts.size] += other.counts
+
+    def quantile(self, q):
+        """Estimate the q-quantile (0 <= q <= 1)."""
+        if self.count == 0:
+            return float("nan")
+        rank = math.floor(q * (self.count - 1))
+        if rank < self.zero_count:
+            return 0.0 if self.moments.min <= 0 else self.moments.min
+        cumulative = np.cumsum(self.counts)
+        bucket = int(np.searchsorted(cumulative, rank - self.zero_count, side="right"))
+        estimate = 2 * self.gamma ** (self.offset + bucket) / (self.gamma + 1)
+        # Clamping to the observed range keeps P0/P100 exact
+        return float(min(max(estimate, self.moments.min), self.moments.max))
+
+    def summary(self):
+        """Return the calculate_percentiles dictionary for the sketched values."""
+        return summarize(self)
+
+    def to_state(self):
+        """Return a JSON-serializable snapshot that from_state can restore."""
+        nonzero = np.flatnonzero(self.counts)
+        return {
+            "type": "log_histogram_sketch",
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "bucket_index": (nonzero + self.offset).tolist(),
+            "bucket_count": self.counts[nonzero].tolist(),
+            "moments": self.moments.to_state()
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        sketch = cls(state["relative_accuracy"])
+        sketch.zero_count = state["zero_count"]
+        sketch.moments = RunningMoments.from_state(state["moments"])
+        index = np.asarray(state["bucket_index"], dtype=np.int64)
+        if index.size:
+            lo, hi = int(index.min()), int(index.max())
+            sketch._grow(lo, hi)
+            sketch.counts[index - lo] = state["bucket_count"]
+        return sketch
+
+
+class ExactQuantiles:
+    """Keeps every value; same interface as LogHistogramSketch."""
+
+    relative_accuracy = 0.0
+
+    def __init__(self):
+        self.chunks = []
+        self.moments = RunningMoments()
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    def values(self):
+        if not self.chunks:
+            return np.zeros(0, dtype=np.float64)
+        if len(self.chunks) > 1:
+            self.chunks = [np.concatenate(self.chunks)]
+        return self.chunks[0]
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.chunks.append(values)
+        self.moments.update(values)
+
+    def merge(self, other):
+        if not isinstance(other, ExactQuantiles):
+            raise ValueError("Cannot merge exact quantiles with a sketch")
+        self.chunks.extend(other.chunks)
+        self.moments.merge(other.moments)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+        return float(np.percentile(self.values(), q * 100))
+
+    def summary(self):
+        return summarize(self)
+
+    def to_state(self):
+        return {"type": "exact", "values": self.values().tolist(),
+                "moments": self.moments.to_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        quantiles = cls()
+        if state["values"]:
+            quantiles.chunks = [np.asarray(state["values"], dtype=np.float64)]
+        quantiles.moments = RunningMoments.from_state(state["moments"])
+        return quantiles
+
+
+def summarize(quantiles):
+    """Build the percentile/min/max/mean/std dictionary for a quantile backend."""
+    stats = {f"p{p}": quantiles.quantile(p / 100) for p in PERCENTILES}
+    moments = quantiles.moments
+    empty = moments.count == 0
+    stats.update({
+        "min": float("nan") if empty else moments.min,
+        "max": float("nan") if empty else moments.max,
+        "mean": float("nan") if empty else moments.mean,
+        "std": moments.std
+    })
+    return stats
+
+
+def make_quantiles(exact=False, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Return an exact or sketched quantile accumulator."""
+    if exact:
+        return ExactQuantiles()
+    return LogHistogramSketch(relative_accuracy)
+
+
+def as_sketch(quantiles, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Return quantiles as a LogHistogramSketch, bucketing the values of ExactQuantiles."""
+    if isinstance(quantiles, LogHistogramSketch):
+        return quantiles
+    sketch = LogHistogramSketch(relative_accuracy)
+    sketch.update(quantiles.values())
+    return sketch
+
+
+def quantiles_from_state(state):
+    """Restore a quantile accumulator saved with to_state()."""
+    if state["type"] == "exact":
+        return ExactQuantiles.from_state(state)
+    return LogHistogramSketch.from_state(state)
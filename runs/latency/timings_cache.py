@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Timings Cache
+On-disk columnar cache of parsed timings.csv files for analyze_latency.py.
+
+The first time a timings file is analyzed its CSV text is parsed once, in
+chunks, and every column is written as a raw typed array: float64 times,
+int32 lengths, bool cache_hit, datetime64[ns] timestamp and int32 codes plus a
+category list for low-cardinality string columns such as model_name. Unique
+strings such as request_id are stored as UTF-8 bytes with an int64 offset per
+row, since a category list would hold every value. Later runs memory-map the
+arrays instead of re-parsing the CSV, and only read (or decode) the columns
+they ask for.
+
+Cache entries are keyed by the source file's resolved path, size, mtime and a
+SHA-256 of its first and last MiB. Any change to the file selects a new entry,
+and stale entries for the same file are removed when the new one is written.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from latency_aggregate import as_bool
+
+CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("LUCID_TIMINGS_CACHE")
+    or Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "lucid_matrix" / "timings"
+)
+
+# Column -> storage type; unknown numeric columns are stored as float64 and
+# unknown string columns as categories
+TIMINGS_SCHEMA = {
+    "request_id": "string",
+    "prompt_length": "int32",
+    "response_length": "int32",
+    "total_time_ms": "float64",
+    "parsing_time_ms": "float64",
+    "reasoning_time_ms": "float64",
+    "generation_time_ms": "float64",
+    "post_processing_time_ms": "float64",
+    "cache_hit": "bool",
+    "beam_width": "int32",
+    "temperature": "float64",
+    "model_name": "category",
+    "hardware_id": "category",
+    "timestamp": "datetime64[ns]"
+}
+
+# Bytes hashed from each end of the source file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+BUILD_CHUNKSIZE = 1_000_000
+
+
+def cache_key(timings_file):
+    """Fingerprint of a timings file: size, mtime and a head/tail content hash."""
+    stat = os.stat(timings_file)
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(timings_file, "rb") as f:
+        digest.update(f.read(HASH_BLOCK_SIZE))
+        if stat.st_size > HASH_BLOCK_SIZE:
+            f.seek(max(stat.st_size - HASH_BLOCK_SIZE, HASH_BLOCK_SIZE))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _source_prefix(timings_file):
+    resolved = str(Path(timings_file).resolve())
+    return f"{Path(timings_file).stem}-{hashlib.sha256(resolved.encode()).hexdigest()[:12]}"
+
+
+def cache_entry(timings_file, cache_dir=DEFAULT_CACHE_DIR):
+    """Directory holding the cached columns for the current file contents."""
+    return Path(cache_dir) / f"{_source_prefix(timings_file)}-{cache_key(timings_file)[:20]}"
+
+
+def _storage_type(column, values):
+    if column in TIMINGS_SCHEMA:
+        return TIMINGS_SCHEMA[column]
+    if pd.api.types.is_numeric_dtype(values):
+        return "float64"
+    return "category"
+
+
+def _encode(values, storage_type, categories):
+    """Convert one chunk of a CSV column to its cached array (UTF-8 bytes and lengths for strings)."""
+    if storage_type == "string":
+        encoded = values.astype(str).str.encode("utf-8")
+        return b"".join(encoded.tolist()), encoded.str.len().to_numpy(dtype=np.int64)
+    if storage_type == "category":
+        local_codes, uniques = pd.factorize(values.astype(str))
+        global_codes = np.array(
+            [categories.setdefault(value, len(categories)) for value in uniques.tolist()],
+            dtype=np.int32
+        )
+        return global_codes[local_codes]
+    if storage_type == "bool":
+        return as_bool(values.to_numpy())
+    if storage_type == "datetime64[ns]":
+        parsed = pd.to_datetime(values, utc=True, format="ISO8601")
+        return parsed.dt.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    if storage_type.startswith("int") and values.isna().any():
+        raise ValueError(f"Column {values.name} has missing values and cannot be cached as {storage_type}")
+    return values.to_numpy(dtype=storage_type)
+
+
+def build_cache(timings_file, cache_dir=DEFAULT_CACHE_DIR, chunksize=BUILD_CHUNKSIZE):
+    """Parse a timings file once and write its columns to the cache."""
+    entry = cache_entry(timings_file, cache_dir)
+    tmp = entry.with_name(f"{entry.name}.tmp-{os.getpid()}")
+    tmp.mkdir(parents=True, exist_ok=True)
+
+    columns = {}
+    categories = {}
+    handles = {}
+    # String column -> (offsets handle, bytes written so far)
+    offsets = {}
+    rows = 0
+    try:
+        with pd.read_csv(timings_file, chunksize=chunksize) as reader:
+            for chunk in reader:
+                for column in chunk.columns:
+                    if column not in columns:
+                        if rows:
+                            raise ValueError(f"Column {column} appeared mid-file")
+                        columns[column] = _storage_type(column, chunk[column])
+                        categories[column] = {}
+                        handles[column] = open(tmp / f"{column}.bin", "wb")
+                        if columns[column] == "string":
+                            offsets[column] = [open(tmp / f"{column}.offsets.bin", "wb"), 0]
+                            offsets[column][0].write(np.zeros(1, dtype=np.int64).tobytes())
+                    array = _encode(chunk[column], columns[column], categories[column])
+                    if columns[column] == "string":
+                        data, lengths = array
+                        handles[column].write(data)
+                        offsets[column][0].write((offsets[column][1] + np.cumsum(lengths)).tobytes())
+                        offsets[column][1] += len(data)
+                    else:
+                        handles[column].write(np.ascontiguousarray(array).tobytes())
+                rows += len(chunk)
+    except Exception:
+        for handle in [*handles.values(), *(handle for handle, _ in offsets.values())]:
+            handle.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    for handle in [*handles.values(), *(handle for handle, _ in offsets.values())]:
+        handle.close()
+
+    # Category lists get their own files, so opening the cache reads only the
+    # column types and a run only loads the lists of the columns it uses
+    for column, storage_type in columns.items():
+        if storage_type == "category":
+            with open(tmp / f"{column}.categories.json", "w") as f:
+                json.dump(list(categories[column]), f)
+    meta = {
+        "version": CACHE_VERSION,
+        "source": str(Path(timings_file).resolve()),
+        "rows": rows,
+        "columns": {column: {"type": storage_type} for column, storage_type in columns.items()}
+    }
+    with open(tmp / "meta.json", "w") as f:
+        json.dump(meta, f)
+
+    # Drop entries for older versions of the same file, then publish atomically
+    for stale in Path(cache_dir).glob(f"{_source_prefix(timings_file)}-*"):
+        if stale != tmp and stale != entry and ".tmp-" not in stale.name:
+            shutil.rmtree(stale, ignore_errors=True)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Another process published the same entry first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return TimingsCache(entry)
+
+
+class TimingsCache:
+    """Memory-mapped, typed columns of one cached timings file."""
+
+    def __init__(self, entry):
+        self.entry = Path(entry)
+        with open(self.entry / "meta.json") as f:
+            self.meta = json.load(f)
+        self.rows = self.meta["rows"]
+        self.columns = list(self.meta["columns"])
+        self._categories = {}
+
+    def raw(self, column):
+        """The memory-mapped array for a column (category codes, or UTF-8 bytes for strings)."""
+        storage_type = self.meta["columns"][column]["type"]
+        if storage_type == "string":
+            path = self.entry / f"{column}.bin"
+            if path.stat().st_size == 0:
+                return np.zeros(0, dtype=np.uint8)
+            return np.memmap(path, dtype=np.uint8, mode="r")
+        dtype = np.int32 if storage_type == "category" else np.dtype(storage_type)
+        if self.rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.entry / f"{column}.bin", dtype=dtype, mode="r", shape=(self.rows,))
+
+    def offsets(self, column):
+        """Byte offsets of a string column's values in raw(column), rows + 1 of them."""
+        return np.memmap(self.entry / f"{column}.offsets.bin", dtype=np.int64, mode="r", shape=(self.rows + 1,))
+
+    def categories(self, column):
+        """The category list of a category column, read on first use."""
+        if column not in self._categories:
+            with open(self.entry / f"{column}.categories.json") as f:
+                self._categories[column] = json.load(f)
+        return self._categories[column]
+
+    def column(self, column, start=0, stop=None):
+        """A column (or row slice of it) as pandas-ready values."""
+        info = self.meta["columns"][column]
+        if info["type"] == "string":
+            offsets = self.offsets(column)[start:(self.rows if stop is None else stop) + 1]
+            if offsets.size < 2:
+                return np.zeros(0, dtype=object)
+            data = self.raw(column)[offsets[0]:offsets[-1]].tobytes()
+            bounds = (offsets - offsets[0]).tolist()
+            return np.array([data[a:b].decode("utf-8") for a, b in zip(bounds[:-1], bounds[1:])], dtype=object)
+        values = self.raw(column)[start:stop]
+        if info["type"] == "category":
+            return pd.Categorical.from_codes(values, categories=self.categories(column))
+        if info["type"] == "datetime64[ns]":
+            return pd.DatetimeIndex(values).tz_localize("UTC")
+        return values
+
+    def _select(self, columns):
+        if columns is None:
+            return self.columns
+        if callable(columns):
+            return [column for column in self.columns if columns(column)]
+        return [column for column in self.columns if column in columns]
+
+    def frame(self, columns=None, start=0, stop=None):
+        """Build a DataFrame over the cached columns without copying numeric data."""
+        data = {column: self.column(column, start, stop) for column in self._select(columns)}
+        return pd.DataFrame(data, copy=False)
+
+    def iter_chunks(self, chunksize, columns=None):
+        """Yield DataFrames of `chunksize` rows, like pd.read_csv(chunksize=...)."""
+        selected = self._select(columns)
+        for start in range(0, self.rows, chunksize):
+            yield self.frame(selected, start, start + chunksize)
+
+
+def open_cache(timings_file, cache_dir=DEFAULT_CACHE_DIR, build=True):
+    """Return the TimingsCache for a file, building it if needed.
+
+    Returns None if the cache cannot be read or written (for example a
+    read-only cache directory); callers then fall back to parsing the CSV.
+    """
+    try:
+        entry = cache_entry(timings_file, cache_dir)
+        if (entry / "meta.json").exists():
+            return TimingsCache(entry)
+        if build:
+            return build_cache(timings_file, cache_dir)
+    except (OSError, ValueError) as e:
+        print(f"Timings cache unavailable for {timings_file}: {e}")
+    return None
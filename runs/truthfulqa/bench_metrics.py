@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+TruthfulQA Metrics Benchmark
+This script times calculate_metrics from score.py on synthetic predictions.
+
+The synthetic set has --rows binary scores spread over --categories
+categories, with a fraction of rows missing their category. With --compare it
+also times the per-category rescan calculate_metrics used before, which costs
+one pass over every prediction per category.
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from score import calculate_metrics
+
+def make_predictions(rows, n_categories, missing_fraction, seed=42):
+    """Synthetic predictions in the column layout load_predictions returns."""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, n_categories, size=rows, dtype=np.int32)
+    codes[rng.random(rows) < missing_fraction] = -1
+    category_accuracy = rng.uniform(0.8, 1.0, size=n_categories)
+    scores = (rng.random(rows) < category_accuracy[np.maximum(codes, 0)]).astype(np.float64)
+    categories = [f"category_{i:03d}" for i in range(n_categories)]
+    return {
+        "score": scores,
+        "category": pd.Categorical.from_codes(codes, categories=categories)
+    }
+
+def rescan_metrics(predictions):
+    """Per-category accuracy with one scan of all predictions per category."""
+    scores = predictions["score"]
+    categories = np.asarray(predictions["category"], dtype=object)
+    return {
+        category: {"accuracy": np.mean(scores[categories == category]),
+                   "count": int((categories == category).sum())}
+        for category in predictions["category"].categories
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TruthfulQA metric calculation")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Number of synthetic predictions")
+    parser.add_argument("--categories", type=int, default=38, help="Number of categories")
+    parser.add_argument("--missing-fraction", type=float, default=0.01,
+                        help="Fraction of predictions without a category")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs; the fastest is reported")
+    parser.add_argument("--compare", action="store_true", help="Also time the per-category rescan")
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows} predictions over {args.categories} categories")
+    predictions = make_predictions(args.rows, args.categories, args.missing_fraction)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        metrics = calculate_metrics(predictions)
+        timings.append(time.perf_counter() - start)
+    print(f"calculate_metrics: {min(timings) * 1000:.1f}ms "
+          f"({len(metrics['categories'])} categories, accuracy {metrics['accuracy']:.4f})")
+
+    if args.compare:
+        start = time.perf_counter()
+        rescan = rescan_metrics(predictions)
+        elapsed = time.perf_counter() - start
+        print(f"per-category rescan: {elapsed * 1000:.1f}ms")
+        for category, stats in rescan.items():
+            assert stats["count"] == metrics["categories"][category]["count"]
+            assert np.isclose(stats["accuracy"], metrics["categories"][category]["accuracy"])
+        print("Per-category results match")
+
+if __name__ == "__main__":
+    main()
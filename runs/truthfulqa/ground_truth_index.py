@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Ground Truth Index
+Sorted, memory-mapped question_id index over a ground truth JSONL file.
+
+The reference file is scanned once and three arrays are written to disk:
+the question IDs in sorted order (fixed-width bytes), the byte offset of each
+item's line in the source file and its category code. score.py then joins
+predictions against the reference with a vectorized binary search over the
+memory-mapped IDs, touching only the pages it needs. Full reference items are
+read back from their offsets on demand.
+
+Index entries are keyed like the latency timings cache: by the source file's
+resolved path, size, mtime and a SHA-256 of its first and last MiB.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.jsonl import loads
+
+INDEX_VERSION = 1
+
+DEFAULT_INDEX_DIR = Path(
+    os.environ.get("LUCID_GROUND_TRUTH_INDEX")
+    or Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "lucid_matrix" / "ground_truth"
+)
+
+# Bytes hashed from each end of the source file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Predictions looked up per batch
+LOOKUP_CHUNK_ROWS = 1_000_000
+
+
+def index_key(ground_truth_file):
+    """Fingerprint of a ground truth file: size, mtime and a head/tail content hash."""
+    stat = os.stat(ground_truth_file)
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(ground_truth_file, "rb") as f:
+        digest.update(f.read(HASH_BLOCK_SIZE))
+        if stat.st_size > HASH_BLOCK_SIZE:
+            f.seek(max(stat.st_size - HASH_BLOCK_SIZE, HASH_BLOCK_SIZE))
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _source_prefix(ground_truth_file):
+    resolved = str(Path(ground_truth_file).resolve())
+    return f"{Path(ground_truth_file).stem}-{hashlib.sha256(resolved.encode()).hexdigest()[:12]}"
+
+
+def index_entry(ground_truth_file, index_dir=DEFAULT_INDEX_DIR):
+    """Directory holding the index for the current file contents."""
+    return Path(index_dir) / f"{_source_prefix(ground_truth_file)}-{index_key(ground_truth_file)[:20]}"
+
+
+def build_index(ground_truth_file, index_dir=DEFAULT_INDEX_DIR):
+    """Scan a ground truth file once and write its sorted question_id index."""
+    ids, offsets, codes = [], [], []
+    categories = {}
+    offset = 0
+    with open(ground_truth_file, "rb") as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    obj = loads(line)
+                except ValueError as e:
+                    raise ValueError(f"{ground_truth_file}:{line_number}: invalid JSON ({e})") from None
+                ids.append(str(obj["question_id"]).encode())
+                offsets.append(offset)
+                category = obj.get("category")
+                codes.append(-1 if category is None else categories.setdefault(category, len(categories)))
+            offset += len(line)
+
+    ids = np.array(ids, dtype=bytes) if ids else np.zeros(0, dtype="S1")
+    offsets = np.array(offsets, dtype=np.int64)
+    codes = np.array(codes, dtype=np.int32)
+
+    # Stable sort keeps duplicates in file order; the last one wins, as it
+    # did when the reference was loaded into a dict
+    order = np.argsort(ids, kind="stable")
+    ids, offsets, codes = ids[order], offsets[order], codes[order]
+    keep = np.ones(ids.size, dtype=bool)
+    keep[:-1] = ids[:-1] != ids[1:]
+    duplicates = int(ids.size - keep.sum())
+    ids, offsets, codes = ids[keep], offsets[keep], codes[keep]
+
+    entry = index_entry(ground_truth_file, index_dir)
+    tmp = entry.with_name(f"{entry.name}.tmp-{os.getpid()}")
+    tmp.mkdir(parents=True, exist_ok=True)
+    try:
+        ids.tofile(tmp / "question_id.bin")
+        offsets.tofile(tmp / "offset.bin")
+        codes.tofile(tmp / "category.bin")
+        meta = {
+            "version": INDEX_VERSION,
+            "source": str(Path(ground_truth_file).resolve()),
+            "rows": int(ids.size),
+            "id_width": ids.dtype.itemsize,
+            "duplicates": duplicates,
+            "categories": list(categories)
+        }
+        with open(tmp / "meta.json", "w") as f:
+            json.dump(meta, f)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    # Drop indexes of older versions of the same file, then publish atomically
+    for stale in Path(index_dir).glob(f"{_source_prefix(ground_truth_file)}-*"):
+        if stale != tmp and stale != entry and ".tmp-" not in stale.name:
+            shutil.rmtree(stale, ignore_errors=True)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Another process published the same entry first
+        shutil.rmtree(tmp, ignore_errors=True)
+    return GroundTruthIndex(entry)
+
+
+class GroundTruthIndex:
+    """Memory-mapped question_id -> (offset, category) index of one reference file."""
+
+    def __init__(self, entry):
+        self.entry = Path(entry)
+        with open(self.entry / "meta.json") as f:
+            self.meta = json.load(f)
+        self.rows = self.meta["rows"]
+        self.source = self.meta["source"]
+        self.categories = self.meta["categories"]
+        self.question_ids = self._map("question_id.bin", f"S{self.meta['id_width']}")
+        self.offsets = self._map("offset.bin", np.int64)
+        self.category_codes = self._map("category.bin", np.int32)
+
+    def _map(self, name, dtype):
+        if self.rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.entry / name, dtype=dtype, mode="r", shape=(self.rows,))
+
+    def lookup(self, question_ids):
+        """Index row of each question ID, or -1 where the reference has none."""
+        question_ids = np.asarray(question_ids, dtype=object)
+        rows = np.full(question_ids.size, -1, dtype=np.int64)
+        if self.rows == 0:
+            return rows
+        width = self.meta["id_width"]
+        for start in range(0, question_ids.size, LOOKUP_CHUNK_ROWS):
+            chunk = question_ids[start:start + LOOKUP_CHUNK_ROWS]
+            encoded = np.array([str(question_id).encode() for question_id in chunk], dtype=bytes)
+            # IDs longer than any indexed ID cannot match; keep them from
+            # matching a prefix after truncation to the index width
+            fits = np.char.str_len(encoded) <= width
+            keys = encoded.astype(f"S{width}")
+            position = np.searchsorted(self.question_ids, keys)
+            position[position == self.rows] = 0
+            found = fits & (self.question_ids[position] == keys)
+            rows[start:start + chunk.size] = np.where(found, position, -1)
+        return rows
+
+    def category(self, rows):
+        """pd.Categorical of the reference category for each looked-up row (-1 -> missing)."""
+        rows = np.asarray(rows, dtype=np.int64)
+        codes = np.full(rows.size, -1, dtype=np.int32)
+        matched = rows >= 0
+        codes[matched] = self.category_codes[rows[matched]]
+        return pd.Categorical.from_codes(codes, categories=self.categories)
+
+    def record(self, row):
+        """Read the full reference item for an index row from the source file."""
+        with open(self.source, "rb") as f:
+            f.seek(int(self.offsets[row]))
+            return loads(f.readline())
+
+
+def _temporary_index_dir():
+    index_dir = tempfile.mkdtemp(prefix="ground_truth_index-")
+    atexit.register(shutil.rmtree, index_dir, ignore_errors=True)
+    return index_dir
+
+
+def open_index(ground_truth_file, index_dir=DEFAULT_INDEX_DIR):
+    """Return the GroundTruthIndex for a file, building it if needed.
+
+    If the index directory cannot be used (for example it is read-only) the
+    index is built in a temporary directory removed at exit.
+    """
+    try:
+        entry = index_entry(ground_truth_file, index_dir)
+        if (entry / "meta.json").exists():
+            return GroundTruthIndex(entry)
+        return build_index(ground_truth_file, index_dir)
+    except OSError as e:
+        print(f"Ground truth index directory unavailable ({e}), using a temporary index")
+    return build_index(ground_truth_file, _temporary_index_dir())
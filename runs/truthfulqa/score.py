@@ -6,59 +6,98 @@ This script evaluates model predictions on the TruthfulQA benchmark.
 
 import argparse
 import json
-import jsonlines
+import sys
 import numpy as np
 import pandas as pd
 from pathlib import Path
-from sklearn.metrics import accuracy_score, precision_recall_fscore_support
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.bootstrap import add_bootstrap_arguments, bootstrap_report, mean_statistic
+from common.jsonl import has_values, load_columns
+from ground_truth_index import DEFAULT_INDEX_DIR, open_index
+from common.plotting import add_plot_arguments, pyplot, render_plots, selected_plots
+
+# Fields read from each file; answers and reasoning text are never loaded
+PREDICTION_FIELDS = {"question_id": "str", "score": "float64", "category": "category"}
+
+# Category reported for predictions that have none
+MISSING_CATEGORY = "uncategorized"
+
+# Two-sided 95% normal quantile for the per-category confidence intervals
+Z_95 = 1.959963984540054
 
 def load_predictions(predictions_file):
-    """Load model predictions from a JSONL file."""
-    predictions = []
-    with jsonlines.open(predictions_file) as reader:
-        for obj in reader:
-            predictions.append(obj)
-    return predictions
-
-def load_ground_truth(ground_truth_file):
-    """Load ground truth data from a JSONL file."""
-    ground_truth = {}
-    with jsonlines.open(ground_truth_file) as reader:
-        for obj in reader:
-            ground_truth[obj["question_id"]] = obj
-    return ground_truth
+    """Load question IDs, scores and categories from a predictions JSONL file."""
+    return load_columns(predictions_file, PREDICTION_FIELDS)
+
+def load_ground_truth(ground_truth_file, index_dir=DEFAULT_INDEX_DIR):
+    """Open the memory-mapped question_id index of a ground truth JSONL file."""
+    return open_index(ground_truth_file, index_dir)
+
+def apply_ground_truth(predictions, ground_truth):
+    """Take each prediction's category from its ground truth item where it has one.
+
+    Returns the question IDs that have no ground truth item.
+    """
+    rows = ground_truth.lookup(predictions["question_id"])
+    gt_category = ground_truth.category(rows)
+    
+    # Recode both sides onto the union of their categories, then overlay
+    categories = pd.Index(predictions["category"].categories).append(
+        pd.Index(gt_category.categories).difference(predictions["category"].categories, sort=False)
+    )
+    codes = predictions["category"].codes.astype(np.int32)
+    gt_codes = categories.get_indexer(gt_category.categories)[gt_category.codes]
+    replace = gt_category.codes >= 0
+    codes[replace] = gt_codes[replace]
+    predictions["category"] = pd.Categorical.from_codes(codes, categories=categories)
+    return predictions["question_id"][rows < 0]
+
+def wilson_interval(accuracy, count, z=Z_95):
+    """Wilson score interval for accuracies over count questions (arrays or scalars)."""
+    accuracy = np.asarray(accuracy, dtype=np.float64)
+    count = np.asarray(count, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denominator = 1 + z ** 2 / count
+        center = (accuracy + z ** 2 / (2 * count)) / denominator
+        half_width = z * np.sqrt(accuracy * (1 - accuracy) / count + z ** 2 / (4 * count ** 2)) / denominator
+    return center - half_width, center + half_width
 
 def calculate_metrics(predictions):
     """Calculate evaluation metrics."""
-    scores = [pred["score"] for pred in predictions]
+    scores = predictions["score"]
     accuracy = np.mean(scores)
     
     # Calculate per-category metrics if category information is available
     category_metrics = {}
-    if "category" in predictions[0]:
-        categories = set(pred["category"] for pred in predictions)
-        for category in categories:
-            category_preds = [pred for pred in predictions if pred["category"] == category]
-            category_scores = [pred["score"] for pred in category_preds]
-            category_metrics[category] = {
-                "accuracy": np.mean(category_scores),
-                "count": len(category_preds)
+    category = predictions["category"]
+    if has_values(category):
+        # One pass: bucket each score by category code; rows without a
+        # category go to an extra bucket after the known ones
+        n_categories = len(category.categories)
+        codes = np.where(category.codes < 0, n_categories, category.codes)
+        counts = np.bincount(codes, minlength=n_categories + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            accuracies = np.bincount(codes, weights=scores, minlength=n_categories + 1) / counts
+        lower, upper = wilson_interval(accuracies, counts)
+        names = list(category.categories) + [MISSING_CATEGORY]
+        for i in np.flatnonzero(counts):
+            category_metrics[names[i]] = {
+                "accuracy": float(accuracies[i]),
+                "count": int(counts[i]),
+                "ci_lower": float(lower[i]),
+                "ci_upper": float(upper[i])
             }
     
     return {
         "accuracy": accuracy,
-        "count": len(predictions),
+        "count": len(scores),
         "categories": category_metrics if category_metrics else None
     }
 
-def plot_results(metrics, output_dir):
-    """Generate plots for the evaluation results."""
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Overall accuracy plot
+def plot_accuracy(metrics, output_dir):
+    """Plot overall accuracy."""
+    plt = pyplot()
     plt.figure(figsize=(10, 6))
     plt.bar(["TruthfulQA Accuracy"], [metrics["accuracy"]], color="blue")
     plt.ylim(0, 1.0)
@@ -67,69 +106,94 @@ def plot_results(metrics, output_dir):
     plt.tight_layout()
     plt.savefig(output_dir / "truthfulqa_accuracy.png")
     plt.close()
+
+def plot_category_accuracy(metrics, output_dir):
+    """Plot accuracy per category, highest first."""
+    plt = pyplot()
+    categories = list(metrics["categories"].keys())
+    accuracies = [metrics["categories"][cat]["accuracy"] for cat in categories]
+    counts = [metrics["categories"][cat]["count"] for cat in categories]
     
-    # Category-wise accuracy plot if available
-    if metrics["categories"]:
-        categories = list(metrics["categories"].keys())
-        accuracies = [metrics["categories"][cat]["accuracy"] for cat in categories]
-        counts = [metrics["categories"][cat]["count"] for cat in categories]
-        
-        # Sort by accuracy
-        sorted_indices = np.argsort(accuracies)[::-1]
-        categories = [categories[i] for i in sorted_indices]
-        accuracies = [accuracies[i] for i in sorted_indices]
-        counts = [counts[i] for i in sorted_indices]
-        
-        plt.figure(figsize=(15, 10))
-        bars = plt.bar(categories, accuracies, color="skyblue")
-        plt.ylim(0, 1.0)
-        plt.title("TruthfulQA Accuracy by Category")
-        plt.ylabel("Accuracy")
-        plt.xlabel("Category")
-        plt.xticks(rotation=90)
-        
-        # Add count labels
-        for i, (bar, count) in enumerate(zip(bars, counts)):
-            plt.text(i, bar.get_height() + 0.02, f"n={count}", 
-                    ha="center", va="bottom", rotation=0, fontsize=8)
-        
-        plt.tight_layout()
-        plt.savefig(output_dir / "truthfulqa_category_accuracy.png")
-        plt.close()
+    # Sort by accuracy
+    sorted_indices = np.argsort(accuracies)[::-1]
+    categories = [categories[i] for i in sorted_indices]
+    accuracies = [accuracies[i] for i in sorted_indices]
+    counts = [counts[i] for i in sorted_indices]
+    
+    plt.figure(figsize=(15, 10))
+    bars = plt.bar(categories, accuracies, color="skyblue")
+    plt.ylim(0, 1.0)
+    plt.title("TruthfulQA Accuracy by Category")
+    plt.ylabel("Accuracy")
+    plt.xlabel("Category")
+    plt.xticks(rotation=90)
+    
+    # Add count labels
+    for i, (bar, count) in enumerate(zip(bars, counts)):
+        plt.text(i, bar.get_height() + 0.02, f"n={count}", 
+                ha="center", va="bottom", rotation=0, fontsize=8)
+    
+    plt.tight_layout()
+    plt.savefig(output_dir / "truthfulqa_category_accuracy.png")
+    plt.close()
+
+# Plot name -> function, in the order they are rendered
+PLOTS = {
+    "accuracy": plot_accuracy,
+    "categories": plot_category_accuracy
+}
+
+def plot_results(metrics, output_dir, plots=tuple(PLOTS), workers=None):
+    """Generate plots for the evaluation results, one process per figure."""
+    if not metrics["categories"]:
+        plots = [name for name in plots if name != "categories"]
+    if not plots:
+        return
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    render_plots([(PLOTS[name], metrics, output_dir) for name in plots], workers)
 
 def main():
     parser = argparse.ArgumentParser(description="Evaluate TruthfulQA predictions")
     parser.add_argument("--predictions", type=str, required=True, help="Path to predictions JSONL file")
     parser.add_argument("--ground-truth", type=str, help="Path to ground truth JSONL file (optional)")
     parser.add_argument("--output-dir", type=str, default="./", help="Directory to save results")
+    parser.add_argument("--index-dir", type=str, default=str(DEFAULT_INDEX_DIR),
+                        help="Directory for the memory-mapped ground truth index")
+    add_bootstrap_arguments(parser)
+    add_plot_arguments(parser, list(PLOTS))
     args = parser.parse_args()
+    plots = selected_plots(args, list(PLOTS))
     
     # Load predictions
     print(f"Loading predictions from {args.predictions}")
     predictions = load_predictions(args.predictions)
-    print(f"Loaded {len(predictions)} predictions")
+    print(f"Loaded {len(predictions['score'])} predictions")
     
     # Load ground truth if provided
     if args.ground_truth:
         print(f"Loading ground truth from {args.ground_truth}")
-        ground_truth = load_ground_truth(args.ground_truth)
-        print(f"Loaded {len(ground_truth)} ground truth items")
+        ground_truth = load_ground_truth(args.ground_truth, args.index_dir)
+        print(f"Indexed {ground_truth.rows} ground truth items")
         
         # Match predictions with ground truth
-        for pred in predictions:
-            if pred["question_id"] in ground_truth:
-                gt = ground_truth[pred["question_id"]]
-                pred["ground_truth"] = gt["ground_truth"]
-                if "category" in gt:
-                    pred["category"] = gt["category"]
+        unmatched = apply_ground_truth(predictions, ground_truth)
+        print(f"Matched {len(predictions['question_id']) - len(unmatched)} predictions with ground truth")
     
     # Calculate metrics
     print("Calculating metrics...")
     metrics = calculate_metrics(predictions)
+    if args.bootstrap_resamples:
+        print(f"Bootstrapping accuracy with {args.bootstrap_resamples} resamples...")
+        metrics["bootstrap"] = bootstrap_report(mean_statistic, [predictions["score"]], ["accuracy"],
+                                                args.bootstrap_resamples, workers=args.bootstrap_workers)
     
     # Print results
     print("\nTruthfulQA Evaluation Results:")
     print(f"Accuracy: {metrics['accuracy']:.4f}")
+    if "bootstrap" in metrics:
+        interval = metrics["bootstrap"]["intervals"]["accuracy"]
+        print(f"{metrics['bootstrap']['confidence']:.0%} CI: [{interval['lower']:.4f}, {interval['upper']:.4f}]")
     print(f"Total questions: {metrics['count']}")
     
     if metrics["categories"]:
@@ -139,17 +203,26 @@ def main():
             key=lambda x: x[1]["accuracy"], 
             reverse=True
         ):
-            print(f"{category}: {cat_metrics['accuracy']:.4f} (n={cat_metrics['count']})")
+            print(f"{category}: {cat_metrics['accuracy']:.4f} "
+                  f"[{cat_metrics['ci_lower']:.4f}, {cat_metrics['ci_upper']:.4f}] (n={cat_metrics['count']})")
     
     # Save metrics to JSON
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    if args.ground_truth:
+        metrics["unmatched_count"] = len(unmatched)
+        if len(unmatched):
+            with open(output_dir / "unmatched_question_ids.txt", "w") as f:
+                f.write("\n".join(map(str, unmatched)) + "\n")
+            print(f"{len(unmatched)} predictions have no ground truth item; "
+                  f"IDs written to {output_dir / 'unmatched_question_ids.txt'}")
+    
     with open(output_dir / "metrics.json", "w") as f:
         json.dump(metrics, f, indent=2)
     
     # Generate plots
-    plot_results(metrics, output_dir)
+    plot_results(metrics, output_dir, plots, args.plot_workers)
     
     print(f"\nResults saved to {output_dir}")
 
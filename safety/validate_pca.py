@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+PCA Log Validator
+This script validates JSONL logs of proof-carrying actions against PCA_schema.json.
+
+The schema is compiled once into a Python function (generated source, one
+inline check per keyword) that returns the list of (field, keyword) failures
+of an action. Files are split into byte ranges on line boundaries and each
+range is parsed (orjson when it is installed) and validated in a process
+pool; standard input is read in line batches. The report counts failures per
+field and keyword, e.g. proof_bundle.evidence[].weight / maximum, and keeps a
+few sample failures with their line numbers.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_SCHEMA = SCRIPT_DIR / "PCA_schema.json"
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+CHUNK_MB = 16
+STDIN_BATCH_LINES = 50_000
+DEFAULT_SAMPLES = 10
+
+# Failures of lines that are not JSON objects at all
+LINE_FIELD = "<line>"
+
+# Failures of the instance as a whole, e.g. a JSON array instead of an object
+ROOT_FIELD = "<root>"
+
+# Keywords that only describe the data
+ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+
+TYPE_CHECKS = {
+    "object": "type({v}) is dict",
+    "array": "type({v}) is list",
+    "string": "type({v}) is str",
+    "number": "(type({v}) is int or type({v}) is float)",
+    "integer": "(type({v}) is int or type({v}) is float and {v}.is_integer())",
+    "boolean": "type({v}) is bool",
+    "null": "{v} is None",
+}
+
+# Keywords applying to one instance type, checked only when the value has it
+KEYWORD_TYPES = {
+    "required": "object", "properties": "object",
+    "items": "array", "minItems": "array", "maxItems": "array",
+    "pattern": "string", "format": "string", "minLength": "string", "maxLength": "string",
+    "minimum": "number", "maximum": "number", "exclusiveMinimum": "number", "exclusiveMaximum": "number",
+}
+
+# RFC 3339 date-time (ASCII digits only)
+DATE_TIME = re.compile(
+    r"[0-9]{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12][0-9]|3[01])[Tt](?:[01][0-9]|2[0-3]):[0-5][0-9]:(?:[0-5][0-9]|60)"
+    r"(?:\.[0-9]+)?(?:[Zz]|[+-](?:[01][0-9]|2[0-3]):[0-5][0-9])"
+)
+FORMATS = {"date-time": DATE_TIME.fullmatch}
+
+
+class _Generator:
+    """Emits the source of one validate(instance) function for a schema."""
+
+    def __init__(self):
+        self.lines = []
+        self.constants = {}
+        self.variables = 0
+
+    def constant(self, value):
+        name = f"c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def variable(self):
+        self.variables += 1
+        return f"v{self.variables}"
+
+    def emit(self, depth, line):
+        self.lines.append("    " * depth + line)
+
+    def source(self):
+        """The emitted lines, with pass in blocks left empty (e.g. a schema with no keywords)."""
+        lines = []
+        for i, line in enumerate(self.lines):
+            lines.append(line)
+            if line.endswith(":"):
+                indent = len(line) - len(line.lstrip())
+                following = self.lines[i + 1] if i + 1 < len(self.lines) else ""
+                if len(following) - len(following.lstrip()) <= indent:
+                    lines.append(" " * (indent + 4) + "pass")
+        return "\n".join(lines)
+
+    def fail(self, depth, field, keyword):
+        self.emit(depth, f"errors.append({self.constant((field or ROOT_FIELD, keyword))})")
+
+    def node(self, schema, v, field, depth):
+        unknown = set(schema) - ANNOTATIONS - set(KEYWORD_TYPES) - {"type", "enum"}
+        if unknown:
+            raise ValueError(f"{field or ROOT_FIELD}: unsupported schema keywords {', '.join(sorted(unknown))}")
+
+        types = schema.get("type")
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            self.emit(depth, f"if not ({' or '.join(TYPE_CHECKS[t].format(v=v) for t in types)}):")
+            self.fail(depth + 1, field, "type")
+            self.emit(depth, "else:")
+            depth += 1
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if all(isinstance(value, str) for value in values):
+                guard = "" if types == ["string"] else f"type({v}) is str and "
+                self.emit(depth, f"if not ({guard}{v} in {self.constant(frozenset(values))}):")
+            else:
+                # Compare types too: JSON true is not 1
+                self.emit(depth, f"if not any(type({v}) is type(e) and {v} == e for e in {self.constant(values)}):")
+            self.fail(depth + 1, field, "enum")
+
+        groups = {}
+        for keyword in schema:
+            if keyword in KEYWORD_TYPES:
+                groups.setdefault(KEYWORD_TYPES[keyword], []).append(keyword)
+        for instance_type, keywords in groups.items():
+            inner = depth
+            if types != [instance_type] and not (instance_type == "number" and types == ["integer"]):
+                self.emit(depth, f"if {TYPE_CHECKS[instance_type].format(v=v)}:")
+                inner = depth + 1
+            for keyword in keywords:
+                self.keyword(keyword, schema[keyword], v, field, inner)
+
+    def keyword(self, keyword, value, v, field, depth):
+        if keyword == "required":
+            for name in value:
+                self.emit(depth, f"if {name!r} not in {v}:")
+                self.fail(depth + 1, _join(field, name), "required")
+        elif keyword == "properties":
+            for name, subschema in value.items():
+                child = self.variable()
+                self.emit(depth, f"{child} = {v}.get({name!r}, MISSING)")
+                self.emit(depth, f"if {child} is not MISSING:")
+                self.node(subschema, child, _join(field, name), depth + 1)
+        elif keyword == "items":
+            if not isinstance(value, dict):
+                raise ValueError(f"{field or ROOT_FIELD}: only a single items schema is supported")
+            item = self.variable()
+            self.emit(depth, f"for {item} in {v}:")
+            self.node(value, item, f"{field}[]", depth + 1)
+        elif keyword == "pattern":
+            # An anchored pattern only needs trying at the start
+            pattern = re.compile(_end_anchors(value))
+            matcher = pattern.match if value.startswith("^") and "|" not in value else pattern.search
+            self.emit(depth, f"if not {self.constant(matcher)}({v}):")
+            self.fail(depth + 1, field, keyword)
+        elif keyword == "format":
+            if value in FORMATS:
+                self.emit(depth, f"if not {self.constant(FORMATS[value])}({v}):")
+                self.fail(depth + 1, field, keyword)
+        else:
+            operator, measure = {
+                "minimum": ("<", "{v}"), "maximum": (">", "{v}"),
+                "exclusiveMinimum": ("<=", "{v}"), "exclusiveMaximum": (">=", "{v}"),
+                "minLength": ("<", "len({v})"), "maxLength": (">", "len({v})"),
+                "minItems": ("<", "len({v})"), "maxItems": (">", "len({v})"),
+            }[keyword]
+            self.emit(depth, f"if {measure.format(v=v)} {operator} {value!r}:")
+            self.fail(depth + 1, field, keyword)
+
+
+def _end_anchors(pattern):
+    """Rewrite the $ anchors of a schema pattern to \\Z.
+
+    In JSON Schema (ECMA 262) $ only matches at the end of the string, while
+    Python's also matches before a trailing newline. A $ escaped or inside a
+    character class is a literal and is left alone.
+    """
+    out = []
+    escaped = in_class = False
+    for i, char in enumerate(pattern):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            # A ] straight after [ or [^ is a literal
+            in_class = char != "]" or pattern[i - 1] == "[" or pattern[i - 2:i] == "[^"
+        elif char == "[":
+            in_class = True
+        elif char == "$":
+            char = "\\Z"
+        out.append(char)
+    return "".join(out)
+
+
+def _join(field, name):
+    return f"{field}.{name}" if field else name
+
+
+def compile_schema(schema):
+    """Function returning the list of (field, keyword) failures of an instance ([] if valid).
+
+    Supports the draft-07 keywords PCA_schema.json uses (type, enum,
+    required, properties, items, pattern, format date-time, minimum/maximum
+    and length/size bounds) and rejects any other validation keyword.
+    """
+    generator = _Generator()
+    generator.emit(0, "def validate(v0):")
+    generator.emit(1, "errors = []")
+    generator.node(schema, "v0", "", 1)
+    generator.emit(1, "return errors")
+    source = generator.source()
+    namespace = {"MISSING": object(), **generator.constants}
+    exec(compile(source, f"<compiled {schema.get('title', 'schema')}>", "exec"), namespace)
+    validate = namespace["validate"]
+    validate.source = source
+    return validate
+
+
+def load_schema(schema_file=DEFAULT_SCHEMA):
+    with open(schema_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ValidationSummary:
+    """Action counts, (field, keyword) failure counts and sample failures."""
+
+    def __init__(self):
+        self.actions = 0
+        self.invalid = 0
+        self.lines = 0
+        self.failures = Counter()
+        self.samples = []
+
+    def merge(self, other, source, first_line, max_samples):
+        self.actions += other.actions
+        self.invalid += other.invalid
+        self.failures.update(other.failures)
+        for line, errors in other.samples:
+            if len(self.samples) < max_samples:
+                self.samples.append({"source": source, "line": first_line + line, "failures": errors})
+        self.lines += other.lines
+
+    def to_dict(self):
+        fields = {}
+        for (field, keyword), count in sorted(self.failures.items()):
+            fields.setdefault(field, {})[keyword] = count
+        return {
+            "actions": self.actions,
+            "valid": self.actions - self.invalid,
+            "invalid": self.invalid,
+            "failures": fields,
+            "samples": self.samples,
+        }
+
+
+def validate_lines(lines, validate, max_samples=DEFAULT_SAMPLES):
+    """Validate JSONL lines (bytes); sample line numbers are 0-based within lines."""
+    summary = ValidationSummary()
+    for number, line in enumerate(lines):
+        summary.lines += 1
+        if not line.strip():
+            continue
+        summary.actions += 1
+        try:
+            action = loads(line)
+        except ValueError:
+            errors = [(LINE_FIELD, "json")]
+        else:
+            errors = validate(action)
+        if errors:
+            summary.invalid += 1
+            summary.failures.update(errors)
+            if len(summary.samples) < max_samples:
+                summary.samples.append((number, [f"{field}: {keyword}" for field, keyword in errors]))
+    return summary
+
+
+def read_range(path, start, end):
+    """Lines starting at byte offsets in [start, end) of a file."""
+    with open(path, "rb") as f:
+        if start:
+            # Skip the line that began before start (a line starting exactly
+            # at start is kept: the preceding byte is its newline)
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        lines = []
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line)
+            position += len(line)
+    return lines
+
+
+def file_ranges(path, chunk_bytes):
+    size = os.path.getsize(path)
+    return [(start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)] or [(0, 0)]
+
+
+_validate = None
+_max_samples = DEFAULT_SAMPLES
+
+
+def _init_worker(schema, max_samples):
+    global _validate, _max_samples
+    _validate = compile_schema(schema)
+    _max_samples = max_samples
+
+
+def _validate_range(task):
+    path, start, end = task
+    return validate_lines(read_range(path, start, end), _validate, _max_samples)
+
+
+def _validate_batch(lines):
+    return validate_lines(lines, _validate, _max_samples)
+
+
+def _stdin_batches(stream, batch_lines):
+    batch = []
+    for line in stream:
+        batch.append(line)
+        if len(batch) >= batch_lines:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _bounded_map(pool, fn, tasks, window):
+    """pool.map in order, with at most window tasks submitted ahead."""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(fn, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def validate_sources(sources, schema, workers=DEFAULT_WORKERS, chunk_bytes=CHUNK_MB * 1024 * 1024,
+                     max_samples=DEFAULT_SAMPLES):
+    """Validate JSONL files ("-" for standard input) across a process pool."""
+    compile_schema(schema)  # Fail on unsupported schemas before starting workers
+    total = ValidationSummary()
+    with ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_worker,
+                             initargs=(schema, max_samples)) as pool:
+        for source in sources:
+            if source == "-":
+                tasks = _stdin_batches(sys.stdin.buffer, STDIN_BATCH_LINES)
+                results = _bounded_map(pool, _validate_batch, tasks, 2 * workers)
+            else:
+                tasks = [(source, start, end) for start, end in file_ranges(source, chunk_bytes)]
+                results = _bounded_map(pool, _validate_range, tasks, 2 * workers)
+            # Results arrive in order, so line numbers continue across ranges
+            first_line = 1
+            for result in results:
+                total.merge(result, source, first_line, max_samples)
+                first_line += result.lines
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate JSONL logs of proof-carrying actions")
+    parser.add_argument("logs", nargs="+", help="JSONL files of actions ('-' reads standard input)")
+    parser.add_argument("--schema", type=str, default=str(DEFAULT_SCHEMA), help="PCA JSON schema")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Validation processes")
+    parser.add_argument("--chunk-mb", type=int, default=CHUNK_MB, help="File range validated per task (MiB)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Failing actions to show")
+    parser.add_argument("--report", type=str, help="Write the report as JSON")
+    parser.add_argument("--print-source", action="store_true", help="Print the compiled validator and exit")
+    args = parser.parse_args()
+
+    schema = load_schema(args.schema)
+    if args.print_source:
+        print(compile_schema(schema).source)
+        return 0
+
+    start = time.perf_counter()
+    summary = validate_sources(args.logs, schema, args.workers, args.chunk_mb * 1024 * 1024, args.samples)
+    elapsed = time.perf_counter() - start
+    report = summary.to_dict()
+    report.update({"schema": args.schema, "logs": args.logs, "elapsed_s": elapsed,
+                   "actions_per_s": summary.actions / elapsed if elapsed > 0 else 0.0})
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"Validated {report['actions']:,} actions in {elapsed:.2f}s ({report['actions_per_s']:,.0f}/s)")
+    for field, keywords in report["failures"].items():
+        for keyword, count in keywords.items():
+            print(f"❌ {field}: {keyword} ({count:,})")
+    for sample in report["samples"]:
+        print(f"   {sample['source']}:{sample['line']}: {', '.join(sample['failures'])}")
+    if report["invalid"]:
+        print(f"❌ {report['invalid']:,} of {report['actions']:,} actions do not match the schema")
+        return 1
+    print(f"✅ All {report['actions']:,} actions match the schema")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Hash Cache
+Persistent cache of artifact SHA-256 digests for verify_checksums.py.
+
+Each entry maps a file's resolved path to the digest computed for it and the
+stat fields it had at the time: size, mtime_ns, ctime_ns, inode and device. A
+file whose current stat matches its entry is not read again. Rewriting,
+replacing or touching a file changes at least one of these fields, so the file
+is rehashed.
+
+A file modified within RACY_WINDOW_NS of being hashed is not cached: a second
+write in the same timestamp tick could leave its mtime unchanged.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_FILE = Path(
+    os.environ.get("LUCID_HASH_CACHE")
+    or Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "lucid_matrix" / "sha256_cache.json"
+)
+
+RACY_WINDOW_NS = 2_000_000_000
+
+STAT_FIELDS = ("size", "mtime_ns", "ctime_ns", "inode", "device")
+
+
+def stat_key(stat):
+    """The stat fields an entry must match, as a list (JSON-friendly)."""
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns, stat.st_ino, stat.st_dev]
+
+
+class HashCache:
+    """{resolved path: (stat key, digest)} loaded from and saved to one JSON file."""
+
+    def __init__(self, cache_file=DEFAULT_CACHE_FILE):
+        self.cache_file = Path(cache_file)
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.silent_changes = []
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Read the cache file; a missing, unreadable or outdated cache starts empty."""
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("version") == CACHE_VERSION and data.get("fields") == list(STAT_FIELDS):
+            self.entries = {path: (entry[0], entry[1]) for path, entry in data.get("entries", {}).items()}
+        return self
+
+    def lookup(self, path, stat):
+        """Cached digest of path if its stat is unchanged, else None."""
+        entry = self.entries.get(str(Path(path).resolve()))
+        with self._lock:
+            if entry is not None and entry[0] == stat_key(stat):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def store(self, path, stat, digest, hashed_at_ns=None):
+        """Record the digest of path as of stat (taken before it was hashed)."""
+        hashed_at_ns = hashed_at_ns or time.time_ns()
+        key = str(Path(path).resolve())
+        with self._lock:
+            if hashed_at_ns - stat.st_mtime_ns < RACY_WINDOW_NS:
+                # Too recent to trust; forget any older entry instead
+                self.dirty |= self.entries.pop(key, None) is not None
+                return
+            entry = (stat_key(stat), digest)
+            if self.entries.get(key) != entry:
+                self.entries[key] = entry
+                self.dirty = True
+
+    def prune(self):
+        """Drop entries for files that no longer exist."""
+        stale = [path for path in self.entries if not os.path.exists(path)]
+        for path in stale:
+            del self.entries[path]
+        self.dirty |= bool(stale)
+        return len(stale)
+
+    def save(self):
+        """Write the cache atomically if it changed."""
+        if not self.dirty:
+            return False
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_name(f"{self.cache_file.name}.tmp-{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "fields": list(STAT_FIELDS),
+                       "entries": {path: list(entry) for path, entry in self.entries.items()}}, f)
+        os.replace(tmp, self.cache_file)
+        self.dirty = False
+        return True
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""
+Merkle Manifest
+This script builds and verifies a Merkle-tree manifest of the runs/ artifacts.
+
+Every file is a leaf (its name, size and SHA-256) and every directory a node
+whose hash is the Merkle root of its sorted entries, so a single root covers
+the whole tree and is what manifest.sig signs. Any file or directory can be
+checked against that root with an inclusion proof: the sibling hashes on its
+path, O(log n) of them, instead of the whole manifest. Members of
+Benchmark_run_artifacts.zip are streamed out of the archive without
+extracting them to disk and checked together: every directory node is
+rebuilt once from the manifest listing overlaid with their data, and the
+result compared with the signed root. Verification fails unless the root's
+signature checks out, or the root is given with --root-hash.
+
+Hashing follows RFC 6962: entries are hashed as SHA-256(0x00 || entry) and
+interior nodes as SHA-256(0x01 || left || right), with the tree split at the
+largest power of two below the entry count.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from hash_cache import DEFAULT_CACHE_FILE, HashCache
+from verify_checksums import ARTIFACTS_DIR, DEFAULT_WORKERS, READ_BUFFER_MB, SCRIPT_DIR, hash_artifacts
+
+MANIFEST_VERSION = 1
+
+RUNS_DIR = ARTIFACTS_DIR / "runs"
+DEFAULT_MERKLE_MANIFEST = SCRIPT_DIR / "merkle_manifest.json"
+DEFAULT_SIGNATURE = SCRIPT_DIR / "manifest.sig"
+DEFAULT_PUBKEY = SCRIPT_DIR / "pubkey.pem"
+
+EXCLUDED_DIRS = {"__pycache__"}
+EXCLUDED_SUFFIXES = {".pyc"}
+
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+ROOT_BLOCK = "MERKLE ROOT"
+SIGNATURE_BLOCK = "ED25519 SIGNATURE"
+
+OK = "ok"
+MISMATCH = "mismatch"
+MISSING = "missing"
+UNLISTED = "unlisted"
+UNKNOWN = "unknown"
+
+
+def sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.digest()
+
+
+def file_entry_hash(name, size, digest):
+    """Leaf hash of a file entry: its name within its directory, size and SHA-256."""
+    return sha256(LEAF_PREFIX, b"file\0", name.encode(), b"\0", size.to_bytes(8, "big"), bytes.fromhex(digest))
+
+
+def dir_entry_hash(name, root):
+    """Leaf hash of a directory entry in its parent: its name and Merkle root."""
+    return sha256(LEAF_PREFIX, b"dir\0", name.encode(), b"\0", bytes.fromhex(root))
+
+
+def entry_hash(name, node):
+    if "children" in node:
+        return dir_entry_hash(name, node["root"])
+    return file_entry_hash(name, node["size"], node["sha256"])
+
+
+def _split(count):
+    """Largest power of two below count (count > 1)."""
+    return 1 << ((count - 1).bit_length() - 1)
+
+
+def merkle_root(hashes):
+    """RFC 6962 Merkle tree hash of a list of entry hashes."""
+    if not hashes:
+        return sha256(b"")
+    if len(hashes) == 1:
+        return hashes[0]
+    k = _split(len(hashes))
+    return sha256(NODE_PREFIX, merkle_root(hashes[:k]), merkle_root(hashes[k:]))
+
+
+def audit_path(index, hashes):
+    """Sibling hashes proving hashes[index] is in merkle_root(hashes), leaf first."""
+    if len(hashes) <= 1:
+        return []
+    k = _split(len(hashes))
+    if index < k:
+        return audit_path(index, hashes[:k]) + [merkle_root(hashes[k:])]
+    return audit_path(index - k, hashes[k:]) + [merkle_root(hashes[:k])]
+
+
+def root_from_path(index, count, leaf, path):
+    """Merkle root implied by a leaf at index of count and its audit path (RFC 9162 2.1.3.2), or None."""
+    if not 0 <= index < count:
+        return None
+    fn, sn, r = index, count - 1, leaf
+    for sibling in path:
+        if sn == 0:
+            return None
+        if fn & 1 or fn == sn:
+            r = sha256(NODE_PREFIX, sibling, r)
+            while not fn & 1 and fn:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = sha256(NODE_PREFIX, r, sibling)
+        fn >>= 1
+        sn >>= 1
+    return r if sn == 0 else None
+
+
+def split_name(name):
+    return [part for part in str(name).replace(os.sep, "/").split("/") if part and part != "."]
+
+
+def build_tree(files):
+    """Directory tree of {name: (size, sha256)} with every directory's Merkle root filled in."""
+    tree = {"root": None, "children": {}}
+    for name, (size, digest) in files.items():
+        parts = split_name(name)
+        node = tree
+        for part in parts[:-1]:
+            node = node["children"].setdefault(part, {"root": None, "children": {}})
+        node["children"][parts[-1]] = {"size": size, "sha256": digest}
+    _seal(tree)
+    return tree
+
+
+def _seal(node):
+    node["children"] = {name: node["children"][name] for name in sorted(node["children"])}
+    for child in node["children"].values():
+        if "children" in child:
+            _seal(child)
+    node["root"] = merkle_root([entry_hash(name, child) for name, child in node["children"].items()]).hex()
+
+
+def find_node(tree, name):
+    """Manifest node of a file or directory name ("" is the whole tree), or None."""
+    node = tree
+    for part in split_name(name):
+        node = node.get("children", {}).get(part)
+        if node is None:
+            return None
+    return node
+
+
+def leaves(node, prefix=""):
+    """{name: (size, sha256)} of every file at or below node."""
+    if "children" not in node:
+        return {prefix: (node["size"], node["sha256"])}
+    found = {}
+    for name, child in node["children"].items():
+        found.update(leaves(child, f"{prefix}/{name}" if prefix else name))
+    return found
+
+
+def inclusion_proof(tree, name):
+    """Audit paths from a file or directory up to the manifest root, innermost directory first."""
+    parts = split_name(name)
+    nodes = [tree]
+    for part in parts:
+        child = nodes[-1].get("children", {}).get(part)
+        if child is None:
+            raise KeyError(f"{name} is not in the manifest")
+        nodes.append(child)
+    levels = []
+    for depth in reversed(range(len(parts))):
+        children = nodes[depth]["children"]
+        names = list(children)
+        hashes = [entry_hash(child_name, children[child_name]) for child_name in names]
+        index = names.index(parts[depth])
+        levels.append({"index": index, "count": len(names),
+                       "siblings": [sibling.hex() for sibling in audit_path(index, hashes)]})
+    return {"name": "/".join(parts), "root": tree["root"], "levels": levels}
+
+
+def root_from_proof(proof, node):
+    """Manifest root implied by a proof and the node (as built from the data) it proves, or None."""
+    parts = split_name(proof["name"])
+    if len(proof["levels"]) != len(parts):
+        return None
+    h = entry_hash(parts[-1], node) if parts else bytes.fromhex(node["root"])
+    for depth, level in zip(reversed(range(len(parts))), proof["levels"]):
+        root = root_from_path(level["index"], level["count"], h, [bytes.fromhex(s) for s in level["siblings"]])
+        if root is None:
+            return None
+        h = dir_entry_hash(parts[depth - 1], root.hex()) if depth else root
+    return h.hex()
+
+
+def collect_files(root=RUNS_DIR, target=""):
+    """Artifact files at or below root/target, as {name relative to root: path}."""
+    root = Path(root)
+    start = root / target
+    if start.is_file():
+        return {"/".join(split_name(target)): start}
+    found = {}
+    for directory, dirnames, filenames in os.walk(start):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS and not d.startswith("."))
+        for filename in filenames:
+            path = Path(directory) / filename
+            if filename.startswith(".") or path.suffix in EXCLUDED_SUFFIXES or not path.is_file():
+                continue
+            found[path.relative_to(root).as_posix()] = path
+    return dict(sorted(found.items()))
+
+
+def hash_disk_files(files, workers=DEFAULT_WORKERS, cache=None, show_progress=False):
+    """{name: (size, sha256)} of {name: path}; unreadable files are left out."""
+    digests = hash_artifacts(list(files.values()), workers, READ_BUFFER_MB * 1024 * 1024, show_progress, cache)
+    return {name: (path.stat().st_size, digests[path]) for name, path in files.items()
+            if not isinstance(digests[path], OSError)}
+
+
+def hash_zip_members(zip_path, names=None, workers=DEFAULT_WORKERS, buffer_size=READ_BUFFER_MB * 1024 * 1024):
+    """{member name: (size, sha256)} of a zip's files, streamed without extracting them."""
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [info.filename for info in archive.infolist() if not info.is_dir()]
+    if names is not None:
+        wanted = set(names)
+        members = [member for member in members if member in wanted]
+
+    # One handle per thread so decompression runs in parallel; opening one
+    # per member would re-read the central directory for every member
+    local = threading.local()
+    archives = []
+
+    def task(member):
+        if not hasattr(local, "archive"):
+            local.archive = zipfile.ZipFile(zip_path)
+            archives.append(local.archive)
+        digest = hashlib.sha256()
+        size = 0
+        with local.archive.open(member) as f:
+            while True:
+                chunk = f.read(buffer_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                size += len(chunk)
+        return member, (size, digest.hexdigest())
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            return dict(pool.map(task, members))
+    finally:
+        for archive in archives:
+            archive.close()
+
+
+def check_target(tree, name, files, trusted_root):
+    """Verify one file or directory from {name: (size, sha256)} of the data under it.
+
+    The node is rebuilt from the data, its inclusion proof taken from the
+    manifest and the two folded up to trusted_root, so siblings taken from a
+    tampered manifest fail too. On failure the data is compared with the
+    manifest listing to name the differing files.
+    """
+    parts = split_name(name)
+    node = find_node(tree, name)
+    relative = {"/".join(split_name(f)[len(parts):]): value for f, value in files.items()}
+    if node is not None and "children" not in node:
+        local = {"size": files[name][0], "sha256": files[name][1]} if name in files else None
+    else:
+        local = build_tree(relative)
+    if node is None:
+        return {"name": name, "status": UNLISTED, "files": []}
+    if local is not None and root_from_proof(inclusion_proof(tree, name), local) == trusted_root:
+        return {"name": name, "status": OK, "files": []}
+
+    expected = leaves(node)
+    differing = []
+    for file_name, value in expected.items():
+        found = relative.get(file_name)
+        full_name = "/".join(parts + split_name(file_name))
+        if found is None:
+            differing.append({"name": full_name, "status": MISSING})
+        elif found != value:
+            differing.append({"name": full_name, "status": MISMATCH, "expected": value[1], "actual": found[1]})
+    for file_name in relative:
+        if file_name not in expected:
+            differing.append({"name": "/".join(parts + split_name(file_name)), "status": UNLISTED})
+    # Data matching a listing that does not fold to the root means the
+    # manifest itself was altered
+    return {"name": name, "status": MISMATCH if differing else UNKNOWN, "files": differing}
+
+
+def check_members(tree, files, trusted_root):
+    """Verify many files at once from {name: (size, sha256)}, e.g. the members of a zip.
+
+    One inclusion proof per file would rehash the entries of every directory
+    on its path each time, O(n^2) for a whole archive. Instead the manifest
+    listing is overlaid with the data and each directory node rebuilt once; a
+    root equal to trusted_root covers every file. Otherwise the listing's own
+    rebuilt root tells whether it can be trusted to name the differing files.
+    """
+    listing = leaves(tree)
+    try:
+        if build_tree({**listing, **files})["root"] == trusted_root:
+            return [{"name": name, "status": OK, "files": []} for name in files]
+    except KeyError:
+        # A file where the listing has a directory, or the reverse
+        pass
+    listing_trusted = build_tree(listing)["root"] == trusted_root
+    results = []
+    for name, value in files.items():
+        expected = listing.get(name)
+        if expected is None:
+            results.append({"name": name, "status": UNLISTED, "files": []})
+        elif expected != value:
+            results.append({"name": name, "status": MISMATCH, "files": [
+                {"name": name, "status": MISMATCH, "expected": expected[1], "actual": value[1]}
+            ]})
+        else:
+            results.append({"name": name, "status": OK if listing_trusted else UNKNOWN, "files": []})
+    return results
+
+
+def load_manifest(manifest_file=DEFAULT_MERKLE_MANIFEST):
+    with open(manifest_file, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"{manifest_file}: unsupported manifest version {manifest.get('version')}")
+    return manifest
+
+
+def write_json(data, path):
+    """Write JSON atomically."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def _armor(label, text):
+    lines = [text[i:i + 64] for i in range(0, len(text), 64)]
+    return "\n".join([f"-----BEGIN {label}-----", *lines, f"-----END {label}-----"])
+
+
+def read_signature(signature_file=DEFAULT_SIGNATURE):
+    """{block label: hex payload} of an armored signature file."""
+    blocks, label, lines = {}, None, []
+    with open(signature_file, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("-----BEGIN ") and line.endswith("-----"):
+                label, lines = line[11:-5], []
+            elif line.startswith("-----END ") and label:
+                blocks[label] = "".join(lines).lower()
+                label = None
+            elif label:
+                lines.append(line)
+    return blocks
+
+
+def sign_root(root, key_file, signature_file=DEFAULT_SIGNATURE):
+    """Sign the root with an Ed25519 private key (PEM) and write manifest.sig."""
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    with open(key_file, "rb") as f:
+        key = load_pem_private_key(f.read(), password=None)
+    signature = key.sign(bytes.fromhex(root)).hex()
+    with open(signature_file, "w", encoding="utf-8") as f:
+        f.write(_armor(ROOT_BLOCK, root) + "\n" + _armor(SIGNATURE_BLOCK, signature) + "\n")
+
+
+def signature_valid(root, signature, pubkey_file=DEFAULT_PUBKEY):
+    """True/False if the Ed25519 signature of the root checks out, None if it cannot be checked."""
+    try:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.serialization import load_pem_public_key
+    except ImportError:
+        return None
+    try:
+        with open(pubkey_file, "rb") as f:
+            key = load_pem_public_key(f.read())
+        key.verify(bytes.fromhex(signature), bytes.fromhex(root))
+        return True
+    except InvalidSignature:
+        return False
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def trusted_root(args, unsigned_root, source):
+    """The root to verify against: --root-hash, else the root signed in manifest.sig.
+
+    Raises ValueError unless the signature verifies. With --allow-unsigned, a
+    signature that cannot be checked or a missing signed root (falling back to
+    unsigned_root) only warns; an invalid signature always fails.
+    """
+    if args.root_hash:
+        return args.root_hash.lower()
+    blocks = read_signature(args.signature) if os.path.exists(args.signature) else {}
+    root = blocks.get(ROOT_BLOCK)
+    if not root:
+        if not args.allow_unsigned:
+            raise ValueError(f"❌ {args.signature} holds no signed Merkle root "
+                             f"(--allow-unsigned verifies against the {source}'s own root)")
+        print(f"⚠️ {args.signature} holds no Merkle root; verifying against the {source}'s own (unsigned) root")
+        return unsigned_root
+    valid = signature_valid(root, blocks.get(SIGNATURE_BLOCK, ""), args.pubkey)
+    if valid is False:
+        raise ValueError(f"❌ Signature of the Merkle root in {args.signature} is invalid")
+    if valid is None:
+        if not args.allow_unsigned:
+            raise ValueError(f"❌ Merkle root signature could not be checked (needs the cryptography package "
+                             f"and {args.pubkey}; --allow-unsigned skips the check)")
+        print(f"⚠️ Merkle root signature not checked (needs the cryptography package and {args.pubkey})")
+    return root
+
+
+def print_result(result, label):
+    if result["status"] == OK:
+        print(f"✅ {label}")
+        return
+    if result["status"] == UNLISTED:
+        print(f"❌ {label}: not in the manifest")
+    elif result["status"] == UNKNOWN:
+        print(f"❌ {label}: matches the manifest listing, but the manifest does not match its signed root")
+    else:
+        print(f"❌ {label}: does not match the signed root")
+    for row in result["files"]:
+        if row["status"] == MISMATCH:
+            print(f"   {row['name']}: digest mismatch (expected {row['expected']}, actual {row['actual']})")
+        elif row["status"] == MISSING:
+            print(f"   {row['name']}: missing")
+        else:
+            print(f"   {row['name']}: not in manifest")
+
+
+def cmd_build(args):
+    cache = None if args.no_cache else HashCache(args.cache).load()
+    files = hash_disk_files(collect_files(args.root), args.workers, cache, not args.quiet)
+    if cache is not None:
+        cache.save()
+    tree = build_tree(files)
+    write_json({"version": MANIFEST_VERSION, "algorithm": "sha256", "root": tree["root"], "tree": tree},
+               args.manifest)
+    print(f"Wrote Merkle manifest of {len(files)} files to {args.manifest}")
+    print(f"Merkle root: {tree['root']}")
+    if args.key:
+        sign_root(tree["root"], args.key, args.signature)
+        print(f"✅ Root signed in {args.signature}")
+    return 0
+
+
+def cmd_verify(args):
+    manifest = load_manifest(args.manifest)
+    tree = manifest["tree"]
+    root = trusted_root(args, manifest["root"], "manifest")
+    cache = None if args.no_cache else HashCache(args.cache).load()
+    results = []
+
+    if args.zip:
+        members = None
+        if args.targets:
+            wanted = [split_name(target) for target in args.targets]
+            with zipfile.ZipFile(args.zip) as archive:
+                members = [info.filename for info in archive.infolist() if not info.is_dir() and any(
+                    split_name(info.filename)[:len(parts)] == parts for parts in wanted)]
+        members = hash_zip_members(args.zip, members, args.workers)
+        prefix = split_name(args.zip_prefix)
+        labels = {"/".join(prefix + split_name(member)): f"{args.zip}:{member}" for member in members}
+        files = {"/".join(prefix + split_name(member)): value for member, value in members.items()}
+        for result in check_members(tree, files, root):
+            print_result(result, labels[result["name"]])
+            results.append(result)
+    else:
+        for target in args.targets or [""]:
+            name = "/".join(split_name(target))
+            files = hash_disk_files(collect_files(args.root, name), args.workers, cache, not args.quiet)
+            result = check_target(tree, name, files, root)
+            print_result(result, name or "runs/")
+            results.append(result)
+    if cache is not None:
+        cache.save()
+
+    failed = [result for result in results if result["status"] != OK]
+    if args.report:
+        write_json(results, args.report)
+    if failed:
+        print(f"❌ {len(failed)} of {len(results)} verified items do not match the Merkle root")
+        return 1
+    print(f"✅ {len(results)} items verified against Merkle root {root[:16]}…")
+    return 0
+
+
+def cmd_prove(args):
+    proof = inclusion_proof(load_manifest(args.manifest)["tree"], args.name)
+    if args.output:
+        write_json(proof, args.output)
+        print(f"Wrote inclusion proof for {proof['name'] or 'runs/'} to {args.output}")
+    else:
+        print(json.dumps(proof, indent=1))
+    return 0
+
+
+def cmd_check_proof(args):
+    with open(args.proof, encoding="utf-8") as f:
+        proof = json.load(f)
+    root = trusted_root(args, proof["root"], "proof")
+    path = Path(args.path)
+    if path.is_file():
+        files = hash_disk_files({proof["name"]: path})
+        node = {"size": files[proof["name"]][0], "sha256": files[proof["name"]][1]}
+    else:
+        node = build_tree(hash_disk_files(collect_files(path)))
+    if root_from_proof(proof, node) == root:
+        print(f"✅ {args.path} is {proof['name'] or 'runs/'} under Merkle root {root[:16]}…")
+        return 0
+    print(f"❌ {args.path} does not match {proof['name'] or 'runs/'} under Merkle root {root[:16]}…")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and verify the Merkle manifest of runs/")
+    parser.add_argument("--manifest", type=str, default=str(DEFAULT_MERKLE_MANIFEST), help="Merkle manifest")
+    parser.add_argument("--root", type=str, default=str(RUNS_DIR), help="Directory the manifest covers")
+    parser.add_argument("--signature", type=str, default=str(DEFAULT_SIGNATURE), help="Signed root (manifest.sig)")
+    parser.add_argument("--pubkey", type=str, default=str(DEFAULT_PUBKEY), help="Ed25519 public key (PEM)")
+    parser.add_argument("--root-hash", type=str, help="Verify against this root instead of manifest.sig")
+    parser.add_argument("--allow-unsigned", action="store_true",
+                        help="Verify against an unsigned or unchecked root (local use only)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Files hashed concurrently")
+    parser.add_argument("--cache", type=str, default=str(DEFAULT_CACHE_FILE), help="Digest cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the digest cache")
+    parser.add_argument("--quiet", action="store_true", help="No progress output")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Hash runs/ and write the manifest")
+    build.add_argument("--key", type=str, help="Ed25519 private key (PEM) to sign the root into manifest.sig")
+    build.set_defaults(func=cmd_build)
+
+    verify = commands.add_parser("verify", help="Verify files or directories (default: all of runs/)")
+    verify.add_argument("targets", nargs="*", help="Files or directories relative to runs/")
+    verify.add_argument("--zip", type=str, help="Verify the members of a zip (e.g. runs/Benchmark_run_artifacts.zip) "
+                                                "instead of the files on disk")
+    verify.add_argument("--zip-prefix", type=str, default="", help="Directory of runs/ the zip's root corresponds to")
+    verify.add_argument("--report", type=str, help="Write the per-item report as JSON")
+    verify.set_defaults(func=cmd_verify)
+
+    prove = commands.add_parser("prove", help="Write the inclusion proof of a file or directory")
+    prove.add_argument("name", help="File or directory relative to runs/")
+    prove.add_argument("--output", type=str, help="Proof file (default: print)")
+    prove.set_defaults(func=cmd_prove)
+
+    check = commands.add_parser("check-proof", help="Verify a file or directory with a proof, without the manifest")
+    check.add_argument("proof", help="Inclusion proof written by prove")
+    check.add_argument("path", help="The file or directory on disk")
+    check.set_defaults(func=cmd_check_proof)
+
+    args = parser.parse_args()
+    try:
+        return args.func(args)
+    except (KeyError, ValueError) as e:
+        print(e.args[0] if e.args else e)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Checksum Verification
+This script verifies artifact files against the SHA-256 manifest (sha256sum.txt).
+
+Files are hashed concurrently in a thread pool (hashlib releases the GIL
+while hashing large buffers), each read in large chunks into a reused buffer.
+Progress is streamed to stderr. Every manifest entry is compared
+individually and the report names each artifact that is missing or whose
+digest differs, plus artifacts found on disk that the manifest does not list.
+
+Digests are cached between runs (see hash_cache.py), so only artifacts whose
+size, mtime, ctime or inode changed are read again; --paranoid rehashes
+everything and reports any file whose contents changed behind an unchanged
+stat.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from hash_cache import DEFAULT_CACHE_FILE, HashCache, stat_key
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+ARTIFACTS_DIR = SCRIPT_DIR.parent
+DEFAULT_MANIFEST = SCRIPT_DIR / "sha256sum.txt"
+
+# Manifest entries are named relative to the directory holding the artifacts
+# tree, e.g. artifacts/runs/latency/timings.csv
+MANIFEST_PREFIX = "artifacts"
+
+# Files covered by the manifest: directory -> name patterns
+ARTIFACT_PATTERNS = {
+    "runs": ("*.jsonl", "*.json", "*.csv"),
+    "scripts": ("*.sh", "*.py"),
+}
+
+READ_BUFFER_MB = 8
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+OK = "ok"
+MISMATCH = "mismatch"
+MISSING = "missing"
+UNREADABLE = "unreadable"
+UNLISTED = "unlisted"
+
+
+def read_manifest(manifest_file):
+    """Manifest entries as an ordered {name: hex digest} dict (sha256sum format)."""
+    entries = {}
+    with open(manifest_file, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            digest, sep, name = line.partition(" ")
+            if not sep or len(name) < 2 or name[0] not in " *":
+                raise ValueError(f"{manifest_file}:{line_number}: not a sha256sum line")
+            entries[name[1:]] = digest.lower()
+    return entries
+
+
+def write_manifest(entries, manifest_file):
+    """Write {name: digest} in sha256sum format, sorted by name, atomically."""
+    manifest_file = Path(manifest_file)
+    tmp = manifest_file.with_name(f"{manifest_file.name}.tmp-{os.getpid()}")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for name in sorted(entries):
+            f.write(f"{entries[name]}  {name}\n")
+    os.replace(tmp, manifest_file)
+
+
+def manifest_name(path, root=ARTIFACTS_DIR):
+    """Manifest name of an artifact file."""
+    return f"{MANIFEST_PREFIX}/{Path(path).resolve().relative_to(Path(root).resolve()).as_posix()}"
+
+
+def resolve_entry(name, root=ARTIFACTS_DIR):
+    """Path on disk of a manifest entry."""
+    prefix = f"{MANIFEST_PREFIX}/"
+    return Path(root) / (name[len(prefix):] if name.startswith(prefix) else name)
+
+
+def collect_artifacts(root=ARTIFACTS_DIR, patterns=ARTIFACT_PATTERNS):
+    """Artifact files under root matching the manifest patterns, sorted."""
+    found = set()
+    for directory, globs in patterns.items():
+        base = Path(root) / directory
+        for pattern in globs:
+            found.update(path for path in base.rglob(pattern) if path.is_file())
+    return sorted(found)
+
+
+class Progress:
+    """Thread-safe byte/file counter printing a status line at most every interval seconds."""
+
+    def __init__(self, total_files, total_bytes, stream=sys.stderr, interval=0.5, enabled=True):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.files = 0
+        self.bytes = 0
+        self.stream = stream
+        self.interval = interval
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def add_bytes(self, count):
+        with self._lock:
+            self.bytes += count
+            self._maybe_print()
+
+    def file_done(self):
+        with self._lock:
+            self.files += 1
+            self._maybe_print()
+
+    def _maybe_print(self, force=False):
+        now = time.perf_counter()
+        if not self.enabled or (not force and now - self._last < self.interval):
+            return
+        self._last = now
+        rate = self.bytes / max(now - self.start, 1e-9) / 1e6
+        # Redraw one line on a terminal; print whole lines otherwise
+        start, end = ("\r", "\n" if force else "") if self.stream.isatty() else ("", "\n")
+        self.stream.write(f"{start}Hashed {self.files}/{self.total_files} files, "
+                          f"{self.bytes / 1e6:,.1f}/{self.total_bytes / 1e6:,.1f} MB ({rate:,.0f} MB/s){end}")
+        self.stream.flush()
+
+    def finish(self):
+        with self._lock:
+            self._maybe_print(force=True)
+
+
+def hash_file(path, buffer_size=READ_BUFFER_MB * 1024 * 1024, progress=None):
+    """SHA-256 hex digest of a file, read in buffer_size chunks."""
+    digest = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            count = f.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+            if progress:
+                progress.add_bytes(count)
+    return digest.hexdigest()
+
+
+def hash_files(paths, workers=DEFAULT_WORKERS, buffer_size=READ_BUFFER_MB * 1024 * 1024, progress=None):
+    """{path: digest or OSError} for every path, hashed concurrently."""
+    def task(path):
+        try:
+            return path, hash_file(path, buffer_size, progress)
+        except OSError as e:
+            return path, e
+        finally:
+            if progress:
+                progress.file_done()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(pool.map(task, paths))
+
+
+def hash_artifacts(paths, workers=DEFAULT_WORKERS, buffer_size=READ_BUFFER_MB * 1024 * 1024,
+                   show_progress=True, cache=None, paranoid=False):
+    """{path: digest or OSError}, taking unchanged files' digests from cache.
+
+    With paranoid every file is hashed; cache entries are still refreshed, and
+    files whose digest no longer matches an entry with the same stat are
+    collected in cache.silent_changes.
+    """
+    digests, stats, cached = {}, {}, {}
+    for path in paths:
+        try:
+            stats[path] = os.stat(path)
+        except OSError as e:
+            digests[path] = e
+            continue
+        if cache is not None:
+            found = cache.lookup(path, stats[path])
+            if found is not None:
+                cached[path] = found
+    if not paranoid:
+        digests.update(cached)
+
+    todo = [path for path in stats if path not in digests]
+    progress = Progress(len(todo), sum(stats[path].st_size for path in todo), enabled=show_progress)
+    started_ns = time.time_ns()
+    hashed = hash_files(todo, workers, buffer_size, progress)
+    if todo:
+        progress.finish()
+    digests.update(hashed)
+
+    if cache is not None:
+        cache.silent_changes = [path for path, digest in cached.items() if hashed.get(path, digest) != digest]
+        for path, digest in hashed.items():
+            if isinstance(digest, OSError):
+                continue
+            try:
+                unchanged = stat_key(os.stat(path)) == stat_key(stats[path])
+            except OSError:
+                unchanged = False
+            # A file written while it was hashed is not cached
+            if unchanged:
+                cache.store(path, stats[path], digest, started_ns)
+    return digests
+
+
+def compare(expected, actual, unlisted=()):
+    """One report row per manifest entry (in manifest order), then per unlisted artifact.
+
+    expected is {name: digest}; actual is {name: digest, None (missing) or
+    OSError}.
+    """
+    rows = []
+    for name, digest in expected.items():
+        found = actual.get(name)
+        if found is None:
+            rows.append({"name": name, "status": MISSING, "expected": digest, "actual": None})
+        elif isinstance(found, OSError):
+            rows.append({"name": name, "status": UNREADABLE, "expected": digest, "actual": None,
+                         "error": str(found)})
+        else:
+            rows.append({"name": name, "status": OK if found == digest else MISMATCH, "expected": digest,
+                         "actual": found})
+    for name in unlisted:
+        rows.append({"name": name, "status": UNLISTED, "expected": None, "actual": actual.get(name)})
+    return rows
+
+
+def verify(manifest_file=DEFAULT_MANIFEST, root=ARTIFACTS_DIR, workers=DEFAULT_WORKERS,
+           buffer_size=READ_BUFFER_MB * 1024 * 1024, include_unlisted=True, show_progress=True, cache=None,
+           paranoid=False):
+    """Hash the manifest's files (and unlisted artifacts) and compare them entry by entry."""
+    expected = read_manifest(manifest_file)
+    paths = {name: resolve_entry(name, root) for name in expected}
+    unlisted = []
+    if include_unlisted:
+        for path in collect_artifacts(root):
+            name = manifest_name(path, root)
+            if name not in paths:
+                unlisted.append(name)
+                paths[name] = path
+
+    present = {name: path for name, path in paths.items() if path.is_file()}
+    digests = hash_artifacts(list(present.values()), workers, buffer_size, show_progress, cache, paranoid)
+    actual = {name: digests[path] for name, path in present.items()}
+    return compare(expected, actual, unlisted)
+
+
+def generate(root=ARTIFACTS_DIR, workers=DEFAULT_WORKERS, buffer_size=READ_BUFFER_MB * 1024 * 1024,
+             show_progress=True, cache=None, paranoid=False):
+    """{name: digest} of every artifact under root."""
+    paths = collect_artifacts(root)
+    digests = hash_artifacts(paths, workers, buffer_size, show_progress, cache, paranoid)
+    failed = {path: error for path, error in digests.items() if isinstance(error, OSError)}
+    if failed:
+        raise OSError(f"Could not read {len(failed)} artifact(s): " + ", ".join(str(path) for path in failed))
+    return {manifest_name(path, root): digest for path, digest in digests.items()}
+
+
+def report_cache(cache, paranoid):
+    """Print cache use and any silent changes, then save the cache."""
+    if paranoid:
+        for path in cache.silent_changes:
+            print(f"⚠️ {path}: contents changed but size, mtime and inode did not")
+    elif cache.hits:
+        print(f"Reused {cache.hits} cached digests, hashed {cache.misses} files")
+    cache.prune()
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"⚠️ Could not save digest cache {cache.cache_file}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify artifact files against sha256sum.txt")
+    parser.add_argument("--manifest", type=str, default=str(DEFAULT_MANIFEST), help="sha256sum-format manifest")
+    parser.add_argument("--root", type=str, default=str(ARTIFACTS_DIR), help="Artifacts directory")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Files hashed concurrently")
+    parser.add_argument("--buffer-mb", type=int, default=READ_BUFFER_MB, help="Read buffer per file (MiB)")
+    parser.add_argument("--update", action="store_true",
+                        help="Rewrite the manifest from the files on disk instead of verifying")
+    parser.add_argument("--manifest-only", action="store_true",
+                        help="Only check manifest entries; do not report unlisted artifacts")
+    parser.add_argument("--report", type=str, help="Write the per-artifact report as JSON")
+    parser.add_argument("--quiet", action="store_true", help="No progress output")
+    parser.add_argument("--cache", type=str, default=str(DEFAULT_CACHE_FILE), help="Digest cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the digest cache")
+    parser.add_argument("--paranoid", action="store_true",
+                        help="Rehash every artifact, ignoring (but refreshing) the digest cache")
+    args = parser.parse_args()
+    buffer_size = args.buffer_mb * 1024 * 1024
+    cache = None if args.no_cache else HashCache(args.cache).load()
+
+    try:
+        if args.update or not os.path.exists(args.manifest):
+            if not args.update:
+                print("No existing checksums file found. Creating new one.")
+            entries = generate(args.root, args.workers, buffer_size, not args.quiet, cache, args.paranoid)
+            write_manifest(entries, args.manifest)
+            print(f"Wrote {len(entries)} checksums to {args.manifest}")
+            return 0
+
+        print("Comparing with existing checksums...")
+        rows = verify(args.manifest, args.root, args.workers, buffer_size, not args.manifest_only, not args.quiet,
+                      cache, args.paranoid)
+    finally:
+        if cache is not None:
+            report_cache(cache, args.paranoid)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    problems = [row for row in rows if row["status"] != OK]
+    for row in problems:
+        if row["status"] == MISMATCH:
+            print(f"❌ {row['name']}: digest mismatch\n   expected {row['expected']}\n   actual   {row['actual']}")
+        elif row["status"] == MISSING:
+            print(f"❌ {row['name']}: missing")
+        elif row["status"] == UNREADABLE:
+            print(f"❌ {row['name']}: unreadable ({row['error']})")
+        else:
+            print(f"⚠️ {row['name']}: not in manifest")
+
+    verified = sum(row["status"] == OK for row in rows)
+    if problems:
+        print(f"❌ Checksums do not match: {len(problems)} of {len(rows)} artifacts differ ({verified} verified)")
+        return 1
+    print(f"✅ Checksums match ({verified} artifacts)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,11 @@ ARTIFACTS_DIR="$(dirname "$SCRIPT_DIR")"
 PUBKEY="$SCRIPT_DIR/pubkey.pem"
 MANIFEST_SIG="$SCRIPT_DIR/manifest.sig"
 SHA256SUM_FILE="$SCRIPT_DIR/sha256sum.txt"
+MERKLE_MANIFEST="$SCRIPT_DIR/merkle_manifest.json"
+
+# Extra verify_checksums.py options, e.g. --paranoid to rehash every artifact
+# instead of reusing cached digests of unchanged files
+CHECKSUM_OPTIONS=("$@")
 
 # Print header
 echo "=================================================="
@@ -40,34 +45,21 @@ verify_manifest_signature() {
 generate_checksums() {
     echo "Generating SHA-256 checksums for artifact files..."
     
-    # Create temporary checksums file
-    TEMP_SHA256SUM=$(mktemp)
-    
-    # Generate checksums for important files
-    find "$ARTIFACTS_DIR/runs" -type f -name "*.jsonl" -o -name "*.json" -o -name "*.csv" | sort | xargs sha256sum > "$TEMP_SHA256SUM" 2>/dev/null || true
-    find "$ARTIFACTS_DIR/scripts" -type f -name "*.sh" -o -name "*.py" | sort | xargs sha256sum >> "$TEMP_SHA256SUM" 2>/dev/null || true
-    
-    # Compare with existing checksums if available
-    if [ -f "$SHA256SUM_FILE" ]; then
-        echo "Comparing with existing checksums..."
-        if diff -q "$SHA256SUM_FILE" "$TEMP_SHA256SUM" >/dev/null; then
-            echo "✅ Checksums match"
-        else
-            echo "❌ Checksums do not match"
-            echo "Expected:"
-            cat "$SHA256SUM_FILE"
-            echo "Actual:"
-            cat "$TEMP_SHA256SUM"
-            rm "$TEMP_SHA256SUM"
-            return 1
-        fi
-    else
-        echo "No existing checksums file found. Creating new one."
-        cp "$TEMP_SHA256SUM" "$SHA256SUM_FILE"
+    # Hashes artifacts concurrently and reports each file that differs from
+    # the manifest (creating the manifest if it does not exist yet). Digests of
+    # artifacts unchanged since the last run are reused from the digest cache.
+    python3 "$SCRIPT_DIR/verify_checksums.py" --root "$ARTIFACTS_DIR" --manifest "$SHA256SUM_FILE" \
+        "${CHECKSUM_OPTIONS[@]}"
+}
+
+# Function to verify runs/ against the signed Merkle root
+verify_merkle_manifest() {
+    if [ ! -f "$MERKLE_MANIFEST" ]; then
+        echo "⚠️ No Merkle manifest (build it with merkle_manifest.py build --key <private key>)"
+        return 0
     fi
-    
-    rm "$TEMP_SHA256SUM"
-    return 0
+    echo "Verifying runs/ against the Merkle manifest..."
+    python3 "$SCRIPT_DIR/merkle_manifest.py" --manifest "$MERKLE_MANIFEST" verify
 }
 
 # Function to verify individual file signatures
@@ -104,6 +96,9 @@ main() {
     
     # Generate and verify checksums
     generate_checksums || exit 1
+
+    # Verify the Merkle manifest of runs/
+    verify_merkle_manifest || exit 1
     
     # Verify individual file signatures
     verify_file_signatures || exit 1
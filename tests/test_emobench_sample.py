@@ -0,0 +1,68 @@
+"""Streaming score statistics and the bounded prediction sample of confusion_matrix.py."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RUNS_DIR = Path(__file__).resolve().parent.parent / "runs"
+sys.path.insert(0, str(RUNS_DIR / "emobench"))
+
+from confusion_matrix import ScoreSample  # noqa: E402
+
+
+def _chunks(n_rows=1000, chunk_rows=64, seed=0):
+    rng = np.random.default_rng(seed)
+    emotions = np.array(["joy", "anger", "fear", "sadness"])
+    predictions = pd.DataFrame({
+        "emotion_category": pd.Categorical(emotions[rng.integers(0, 4, n_rows)]),
+        "predicted_emotion": pd.Categorical(emotions[rng.integers(0, 4, n_rows)]),
+        "safety_score": rng.random(n_rows),
+        "empathy_score": rng.normal(0.8, 0.1, n_rows)
+    })
+    predictions.loc[::97, "empathy_score"] = np.nan
+    chunks = [predictions.iloc[start:start + chunk_rows].reset_index(drop=True)
+              for start in range(0, n_rows, chunk_rows)]
+    return predictions, chunks
+
+
+@pytest.mark.parametrize("max_rows", [50, 1000, None])
+def test_score_sample_moments_are_exact(max_rows):
+    predictions, chunks = _chunks()
+    sample = ScoreSample(max_rows)
+    for chunk in chunks:
+        sample.update(chunk)
+
+    for field in ("safety_score", "empathy_score"):
+        scores = predictions[field].dropna().to_numpy()
+        stats = sample.statistics(field)
+        assert stats["mean"] == pytest.approx(scores.mean())
+        assert stats["std"] == pytest.approx(scores.std())
+        assert (stats["min"], stats["max"]) == (scores.min(), scores.max())
+        if max_rows is None or max_rows >= len(predictions):
+            assert stats["median"] == np.median(scores)
+
+
+def test_score_sample_is_bounded():
+    predictions, chunks = _chunks()
+    sample = ScoreSample(50)
+    for chunk in chunks:
+        sample.update(chunk)
+
+    frame = sample.frame()
+    assert len(frame) == 50
+    assert set(frame["safety_score"]) <= set(predictions["safety_score"])
+    assert frame["emotion_category"].dtype == "category"
+
+
+def test_score_sample_keeps_small_inputs_whole():
+    predictions, chunks = _chunks()
+    sample = ScoreSample(len(predictions))
+    for chunk in chunks:
+        sample.update(chunk)
+
+    frame = sample.frame()
+    np.testing.assert_array_equal(frame["safety_score"], predictions["safety_score"])
+    np.testing.assert_array_equal(frame["emotion_category"].astype(str), predictions["emotion_category"].astype(str))
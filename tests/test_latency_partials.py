@@ -0,0 +1,46 @@
+"""Merging --save-partial aggregates saved in exact and sketched form."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+LATENCY_DIR = Path(__file__).resolve().parent.parent / "runs" / "latency"
+sys.path.insert(0, str(LATENCY_DIR))
+
+from latency_aggregate import GroupedLatencyAggregate  # noqa: E402
+
+
+def _analyze(*args, cwd):
+    subprocess.run([sys.executable, str(LATENCY_DIR / "analyze_latency.py"), "--no-cache", *args],
+                   cwd=cwd, check=True, capture_output=True, text=True)
+
+
+def test_merge_exact_and_sketched_partials(tmp_path):
+    timings = pd.read_csv(LATENCY_DIR / "timings.csv")
+    small, large = tmp_path / "small.csv", tmp_path / "large.csv"
+    timings.iloc[:15].to_csv(small, index=False)
+    timings.iloc[15:].to_csv(large, index=False)
+
+    # The first shard is under the threshold and saved exact, the second is sketched
+    _analyze("--timings", str(small), "--streaming", "--exact-threshold-mb", "64", "--windows", "1m",
+             "--save-partial", str(tmp_path / "small.json"), "--output-dir", str(tmp_path), cwd=tmp_path)
+    _analyze("--timings", str(large), "--streaming", "--exact-threshold-mb", "0", "--windows", "1m",
+             "--save-partial", str(tmp_path / "large.json"), "--output-dir", str(tmp_path), cwd=tmp_path)
+    states = [json.loads((tmp_path / name).read_text()) for name in ("small.json", "large.json")]
+    assert [state["overall"]["exact"] for state in states] == [True, False]
+
+    _analyze("--merge-partials", str(tmp_path / "small.json"), str(tmp_path / "large.json"),
+             "--output-dir", str(tmp_path / "merged"), cwd=tmp_path)
+
+    for first, second in (states, states[::-1]):
+        merged = GroupedLatencyAggregate.from_state(first).merge(GroupedLatencyAggregate.from_state(second))
+        assert not merged.exact
+        assert merged.count == len(timings)
+        expected = np.percentile(timings["total_time_ms"], 95, method="lower")
+        assert abs(merged.overall.percentiles()["p95"] - expected) <= expected * merged.relative_accuracy
+        assert merged.overall.total_sum == pytest.approx(timings["total_time_ms"].sum())
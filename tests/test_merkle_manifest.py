@@ -0,0 +1,114 @@
+"""Signed-root checks of signing/merkle_manifest.py."""
+
+import json
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+SIGNING_DIR = Path(__file__).resolve().parent.parent / "signing"
+
+
+def _runs(tmp_path):
+    root = tmp_path / "runs"
+    for name, text in {"latency/timings.csv": "a,b\n1,2\n", "latency/README.md": "latency\n",
+                       "emobench/metrics.json": "{}\n"}.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(text)
+    return root
+
+
+def _merkle(tmp_path, *args):
+    options = ["--root", str(tmp_path / "runs"), "--manifest", str(tmp_path / "manifest.json"),
+               "--signature", str(tmp_path / "manifest.sig"), "--pubkey", str(tmp_path / "pubkey.pem"),
+               "--no-cache", "--quiet"]
+    return subprocess.run([sys.executable, str(SIGNING_DIR / "merkle_manifest.py"), *options, *args],
+                          capture_output=True, text=True)
+
+
+def test_unsigned_root_needs_allow_unsigned(tmp_path):
+    _runs(tmp_path)
+    assert _merkle(tmp_path, "build").returncode == 0
+
+    refused = _merkle(tmp_path, "verify")
+    assert refused.returncode == 1
+    assert "holds no signed Merkle root" in refused.stdout
+    assert _merkle(tmp_path, "--allow-unsigned", "verify").returncode == 0
+
+    assert _merkle(tmp_path, "prove", "latency", "--output", str(tmp_path / "latency.proof")).returncode == 0
+    check = ("check-proof", str(tmp_path / "latency.proof"), str(tmp_path / "runs" / "latency"))
+    assert _merkle(tmp_path, *check).returncode == 1
+    assert _merkle(tmp_path, "--allow-unsigned", *check).returncode == 0
+
+
+def test_unchecked_signature_needs_allow_unsigned(tmp_path):
+    _runs(tmp_path)
+    assert _merkle(tmp_path, "build").returncode == 0
+    root = json.loads((tmp_path / "manifest.json").read_text())["root"]
+    # A signed root, but no public key to check it with
+    (tmp_path / "manifest.sig").write_text(f"-----BEGIN MERKLE ROOT-----\n{root}\n-----END MERKLE ROOT-----\n"
+                                           f"-----BEGIN ED25519 SIGNATURE-----\n{'00' * 64}\n"
+                                           "-----END ED25519 SIGNATURE-----\n")
+
+    refused = _merkle(tmp_path, "verify")
+    assert refused.returncode == 1
+    assert "could not be checked" in refused.stdout
+    assert _merkle(tmp_path, "--allow-unsigned", "verify").returncode == 0
+
+
+def test_signed_root(tmp_path):
+    serialization = pytest.importorskip("cryptography.hazmat.primitives.serialization")
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    key = Ed25519PrivateKey.generate()
+    (tmp_path / "key.pem").write_bytes(key.private_bytes(serialization.Encoding.PEM,
+                                                         serialization.PrivateFormat.PKCS8,
+                                                         serialization.NoEncryption()))
+    (tmp_path / "pubkey.pem").write_bytes(key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo))
+    runs = _runs(tmp_path)
+    assert _merkle(tmp_path, "build", "--key", str(tmp_path / "key.pem")).returncode == 0
+    assert _merkle(tmp_path, "verify").returncode == 0
+
+    (runs / "latency" / "timings.csv").write_text("a,b\n1,3\n")
+    assert _merkle(tmp_path, "verify").returncode == 1
+
+    # A signature by another key fails even with --allow-unsigned
+    other = Ed25519PrivateKey.generate().public_key()
+    (tmp_path / "pubkey.pem").write_bytes(other.public_bytes(serialization.Encoding.PEM,
+                                                             serialization.PublicFormat.SubjectPublicKeyInfo))
+    invalid = _merkle(tmp_path, "--allow-unsigned", "verify", "emobench")
+    assert invalid.returncode == 1
+    assert "is invalid" in invalid.stdout
+
+
+def _statuses(tmp_path, archive, *options):
+    report = tmp_path / "report.json"
+    report.unlink(missing_ok=True)
+    result = _merkle(tmp_path, "--allow-unsigned", *options, "verify", "--zip", str(archive), "--report", str(report))
+    return result.returncode, {row["name"]: row["status"] for row in json.loads(report.read_text())}
+
+
+def test_zip_members_checked_together(tmp_path):
+    runs = _runs(tmp_path)
+    assert _merkle(tmp_path, "build").returncode == 0
+    archive = tmp_path / "artifacts.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for path in sorted(runs.rglob("*.*")):
+            z.write(path, path.relative_to(runs).as_posix())
+    assert _statuses(tmp_path, archive) == (0, {
+        "emobench/metrics.json": "ok", "latency/README.md": "ok", "latency/timings.csv": "ok"
+    })
+
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("latency/timings.csv", "a,b\n1,3\n")
+        z.writestr("latency/README.md", "latency\n")
+        z.writestr("latency/extra.txt", "extra\n")
+    assert _statuses(tmp_path, archive) == (1, {
+        "latency/timings.csv": "mismatch", "latency/README.md": "ok", "latency/extra.txt": "unlisted"
+    })
+
+    # Members matching a listing that no longer folds to the trusted root are not vouched for
+    assert _statuses(tmp_path, archive, "--root-hash", "00" * 32)[1]["latency/README.md"] == "unknown"
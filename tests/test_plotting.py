@@ -0,0 +1,23 @@
+"""Plot summaries of tiny inputs."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "runs"))
+
+from common.plotting import draw_histogram, histogram_summary, pyplot  # noqa: E402
+
+
+@pytest.mark.parametrize("values", [[1.0, 2.0], [1.0, 2.0, 3.0], [0.5, 0.5, 0.9]])
+def test_histogram_summary_kde_of_tiny_input(values):
+    summary = histogram_summary(values, bins=20)
+    assert summary["kde_x"].shape == summary["kde_y"].shape == (512,)
+    assert np.all(np.isfinite(summary["kde_y"]))
+
+    plt = pyplot()
+    plt.figure()
+    draw_histogram(plt, summary)
+    plt.close()
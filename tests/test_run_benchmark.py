@@ -0,0 +1,34 @@
+"""Concurrent category runs of the one-button benchmark."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import run_benchmark  # noqa: E402
+
+
+def test_categories_overlap(monkeypatch):
+    evaluate_category = run_benchmark.evaluate_category
+    running, overlap = set(), []
+
+    def slow_evaluate(category, *args):
+        running.add(category)
+        overlap.append(len(running))
+        time.sleep(0.2)
+        running.discard(category)
+        return evaluate_category(category, *args)
+
+    monkeypatch.setattr(run_benchmark, "evaluate_category", slow_evaluate)
+    benchmark = run_benchmark.OneButtonBenchmark(max_concurrency=2)
+    results = asyncio.run(benchmark.run_categories(benchmark.CATEGORIES))
+
+    assert list(results) == benchmark.CATEGORIES
+    assert max(overlap) == 2
+    # Each category draws from its own stream, so overlapping does not change the scores
+    for category, result in results.items():
+        expected = evaluate_category(category, run_benchmark.CATEGORY_SPECS[category], run_benchmark.SYSTEMS, None,
+                                     run_benchmark.category_rng(run_benchmark.BENCHMARK_SEED, category))
+        assert (result["scores"] == expected["scores"]).all()
@@ -0,0 +1,83 @@
+"""Plugin timeouts and failures in the benchmark suite runner."""
+
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import suite_master  # noqa: E402
+from suite_master import FAILED, PASSED, SKIPPED, TIMEOUT, BenchmarkPlugin, BenchmarkSuite, ResourceLimits  # noqa: E402
+
+
+def hang(config, dependencies):
+    # Start a grandchild too, which must be killed along with the worker
+    child = subprocess.Popen(["sleep", "60"])
+    Path(config["pids"]).write_text(f"{os.getpid()} {child.pid}")
+    time.sleep(60)
+    return {}
+
+
+def quick(config, dependencies):
+    return {"value": 1}
+
+
+def broken(config, dependencies):
+    raise ValueError("bad config")
+
+
+def _running(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # A zombie is dead, just not yet reaped by its new parent
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+def test_timed_out_plugin_is_killed(tmp_path):
+    pids = tmp_path / "pids"
+    suite = BenchmarkSuite([
+        BenchmarkPlugin("hang", hang, limits=ResourceLimits(timeout_s=1), config={"pids": str(pids)}),
+        BenchmarkPlugin("after_hang", quick, depends_on=["hang"]),
+        BenchmarkPlugin("quick", quick),
+        BenchmarkPlugin("broken", broken)
+    ], max_workers=1)
+
+    start = time.perf_counter()
+    results = suite.run()
+    assert time.perf_counter() - start < 30
+
+    assert results["hang"].status == TIMEOUT
+    assert results["after_hang"].status == SKIPPED
+    # With one worker, the remaining plugins only run once the hung one is killed
+    assert results["quick"].status == PASSED and results["quick"].metrics == {"value": 1}
+    assert results["broken"].status == FAILED and results["broken"].error == "ValueError: bad config"
+
+    deadline = time.monotonic() + 5
+    worker, grandchild = map(int, pids.read_text().split())
+    while (_running(worker) or _running(grandchild)) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _running(worker) and not _running(grandchild)
+
+
+def test_worker_killed_before_it_has_a_group(tmp_path, monkeypatch):
+    def no_group(pgid, sig):
+        raise ProcessLookupError(pgid)
+
+    # As if the timeout fired before the worker called setsid()
+    monkeypatch.setattr(suite_master.os, "killpg", no_group)
+    pids = tmp_path / "pids"
+    suite = BenchmarkSuite([
+        BenchmarkPlugin("hang", hang, limits=ResourceLimits(timeout_s=1), config={"pids": str(pids)})
+    ], max_workers=1)
+
+    start = time.perf_counter()
+    assert suite.run()["hang"].status == TIMEOUT
+    assert time.perf_counter() - start < 30
+    worker, grandchild = map(int, pids.read_text().split())
+    assert not _running(worker)
+    os.kill(grandchild, signal.SIGKILL)
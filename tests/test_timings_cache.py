@@ -0,0 +1,40 @@
+"""The columnar timings cache and the metrics computed from it match a fresh CSV parse."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+LATENCY_DIR = Path(__file__).resolve().parent.parent / "runs" / "latency"
+sys.path.insert(0, str(LATENCY_DIR))
+
+from timings_cache import open_cache  # noqa: E402
+
+
+def _metrics(output_dir, *args):
+    subprocess.run([sys.executable, str(LATENCY_DIR / "analyze_latency.py"),
+                    "--timings", str(LATENCY_DIR / "timings.csv"), "--no-plots",
+                    "--output-dir", str(output_dir), *args],
+                   cwd=LATENCY_DIR, check=True, capture_output=True, text=True)
+    return (output_dir / "latency_metrics.json").read_text()
+
+
+def test_cached_metrics_match_csv(tmp_path):
+    cache_dir = tmp_path / "cache"
+    parsed = _metrics(tmp_path / "parsed", "--no-cache")
+    # The first cached run builds the cache, the second maps it
+    assert _metrics(tmp_path / "built", "--cache-dir", str(cache_dir)) == parsed
+    assert _metrics(tmp_path / "mapped", "--cache-dir", str(cache_dir)) == parsed
+
+
+def test_cache_columns_round_trip(tmp_path):
+    timings = pd.read_csv(LATENCY_DIR / "timings.csv")
+    cache = open_cache(LATENCY_DIR / "timings.csv", tmp_path)
+    # Category lists live next to their columns, not in meta.json
+    assert "categories" not in (cache.entry / "meta.json").read_text()
+    assert cache.meta["columns"]["request_id"]["type"] == "string"
+
+    assert list(cache.column("request_id")) == timings["request_id"].astype(str).tolist()
+    assert list(cache.column("request_id", 3, 7)) == timings["request_id"].astype(str).tolist()[3:7]
+    assert list(cache.column("model_name", 2, 5)) == timings["model_name"].tolist()[2:5]
@@ -0,0 +1,31 @@
+"""Field names of schema failures reported by safety/validate_pca.py."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "safety"))
+
+from validate_pca import ROOT_FIELD, _end_anchors, compile_schema  # noqa: E402
+
+SCHEMA = {
+    "type": "object",
+    "required": ["action"],
+    "properties": {"action": {"type": "string"}}
+}
+
+
+def test_root_failures_are_named():
+    validate = compile_schema(SCHEMA)
+    assert validate([1, 2]) == [(ROOT_FIELD, "type")]
+    assert validate({}) == [("action", "required")]
+    assert validate({"action": 1}) == [("action", "type")]
+    assert validate({"action": "move"}) == []
+
+
+def test_pattern_end_is_the_end_of_the_string():
+    validate = compile_schema({"type": "string", "pattern": "^pca_[a-f0-9]{32}$"})
+    assert validate("pca_" + "a" * 32) == []
+    # Python's $ would also match before a trailing newline
+    assert validate("pca_" + "a" * 32 + "\n") == [(ROOT_FIELD, "pattern")]
+    assert _end_anchors(r"^a$|[$\]]b\$$") == r"^a\Z|[$\]]b\$\Z"
+    assert _end_anchors(r"[]$]$") == r"[]$]\Z"